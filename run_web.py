@@ -1,4 +1,15 @@
+import argparse
+
 from src.web.app import run_server
+from src.web.serve import serve
 
 if __name__ == '__main__':
-    run_server(debug=True)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the Tolkien Metal web interface.")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Serve with this many worker processes instead of the debug server")
+    parser.add_argument('--port', type=int, default=5000)
+    args = parser.parse_args()
+    if args.workers:
+        serve(port=args.port, workers=args.workers)
+    else:
+        run_server(port=args.port, debug=True)
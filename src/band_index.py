@@ -0,0 +1,188 @@
+import argparse
+import csv
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, List
+
+from src.band_store import DEFAULT_STORE_PATH, BandDetailStore
+from src.http_cache import DEFAULT_CACHE_PATH, HTTPCache
+from src.terms import canonical_key
+
+DEFAULT_INDEX_PATH = "cache/band_index.sqlite"
+
+# Bump when name_key changes; older indexes are rekeyed when opened
+KEY_VERSION = 1
+
+FIELDS = ['genre', 'themes', 'country', 'location', 'status', 'formed']
+
+# Column names accepted in dump files, mapped to index fields
+COLUMN_ALIASES = {
+    'band name': 'name', 'name': 'name', 'url': 'url',
+    'genre': 'genre', 'themes': 'themes', 'lyrical themes': 'themes',
+    'country': 'country', 'country of origin': 'country',
+    'location': 'location', 'status': 'status',
+    'formed': 'formed', 'formed in': 'formed',
+}
+
+
+def name_key(name: str) -> str:
+    """Key used for matching, the same comparison check_metal_archives makes."""
+    return canonical_key(name)
+
+
+class BandIndex:
+    """Local SQLite listing of Metal Archives bands for offline matching.
+
+    Bands are loaded from a bulk dump or from search pages already captured in
+    the HTTP cache. `lookup_many` resolves any number of names with a single
+    pass over the index, without touching the network. Lookups may come from
+    several threads; the listing is read into memory once, under a lock.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS bands (
+                url TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                name_key TEXT NOT NULL,
+                {', '.join(f'{field} TEXT' for field in FIELDS)}
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS bands_name_key ON bands (name_key)")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < KEY_VERSION:
+            self._rekey()
+        self._conn.commit()
+        self._by_key = None
+
+    def _rekey(self):
+        """Recompute every stored name_key, for indexes built with an older key."""
+        rows = self._conn.execute("SELECT url, name FROM bands").fetchall()
+        self._conn.executemany("UPDATE bands SET name_key = ? WHERE url = ?",
+                               [(name_key(name), url) for url, name in rows])
+        self._conn.execute(f"PRAGMA user_version = {KEY_VERSION}")
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM bands").fetchone()[0]
+
+    def add_bands(self, bands: Iterable[Dict]) -> int:
+        """Insert or update bands; each needs at least a name and url."""
+        rows = []
+        for band in bands:
+            if not band.get('name') or not band.get('url'):
+                continue
+            rows.append((band['url'], band['name'], name_key(band['name']),
+                         *(band.get(field) or 'N/A' for field in FIELDS)))
+        # Keep richer details already stored when a row only knows a few fields
+        self._conn.executemany(f"""
+            INSERT INTO bands (url, name, name_key, {', '.join(FIELDS)})
+            VALUES (?, ?, ?, {', '.join('?' for _ in FIELDS)})
+            ON CONFLICT(url) DO UPDATE SET name = excluded.name, name_key = excluded.name_key,
+            {', '.join(f"{f} = CASE WHEN excluded.{f} = 'N/A' THEN bands.{f} ELSE excluded.{f} END"
+                       for f in FIELDS)}
+        """, rows)
+        self._conn.commit()
+        self._by_key = None
+        return len(rows)
+
+    def add_details(self, details: Dict[str, Dict]) -> int:
+        """Fill in parsed band-page details for bands already in the index."""
+        updated = 0
+        for url, fields in details.items():
+            cursor = self._conn.execute(
+                f"UPDATE bands SET {', '.join(f'{f} = ?' for f in FIELDS)} WHERE url = ?",
+                (*(fields.get(f) or 'N/A' for f in FIELDS), url)
+            )
+            updated += cursor.rowcount
+        self._conn.commit()
+        self._by_key = None
+        return updated
+
+    def _load(self) -> Dict[str, List[Dict]]:
+        with self._lock:
+            if self._by_key is None:
+                by_key = {}
+                columns = ['name', 'url', *FIELDS]
+                for row in self._conn.execute(f"SELECT name_key, {', '.join(columns)} FROM bands ORDER BY name, url"):
+                    by_key.setdefault(row[0], []).append(dict(zip(columns, row[1:])))
+                self._by_key = by_key
+            return self._by_key
+
+    def lookup(self, name: str) -> List[Dict]:
+        """Bands whose name has the same canonical key as `name`."""
+        return list(self._load().get(name_key(name), []))
+
+    def lookup_many(self, names: Iterable[str]) -> Dict[str, List[Dict]]:
+        """Resolve every name with one hash lookup each."""
+        by_key = self._load()
+        return {name: list(by_key.get(name_key(name), [])) for name in names}
+
+    def close(self):
+        self._conn.close()
+
+
+def read_dump(filename: str) -> Iterator[Dict]:
+    """Read bands from a CSV or JSONL dump, such as metal_band_matches.csv."""
+    with open(filename, 'r', encoding='utf-8', newline='') as f:
+        if filename.endswith('.jsonl'):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for row in rows:
+            band = {}
+            for column, value in row.items():
+                field = COLUMN_ALIASES.get(str(column).strip().lower())
+                if field and value not in (None, ''):
+                    band[field] = str(value)
+            if band.get('name') != 'No match found':
+                yield band
+
+
+def read_cached_searches(cache: HTTPCache) -> Iterator[Dict]:
+    """Replay band search results captured in an HTTPCache."""
+    for body in cache.bodies_matching('%/search/ajax-band-search/%'):
+        try:
+            data = json.loads(body)
+        except json.JSONDecodeError:
+            continue
+        for band_data in data.get('aaData', []):
+            url_match = re.search(r'href="([^"]+)"', band_data[0])
+            if not url_match:
+                continue
+            yield {
+                'name': re.sub(r'<[^>]+>', '', band_data[0]).strip(),
+                'url': url_match.group(1),
+                'genre': band_data[1] if len(band_data) > 1 else None,
+                'country': band_data[2] if len(band_data) > 2 else None,
+            }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Build the local Metal Archives band index.")
+    parser.add_argument('dumps', nargs='*', help="CSV or JSONL band listings to ingest")
+    parser.add_argument('--from-cache', action='store_true',
+                        help=f"Also ingest search pages and band details captured in {DEFAULT_CACHE_PATH}")
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH,
+                        help=f"Index to write (default: {DEFAULT_INDEX_PATH})")
+    args = parser.parse_args(argv)
+
+    index = BandIndex(args.index)
+    for dump in args.dumps:
+        print(f"Ingested {index.add_bands(read_dump(dump))} bands from {dump}")
+    if args.from_cache:
+        cache = HTTPCache()
+        print(f"Ingested {index.add_bands(read_cached_searches(cache))} bands from cached searches")
+        store = BandDetailStore(DEFAULT_STORE_PATH)
+        print(f"Added details for {index.add_details(store.items())} bands from the detail store")
+    print(f"Index now holds {len(index)} bands")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,133 @@
+import argparse
 import os
 import re
+import json
 import time
+import queue
+import sys
+import threading
 import requests
+from html import escape
+from string import Template
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from src.band_index import DEFAULT_INDEX_PATH, BandIndex, read_cached_searches
+from src.check_metal import SEARCH_URL
+from src.http_cache import HTTPCache
+from src.http_client import HostLimits, fetch_text, make_session
+from src.metrics import METRICS, add_metrics_arguments, instrumented_run
+from src.result_journal import ResultJournal
+from src.variations import DEFAULT_VARIATION_LIMIT, generate_variations
+
+DEFAULT_ANALYSIS_JOURNAL = "reports/name_analysis.jsonl"
+
+# Templates are compiled once at import and filled per name, so writing a
+# report costs a few substitutions rather than rebuilding the page.
+MA_MATCH_TEMPLATE = Template("""
+            <div class="metal-archives">
+                <strong>$name</strong><br>
+                Genre: $genre<br>
+                <a href="$url" target="_blank" style="color: #ff6b6b;">View on Metal Archives</a>
+            </div>
+            """)
+SOCIAL_TEMPLATE = Template('<li><strong>$platform:</strong> <span class="$css">$label</span></li>')
+VARIATION_TEMPLATE = Template('<span class="variation">$variation</span>')
+REC_TEMPLATE = Template('<li>$rec</li>')
+
+REPORT_TEMPLATE = Template("""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="utf-8">
+        <title>Band Name Analysis: $name</title>
+    </head>
+    <body>
+        <div class="container">
+            <h1>Band Name Analysis: $name</h1>
+            <div class="section">
+                <div class="score" style="color: $score_color">
+                    $score/100
+                </div>
+            </div>
+            <div class="section">
+                <h2>Metal Archives Results</h2>
+                $metal_archives
+            </div>
+            <div class="section">
+                <h2>Social Media Availability</h2>
+                <ul>
+                    $social_media
+                </ul>
+            </div>
+            <div class="section">
+                <h2>Name Variations</h2>
+                $variations
+            </div>
+            <div class="section">
+                <h2>Recommendations</h2>
+                <ul>
+                    $recommendations
+                </ul>
+            </div>
+            <footer style="text-align: center; margin-top: 20px; color: #888;">
+                Generated on $generated
+            </footer>
+        </div>
+    </body>
+    </html>
+    """)
+
+INDEX_HEADER_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="utf-8">
+    <title>Band Name Analysis</title>
+    <style>
+        body { font-family: sans-serif; margin: 2em; }
+        table { border-collapse: collapse; }
+        th, td { padding: 4px 12px; border-bottom: 1px solid #ddd; text-align: left; }
+        th { cursor: pointer; user-select: none; }
+        .available { color: #4CAF50; }
+        .taken { color: #f44336; }
+    </style>
+    <script>
+        // Sort by the clicked column; numeric columns compare as numbers
+        document.addEventListener('click', function (event) {
+            var th = event.target.closest('th');
+            if (!th) return;
+            var column = th.cellIndex, numeric = th.dataset.type === 'number';
+            var tbody = document.querySelector('tbody');
+            var ascending = th.dataset.order !== 'asc';
+            th.dataset.order = ascending ? 'asc' : 'desc';
+            var rows = Array.prototype.slice.call(tbody.rows);
+            rows.sort(function (a, b) {
+                var x = a.cells[column].dataset.sort, y = b.cells[column].dataset.sort;
+                var cmp = numeric ? x - y : x.localeCompare(y);
+                return ascending ? cmp : -cmp;
+            });
+            rows.forEach(function (row) { tbody.appendChild(row); });
+        });
+    </script>
+</head>
+<body>
+<h1>Band Name Analysis</h1>
+<p>Started $started. Click a column to sort.</p>
+<table>
+<thead><tr><th>Name</th><th data-type="number">Score</th><th data-type="number">Metal Archives matches</th><th>Handles taken</th></tr></thead>
+<tbody>
+""")
+INDEX_ROW_TEMPLATE = Template(
+    '<tr><td data-sort="$sort_name">$name_html</td><td data-sort="$score">$score</td>'
+    '<td data-sort="$matches">$matches</td><td data-sort="$taken">$taken</td></tr>\n')
+INDEX_FOOTER_TEMPLATE = Template("""</tbody>
+</table>
+<p>$count names, finished $finished.</p>
+</body>
+</html>
+""")
+
 
 class HTMLRenderer:
     """Class to generate HTML snippets for the report."""
@@ -14,33 +138,41 @@ class HTMLRenderer:
             return "<p>No existing bands found on Metal Archives.</p>"
 
         html = f"<p>Found {ma_data['total_matches']} existing band(s):</p>"
-        for match in ma_data['matches']:
-            html += f"""
-            <div class="metal-archives">
-                <strong>{match['name']}</strong><br>
-                Genre: {match['genre']}<br>
-                <a href="{match['url']}" target="_blank" style="color: #ff6b6b;">View on Metal Archives</a>
-            </div>
-            """
-        return html
+        return html + ''.join(
+            MA_MATCH_TEMPLATE.substitute(name=escape(match['name']), genre=escape(match['genre']),
+                                         url=escape(match['url']))
+            for match in ma_data['matches'])
 
     @staticmethod
     def generate_social_html(social: Dict[str, bool]) -> str:
-        return ''.join([
-            f'<li><strong>{platform}:</strong> <span class="{"available" if available else "taken"}">'
-            f'{"Available" if available else "Taken"}</span></li>'
-            for platform, available in social.items()
-        ])
+        return ''.join(
+            SOCIAL_TEMPLATE.substitute(platform=platform, css="available" if available else "taken",
+                                       label="Available" if available else "Taken")
+            for platform, available in social.items())
 
     @staticmethod
     def generate_variations_html(variations: List[str]) -> str:
-        return ''.join([f'<span class="variation">{v}</span>' for v in variations])
+        return ''.join(VARIATION_TEMPLATE.substitute(variation=escape(v)) for v in variations)
 
     @staticmethod
     def generate_recs_html(recs: List[str]) -> str:
         if not recs:
             return "<p>No specific recommendations.</p>"
-        return ''.join([f'<li>{rec}</li>' for rec in recs])
+        return ''.join(REC_TEMPLATE.substitute(rec=escape(rec)) for rec in recs)
+
+    @staticmethod
+    def render_report(analysis: Dict) -> str:
+        """The full report page for one analyzed name."""
+        return REPORT_TEMPLATE.substitute(
+            name=escape(analysis['name']),
+            score=analysis['viability_score'],
+            score_color='#4CAF50' if analysis['viability_score'] >= 70 else '#f44336',
+            metal_archives=HTMLRenderer.generate_ma_html(analysis['metal_archives']),
+            social_media=HTMLRenderer.generate_social_html(analysis['social_media']),
+            variations=HTMLRenderer.generate_variations_html(analysis['variations']),
+            recommendations=HTMLRenderer.generate_recs_html(analysis['recommendations']),
+            generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        )
 
 class BandNameAnalyzer:
     HEADERS = {
@@ -52,10 +184,39 @@ class BandNameAnalyzer:
         'twitter': 'https://twitter.com/{handle}',
         'facebook': 'https://facebook.com/{handle}'
     }
+    # Platforms that answer HEAD like GET; the others get a GET for the
+    # first byte only, with the body left unread.
+    HEAD_PLATFORMS = {'bandcamp'}
+    # (connect, read) timeouts in seconds for social media probes
+    SOCIAL_TIMEOUT = (3.05, 5)
+    SEARCH_URL = SEARCH_URL
+    SEARCH_TTL = 7 * 24 * 3600
+
+    def __init__(self, cache: HTTPCache = None, index: BandIndex = None,
+                 session: requests.Session = None, host_limits: HostLimits = None,
+                 social_workers: int = 8, variation_index: BandIndex = None):
+        self.cache = cache
+        self.index = index
+        # Variations are looked up in `index` unless a separate one is given
+        self.variation_index = variation_index if variation_index is not None else index
+        self.session = session or make_session(pool_size=social_workers, headers=self.HEADERS)
+        self.host_limits = host_limits or HostLimits()
+        self._social_executor = ThreadPoolExecutor(max_workers=social_workers)
 
     def check_metal_archives(self, name: str) -> Dict:
-        """Check if the band exists on Metal Archives."""
-        url = "https://www.metal-archives.com/search/ajax-band-search/"
+        """Check if the band exists on Metal Archives.
+
+        With a local band index, only exact matches (compared like
+        check_metal does) are reported and no request is made.
+        """
+        if self.index is not None:
+            matches = self.index.lookup(name)
+            return {
+                'exists': bool(matches),
+                'total_matches': len(matches),
+                'matches': matches
+            }
+        url = self.SEARCH_URL
         params = {
             'field': 'name',
             'query': name,
@@ -64,9 +225,8 @@ class BandNameAnalyzer:
             'iDisplayLength': 100
         }
         try:
-            response = requests.get(url, params=params, headers=self.HEADERS)
-            response.raise_for_status()
-            data = response.json()
+            data = json.loads(fetch_text(url, params, self.HEADERS, self.session,
+                                         self.host_limits.limiter(url), self.cache, self.SEARCH_TTL))
             matches = self._parse_ma_results(data['aaData'])
             return {
                 'exists': bool(matches),
@@ -75,7 +235,7 @@ class BandNameAnalyzer:
             }
         except Exception as e:
             print(f"Error checking Metal Archives: {str(e)}")
-            return {'exists': False, 'total_matches': 0, 'matches': []}
+            return {'exists': False, 'total_matches': 0, 'matches': [], 'error': str(e)}
 
     def _parse_ma_results(self, aaData: List) -> List[Dict]:
         """Parse the results from Metal Archives."""
@@ -92,39 +252,59 @@ class BandNameAnalyzer:
                 })
         return matches
 
-    def check_social_media(self, name: str) -> Dict[str, bool]:
-        """Check social media availability."""
-        handle = re.sub(r'[^a-zA-Z0-9]', '', name.lower())
-        results = {}
-        for platform, url_template in self.SOCIAL_MEDIA_PLATFORMS.items():
-            url = url_template.format(handle=handle)
+    def _probe_status(self, platform: str, url: str) -> int:
+        """Status code of url, fetching as little of the page as the platform allows."""
+        with self.host_limits.limit(url):
+            start = time.perf_counter()
             try:
-                response = requests.get(url, headers=self.HEADERS)
-                results[platform] = response.status_code != 200
-                time.sleep(0.5)  # Be nice to the servers
+                if platform in self.HEAD_PLATFORMS:
+                    response = self.session.head(url, allow_redirects=True, timeout=self.SOCIAL_TIMEOUT)
+                    if response.status_code != 405:
+                        METRICS.observe_request(url, time.perf_counter() - start, 0, response.status_code)
+                        return response.status_code
+                response = self.session.get(url, headers={'Range': 'bytes=0-0'}, stream=True,
+                                            timeout=self.SOCIAL_TIMEOUT)
+                response.close()
             except Exception:
-                results[platform] = True  # Assume available if error
-        return results
+                METRICS.observe_request(url, time.perf_counter() - start)
+                raise
+            METRICS.observe_request(url, time.perf_counter() - start, 0, response.status_code)
+            return response.status_code
 
-    def generate_variations(self, name: str) -> List[str]:
-        """Generate metal-style variations of the name."""
-        variations = set()
-        variations.add(name)
+    def _handle_available(self, platform: str, url: str) -> bool:
+        try:
+            return self._probe_status(platform, url) not in (200, 206)
+        except Exception:
+            return True  # Assume available if error
+
+    def check_social_media(self, name: str) -> Dict[str, bool]:
+        """Check social media availability.
 
-        metal_chars = {
-            'a': 'æ', 'o': 'ø', 'u': 'ü',
-            'A': 'Æ', 'O': 'Ø', 'U': 'Ü'
+        All platforms are probed at once, each host within its own limits,
+        so a name takes about as long as its slowest platform.
+        """
+        handle = re.sub(r'[^a-zA-Z0-9]', '', name.lower())
+        futures = {
+            platform: self._social_executor.submit(
+                self._handle_available, platform, url_template.format(handle=handle))
+            for platform, url_template in self.SOCIAL_MEDIA_PLATFORMS.items()
         }
+        return {platform: future.result() for platform, future in futures.items()}
 
-        for char, replacement in metal_chars.items():
-            if char in name:
-                metal_name = name.replace(char, replacement)
-                variations.add(metal_name)
+    def generate_variations(self, name: str, limit: int = DEFAULT_VARIATION_LIMIT) -> List[str]:
+        """Generate up to `limit` metal-style variations of the name."""
+        return generate_variations(name, limit)
 
-        # Add common prefixes/suffixes
-        variations.update({f"The {name}", name.replace(' ', ''), name.replace(' ', '_')})
+    def find_taken_variations(self, variations: List[str]) -> Dict[str, int]:
+        """Variations already used by a band in the local index, with how many bands use each.
 
-        return sorted(variations)
+        All variations are resolved in one bulk lookup, so none of them
+        costs a request. Without an index nothing is checked.
+        """
+        if self.variation_index is None:
+            return {}
+        found = self.variation_index.lookup_many(variations)
+        return {variation: len(bands) for variation, bands in found.items() if bands}
 
     def _calculate_viability_score(self, ma_data: Dict, social: Dict[str, bool]) -> int:
         """Calculate a viability score from 0-100."""
@@ -133,7 +313,8 @@ class BandNameAnalyzer:
         score -= sum(not available for available in social.values()) * 10
         return max(0, min(100, score))
 
-    def _generate_recommendations(self, name: str, ma_data: Dict, social: Dict[str, bool]) -> List[str]:
+    def _generate_recommendations(self, name: str, ma_data: Dict, social: Dict[str, bool],
+                                  taken_variations: Dict[str, int] = None) -> List[str]:
         """Generate recommendations based on analysis."""
         recs = []
         if ma_data['total_matches'] > 0:
@@ -143,114 +324,305 @@ class BandNameAnalyzer:
             recs.append(f"Social media handles already taken on: {', '.join(taken_platforms)}")
         if len(name) > 20:
             recs.append("Consider a shorter name for better social media usage")
+        others = sorted(v for v in (taken_variations or {}) if v.lower() != name.lower())
+        if others:
+            recs.append(f"Variations already used by other bands: {', '.join(others)}")
         return recs
 
     def analyze_name(self, name: str) -> Dict:
         """Perform comprehensive name analysis."""
-        ma_data = self.check_metal_archives(name)
-        social = self.check_social_media(name)
+        return self.summarize(name, self.check_metal_archives(name), self.check_social_media(name))
+
+    def summarize(self, name: str, ma_data: Dict, social: Dict[str, bool]) -> Dict:
+        """Combine lookup results into the full analysis of a name."""
         variations = self.generate_variations(name)
+        taken_variations = self.find_taken_variations(variations)
         score = self._calculate_viability_score(ma_data, social)
-        recommendations = self._generate_recommendations(name, ma_data, social)
+        recommendations = self._generate_recommendations(name, ma_data, social, taken_variations)
         return {
             'name': name,
             'metal_archives': ma_data,
             'social_media': social,
             'variations': variations,
+            'taken_variations': taken_variations,
             'viability_score': score,
             'recommendations': recommendations
         }
 
+def report_slug(name: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+
+
 def generate_html_report(analysis: Dict, output_dir: str = "reports") -> str:
     """Generate HTML report from analysis."""
     os.makedirs(output_dir, exist_ok=True)
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f"band_name_report_{timestamp}.html"
+    filename = f"band_name_report_{report_slug(analysis['name'])}_{timestamp}.html"
     filepath = os.path.join(output_dir, filename)
-    html = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <!-- HTML content unchanged -->
-    </head>
-    <body>
-        <div class="container">
-            <h1>Band Name Analysis: {analysis['name']}</h1>
-            <div class="section">
-                <div class="score" style="color: {'#4CAF50' if analysis['viability_score'] >= 70 else '#f44336'}">
-                    {analysis['viability_score']}/100
-                </div>
-            </div>
-            <div class="section">
-                <h2>Metal Archives Results</h2>
-                {HTMLRenderer.generate_ma_html(analysis['metal_archives'])}
-            </div>
-            <div class="section">
-                <h2>Social Media Availability</h2>
-                <ul>
-                    {HTMLRenderer.generate_social_html(analysis['social_media'])}
-                </ul>
-            </div>
-            <div class="section">
-                <h2>Name Variations</h2>
-                {HTMLRenderer.generate_variations_html(analysis['variations'])}
-            </div>
-            <div class="section">
-                <h2>Recommendations</h2>
-                <ul>
-                    {HTMLRenderer.generate_recs_html(analysis['recommendations'])}
-                </ul>
-            </div>
-            <footer style="text-align: center; margin-top: 20px; color: #888;">
-                Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-            </footer>
-        </div>
-    </body>
-    </html>
-    """
     with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(html)
+        f.write(HTMLRenderer.render_report(analysis))
     return filepath
 
-def analyze_from_file(filename: str = "unique_proper_nouns.txt"):
-    """Analyze all names from the proper nouns file."""
-    analyzer = BandNameAnalyzer()
-    os.makedirs("reports", exist_ok=True)
-    print("Loading names from file...")
+
+class BatchReport:
+    """One sortable index page for a batch, written row by row as results arrive.
+
+    Nothing is kept in memory per name: each row is formatted from a
+    precompiled template and written straight to the open file. With
+    `detail_pages`, each name also gets its own page under `names/`,
+    linked from its row.
+    """
+
+    def __init__(self, output_dir: str = "reports/name_report", detail_pages: bool = False):
+        self.output_dir = output_dir
+        self.detail_pages = detail_pages
+        self.index_path = os.path.join(output_dir, 'index.html')
+        self.count = 0
+        os.makedirs(os.path.join(output_dir, 'names') if detail_pages else output_dir, exist_ok=True)
+        self._file = open(self.index_path, 'w', encoding='utf-8')
+        self._file.write(INDEX_HEADER_TEMPLATE.substitute(
+            started=datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+
+    def add(self, analysis: Dict) -> str:
+        """Append a name's row (and write its detail page); returns the page it links to."""
+        name = escape(analysis['name'])
+        link = self.index_path
+        if self.detail_pages:
+            link = os.path.join(self.output_dir, 'names', f"{report_slug(analysis['name']) or 'name'}.html")
+            with open(link, 'w', encoding='utf-8') as f:
+                f.write(HTMLRenderer.render_report(analysis))
+            name = f'<a href="names/{escape(os.path.basename(link))}">{name}</a>'
+        taken = ', '.join(platform for platform, available in analysis['social_media'].items()
+                          if not available)
+        self._file.write(INDEX_ROW_TEMPLATE.substitute(
+            sort_name=escape(analysis['name'].casefold()), name_html=name,
+            score=analysis['viability_score'], matches=analysis['metal_archives']['total_matches'],
+            taken=taken))
+        self._file.flush()
+        self.count += 1
+        return link
+
+    def close(self):
+        if self._file is not None:
+            self._file.write(INDEX_FOOTER_TEMPLATE.substitute(
+                count=self.count, finished=datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+            self._file.close()
+            self._file = None
+
+
+class Progress:
+    """Completed count, throughput and estimated time left for a batch."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.start = time.monotonic()
+
+    def advance(self) -> str:
+        self.done += 1
+        elapsed = time.monotonic() - self.start
+        rate = self.done / elapsed if elapsed else 0.0
+        eta = int((self.total - self.done) / rate) if rate else 0
+        return (f"{self.done}/{self.total} ({rate:.2f} names/s, "
+                f"ETA {eta // 3600}:{eta // 60 % 60:02d}:{eta % 60:02d})")
+
+
+_DONE = object()
+
+
+def _start_stage(func: Callable[[Dict], None], inbox: queue.Queue, outbox: queue.Queue,
+                 workers: int) -> List[threading.Thread]:
+    """Run func on every item from inbox in `workers` threads, passing items on to outbox.
+
+    Items that fail keep going downstream with an 'error' so they are
+    journaled as unfinished. The last worker to see _DONE forwards it.
+    """
+    remaining = [workers]
+    lock = threading.Lock()
+
+    def work():
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                inbox.put(_DONE)
+                with lock:
+                    remaining[0] -= 1
+                    if not remaining[0]:
+                        outbox.put(_DONE)
+                return
+            if 'error' not in item:
+                try:
+                    func(item)
+                except Exception as e:
+                    item['error'] = str(e)
+            outbox.put(item)
+
+    threads = [threading.Thread(target=work, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def analyze_batch(names: Iterable[str], analyzer: BandNameAnalyzer, workers: int = 4,
+                  queue_size: int = 16) -> Iterator[Dict]:
+    """Analyze names as overlapping stages, yielding each finished analysis.
+
+    Metal Archives lookups and social media probes run in their own worker
+    pools joined by bounded queues, so one name's probes overlap the next
+    names' lookups. How fast requests go out is set by the analyzer's
+    per-host limits, not by waiting on each response in turn. Results come
+    back in completion order.
+    """
+    names_queue = queue.Queue(maxsize=queue_size)
+    looked_up = queue.Queue(maxsize=queue_size)
+    probed = queue.Queue(maxsize=queue_size)
+
+    def lookup(item):
+        with METRICS.stage('metal_archives_lookup'):
+            item['metal_archives'] = analyzer.check_metal_archives(item['name'])
+        if 'error' in item['metal_archives']:
+            item['error'] = item['metal_archives']['error']
+
+    def probe(item):
+        with METRICS.stage('social_media_probe'):
+            item['social_media'] = analyzer.check_social_media(item['name'])
+
+    _start_stage(lookup, names_queue, looked_up, workers)
+    _start_stage(probe, looked_up, probed, workers)
+
+    def feed():
+        for name in names:
+            names_queue.put({'name': name})
+        names_queue.put(_DONE)
+
+    threading.Thread(target=feed, daemon=True).start()
+    while True:
+        item = probed.get()
+        if item is _DONE:
+            return
+        if 'error' in item:
+            yield item
+        else:
+            with METRICS.stage('summarize'):
+                analysis = analyzer.summarize(item['name'], item['metal_archives'], item['social_media'])
+            yield analysis
+
+
+def load_variation_index(cache: HTTPCache, index_path: str = DEFAULT_INDEX_PATH) -> BandIndex:
+    """The local band index if one was built, otherwise the bands seen in cached searches."""
+    if os.path.exists(index_path):
+        return BandIndex(index_path)
+    index = BandIndex(':memory:')
+    index.add_bands(read_cached_searches(cache))
+    return index
+
+
+def make_analyzer(cache: HTTPCache, index_path: str = DEFAULT_INDEX_PATH, offline: bool = False) -> BandNameAnalyzer:
+    """An analyzer searching Metal Archives, or with `offline` only the local band index."""
+    if not offline:
+        return BandNameAnalyzer(cache, variation_index=load_variation_index(cache, index_path))
+    index = BandIndex(index_path)
+    if not len(index):
+        print(f"Error: {index_path} is empty. Run `python -m src.band_index` to build it first.")
+        sys.exit(1)
+    return BandNameAnalyzer(cache, index=index)
+
+
+def load_names(filename: str) -> List[str]:
     with open(filename, 'r', encoding='utf-8') as f:
         # Skip header lines
         for line in f:
             if line.startswith('='):
                 break
-        names = [line.strip() for line in f if line.strip()]
+        return [line.strip() for line in f if line.strip()]
+
+
+def analyze_from_file(filename: str = "unique_proper_nouns.txt", workers: int = 4,
+                      journal_path: str = DEFAULT_ANALYSIS_JOURNAL, restart: bool = False,
+                      report_dir: str = "reports/name_report", detail_pages: bool = False,
+                      index_path: str = DEFAULT_INDEX_PATH, offline: bool = False):
+    """Analyze all names from the proper nouns file.
+
+    Finished names are journaled, so an interrupted run picks up where it
+    stopped; pass restart=True to analyze everything again. Results go to
+    one index page in `report_dir`, starting with the names finished by
+    earlier runs. Variations already taken are looked up in the band index
+    at `index_path`, or in cached searches when there is none. With
+    `offline`, names are matched against that index instead of Metal
+    Archives.
+    """
+    cache = HTTPCache()
+    analyzer = make_analyzer(cache, index_path, offline)
+    journal = ResultJournal(journal_path)
+    if restart:
+        journal.reset()
+    os.makedirs("reports", exist_ok=True)
+    print("Loading names from file...")
+    names = load_names(filename)
     print(f"Found {len(names)} names to analyze")
-    for i, name in enumerate(names, 1):
-        print(f"\nAnalyzing name {i}/{len(names)}: {name}")
-        analysis = analyzer.analyze_name(name)
-        report_path = generate_html_report(analysis)
-        print(f"Report generated: {report_path}")
-        time.sleep(1)  # Be nice to the servers
-
-def analyze_single_name(name: str):
+    done = journal.completed()
+    pending = [name for name in names if name not in done]
+    if len(pending) < len(names):
+        print(f"Skipping {len(names) - len(pending)} names already in {journal_path}")
+
+    report = BatchReport(report_dir, detail_pages)
+    wanted = set(names)
+    for analysis in journal:
+        if 'error' not in analysis and analysis['name'] in wanted:
+            report.add(analysis)
+
+    progress = Progress(len(pending))
+    try:
+        for analysis in analyze_batch(pending, analyzer, workers):
+            if 'error' in analysis:
+                print(f"Failed {analysis['name']}: {analysis['error']}")
+            else:
+                with METRICS.stage('write_report'):
+                    analysis['report'] = report.add(analysis)
+            with METRICS.stage('journal'):
+                journal.append(analysis)
+            print(f"Analyzed {analysis['name']} - {progress.advance()}")
+    finally:
+        journal.close()
+        report.close()
+    print(f"\nReport written to {report.index_path}")
+    stats = cache.stats()
+    print(f"\nHTTP cache: {stats['hits']} hits, {stats['misses']} misses "
+          f"({stats['hit_rate']:.0%} hit rate)")
+
+def analyze_single_name(name: str, index_path: str = DEFAULT_INDEX_PATH, offline: bool = False):
     """Analyze a single band name."""
-    analyzer = BandNameAnalyzer()
+    analyzer = make_analyzer(HTTPCache(), index_path, offline)
     analysis = analyzer.analyze_name(name)
     report_path = generate_html_report(analysis)
     print(f"\nReport generated: {report_path}")
 
-def main():
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Analyze band names.")
+    parser.add_argument('--detail-pages', action='store_true',
+                        help="When analyzing a file, also write a page per name linked from the report index")
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH,
+                        help=f"Band index to look up taken variations in (default: {DEFAULT_INDEX_PATH}); "
+                             "without one, bands from cached searches are used")
+    parser.add_argument('--offline', action='store_true',
+                        help="Match names against the band index instead of searching Metal Archives")
+    add_metrics_arguments(parser)
+    args = parser.parse_args(argv)
+
     print("LOTR Band Name Analyzer")
     print("=" * 50)
     print("\n1. Analyze a single name")
     print("2. Analyze all names from file")
     choice = input("\nEnter your choice (1 or 2): ")
-    if choice == "1":
-        name = input("Enter band name to analyze: ")
-        analyze_single_name(name)
-    elif choice == "2":
-        analyze_from_file()
-    else:
+    if choice not in ("1", "2"):
         print("Invalid choice!")
+        return
+    name = input("Enter band name to analyze: ") if choice == "1" else None
+    with instrumented_run('band_name_tool', args.profile, args.metrics_dir):
+        if name is not None:
+            analyze_single_name(name, index_path=args.index, offline=args.offline)
+        else:
+            analyze_from_file(detail_pages=args.detail_pages, index_path=args.index, offline=args.offline)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,91 @@
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict
+
+DEFAULT_STORE_PATH = "cache/band_details.sqlite"
+
+
+class BandDetailStore:
+    """Parsed band details keyed by Metal Archives band URL.
+
+    Several search terms often resolve to the same band ("Hobbit" and
+    "Hobbits" both find Hobbit), so each band page is fetched and parsed once
+    per store, and the store is persisted so later runs reuse it too.
+    Concurrent lookups of the same URL wait for the first fetch instead of
+    starting their own.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        self.fetched = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS band_details (url TEXT PRIMARY KEY, details TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._details = {
+            url: json.loads(details)
+            for url, details in self._conn.execute("SELECT url, details FROM band_details")
+        }
+
+    def __len__(self) -> int:
+        return len(self._details)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._details
+
+    def items(self) -> Dict[str, Dict]:
+        """Snapshot of every stored URL and its details."""
+        with self._lock:
+            return dict(self._details)
+
+    def get_or_fetch(self, url: str, fetch: Callable[[], Dict]) -> Dict:
+        """Return stored details for `url`, calling `fetch` only on the first lookup."""
+        with self._lock:
+            if url in self._details:
+                self.reused += 1
+                return self._details[url]
+            future = self._pending.get(url)
+            owner = future is None
+            if owner:
+                future = self._pending[url] = Future()
+            else:
+                self.reused += 1
+        if not owner:
+            return future.result()
+
+        try:
+            details = fetch()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[url]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self.fetched += 1
+            del self._pending[url]
+            # Failed fetches are handed to waiters but not remembered
+            if 'Error' not in details.values():
+                self._details[url] = details
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO band_details (url, details) VALUES (?, ?)",
+                    (url, json.dumps(details, ensure_ascii=False))
+                )
+                self._conn.commit()
+        future.set_result(details)
+        return details
+
+    def stats(self) -> Dict[str, int]:
+        return {'stored': len(self._details), 'fetched': self.fetched, 'reused': self.reused}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
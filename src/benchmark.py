@@ -0,0 +1,210 @@
+# src/benchmark.py
+"""Offline benchmark suite with machine-readable baselines.
+
+Runs against the local stand-in server, so no request leaves the machine:
+- check_metal: end-to-end `python -m src.check_metal` throughput (terms/s)
+- analyze_name: BandNameAnalyzer names/s, one at a time and batched
+- extraction: proper noun extraction over data/*-chapters (tokens/s)
+- band_pages: band page parsing (pages/s)
+- search: /search latency through the Flask app (p50/p95)
+- fuzzy: typo-tolerant name lookups (µs per lookup)
+
+Results are compared with benchmarks/baseline.json; metrics more than
+--tolerance worse than the baseline are reported as regressions. --save
+writes the current results as the new baseline.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from src.metrics import Histogram
+from src.stand_in_server import BASE_DIR, StandInServer, load_recorded_searches
+
+DEFAULT_BASELINE = BASE_DIR / 'benchmarks' / 'baseline.json'
+
+
+def higher_is_better(metric: str) -> bool:
+    return metric.endswith('_per_s')
+
+
+def lower_is_better(metric: str) -> bool:
+    return metric.endswith('_ms') or metric.endswith('_us')
+
+
+def bench_check_metal(server: StandInServer, terms: int = 200, workers: int = 8) -> Dict:
+    """Run the checker end to end in a subprocess pointed at the stand-in."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, METAL_ARCHIVES_URL=server.url)
+        subprocess.run(
+            [sys.executable, '-m', 'src.check_metal', '--limit', str(terms), '--no-cache',
+             '--workers', str(workers), '--rate', '1000', '--journal', f'{tmp}/journal.jsonl',
+             '--output', f'{tmp}/matches.csv', '--term-map', f'{tmp}/map.json', '--metrics-dir', tmp],
+            cwd=BASE_DIR, env=env, check=True, stdout=subprocess.DEVNULL)
+        summary_path = next(Path(tmp).glob('check_metal_*.json'))
+        summary = json.loads(summary_path.read_text())
+        with open(f'{tmp}/journal.jsonl', encoding='utf-8') as f:
+            results = [json.loads(line) for line in f]
+    requests = sum(host['count'] for host in summary['hosts'].values())
+    return {
+        'terms_per_s': round(len(results) / summary['elapsed_s'], 2),
+        'requests_per_s': round(requests / summary['elapsed_s'], 2),
+        'errors': sum('error' in result for result in results),
+        'retries': summary['counters'].get('http.retries', 0),
+    }
+
+
+def bench_analyze_name(server: StandInServer, names: int = 40, workers: int = 4) -> Dict:
+    from src.band_name_tool import BandNameAnalyzer, analyze_batch
+    from src.http_client import HostLimits
+
+    sample = sorted(load_recorded_searches())[:names] or [f"Name{i}" for i in range(names)]
+
+    def analyzer():
+        instance = BandNameAnalyzer(host_limits=HostLimits(concurrency=8, rate=1000))
+        instance.SEARCH_URL = f"{server.url}/search/ajax-band-search/"
+        instance.SOCIAL_MEDIA_PLATFORMS = server.social_platforms()
+        return instance
+
+    sequential = analyzer()
+    start = time.perf_counter()
+    for name in sample:
+        sequential.analyze_name(name)
+    one_at_a_time = len(sample) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    done = sum(1 for _ in analyze_batch(sample, analyzer(), workers))
+    batched = done / (time.perf_counter() - start)
+    return {'names_per_s': round(one_at_a_time, 2), 'batch_names_per_s': round(batched, 2)}
+
+
+def bench_extraction(data_dir: Path = BASE_DIR / 'data', rounds: int = 3) -> Dict:
+    from src.extract_nouns import collect_candidates, iter_texts
+
+    texts = list(iter_texts(str(data_dir)))
+    tokens = sum(len(text.split()) for text in texts)
+    common_words = {"the", "and", "but", "then", "there", "when", "what", "now"}
+    best = min(_timed(lambda: collect_candidates(texts, common_words)) for _ in range(rounds))
+    return {'tokens': tokens, 'tokens_per_s': round(tokens / best)}
+
+
+def bench_band_pages(rounds: int = 200) -> Dict:
+    from src.check_metal import parse_band_details
+
+    pages = [path.read_text(encoding='utf-8') for path in sorted(
+        (BASE_DIR / 'src' / 'tests' / 'fixtures').glob('band_page_*.html'))]
+    elapsed = _timed(lambda: [parse_band_details(page) for _ in range(rounds) for page in pages])
+    return {'pages_per_s': round(rounds * len(pages) / elapsed)}
+
+
+def bench_search(requests: int = 2000) -> Dict:
+    from src.web import app as web_app
+    from src.web.loadtest import sample_paths
+
+    client = web_app.app.test_client()
+    client.get('/search?q=warmup')
+    paths = [path for path in sample_paths(requests) if path.startswith('/search')]
+    latency = Histogram(samples=len(paths))
+    for path in paths:
+        start = time.perf_counter()
+        client.get(path)
+        latency.observe(time.perf_counter() - start)
+    return {
+        'p50_us': round(latency.percentile(50) * 1e6, 1),
+        'p95_us': round(latency.percentile(95) * 1e6, 1),
+        'requests_per_s': round(latency.count / latency.total, 1),
+    }
+
+
+def bench_fuzzy(lookups: int = 2000) -> Dict:
+    from src.fuzzy import FuzzyIndex
+
+    names = sorted(load_recorded_searches()) or [f"name{i}" for i in range(lookups)]
+    index = FuzzyIndex(names)
+    # Drop one letter from each name, so every query is a near miss
+    queries = [name[:len(name) // 2] + name[len(name) // 2 + 1:] for name in names]
+    queries = (queries * (lookups // len(queries) + 1))[:lookups]
+    elapsed = _timed(lambda: [index.lookup(query) for query in queries])
+    return {'terms': len(index.terms), 'lookup_us': round(elapsed / lookups * 1e6, 1),
+            'lookups_per_s': round(lookups / elapsed)}
+
+
+def _timed(func: Callable) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float = 0.25) -> List[str]:
+    """Descriptions of metrics that got more than `tolerance` worse than the baseline."""
+    regressions = []
+    for bench, metrics in results.items():
+        for metric, value in metrics.items():
+            before = baseline.get(bench, {}).get(metric)
+            if not before or not isinstance(value, (int, float)):
+                continue
+            change = (value - before) / before
+            if (higher_is_better(metric) and change < -tolerance) or \
+                    (lower_is_better(metric) and change > tolerance):
+                regressions.append(f"{bench}.{metric}: {before} -> {value} ({change:+.0%})")
+    return regressions
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite.")
+    parser.add_argument('--only', nargs='+', choices=['check_metal', 'analyze_name', 'extraction',
+                                                      'band_pages', 'search', 'fuzzy'],
+                        help="Run only these benchmarks")
+    parser.add_argument('--latency', type=float, default=0.02,
+                        help="Stand-in server response delay in seconds (default: 0.02)")
+    parser.add_argument('--rate-limit', type=float, default=0.0,
+                        help="Stand-in server requests/s before answering 429 (default: unlimited)")
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help="Baseline JSON to compare with")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Relative slowdown reported as a regression (default: 0.25)")
+    parser.add_argument('--save', action='store_true', help="Write the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    selected = args.only or ['check_metal', 'analyze_name', 'extraction', 'band_pages', 'search', 'fuzzy']
+    results = {}
+    with StandInServer(latency=args.latency, rate_limit=args.rate_limit) as server:
+        benches = {
+            'check_metal': lambda: bench_check_metal(server),
+            'analyze_name': lambda: bench_analyze_name(server),
+            'extraction': bench_extraction,
+            'band_pages': bench_band_pages,
+            'search': bench_search,
+            'fuzzy': bench_fuzzy,
+        }
+        for name in selected:
+            print(f"Running {name}...")
+            results[name] = benches[name]()
+            print(f"  {results[name]}")
+        results['stand_in'] = {'latency_s': args.latency, 'rate_limit': args.rate_limit,
+                               'requests': server.requests, 'throttled': server.throttled}
+
+    print(json.dumps(results, indent=2))
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regressions against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+        else:
+            print(f"\nNo regressions against {args.baseline}")
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print(f"Baseline written to {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,44 @@
 import requests
-import time
-from typing import List, Dict
+import json
+from typing import List, Dict, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+import argparse
 import csv
 import re
 import os
 import sys
 
+from src.band_index import DEFAULT_INDEX_PATH, BandIndex
+from src.band_store import DEFAULT_STORE_PATH, BandDetailStore
+from src.fuzzy import FuzzyIndex, fold
+from src.http_cache import DEFAULT_CACHE_PATH, HTTPCache
+from src.http_client import RateLimiter, fetch_text, make_session
+from src.metrics import METRICS, add_metrics_arguments, instrumented_run
+from src.result_journal import DEFAULT_JOURNAL_PATH, ResultJournal
+from src.terms import DEFAULT_TERM_MAP_PATH, canonical_key, group_terms, load_eldamo_names, load_wiki_titles
+
+DEFAULT_OUTPUT_PATH = "reports/metal_band_matches.csv"
+
+# Set METAL_ARCHIVES_URL to point the checker at a mirror or the local stand-in server
+METAL_ARCHIVES_URL = os.environ.get('METAL_ARCHIVES_URL', "https://www.metal-archives.com").rstrip('/')
+SEARCH_URL = f"{METAL_ARCHIVES_URL}/search/ajax-band-search/"
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'X-Requested-With': 'XMLHttpRequest'
+}
+
+# How long cached responses stay fresh, in seconds. Search results change as
+# bands are added; band pages rarely change.
+SEARCH_TTL = 7 * 24 * 3600
+BAND_PAGE_TTL = 30 * 24 * 3600
+
+# Used when callers don't share a limiter: two requests per second, the same
+# pace as the old fixed half-second sleeps.
+DEFAULT_LIMITER = RateLimiter(2.0)
+
 def load_proper_nouns(filename: str = "reports/unique_proper_nouns.txt") -> List[str]:
     """Load the proper nouns from the file, skipping header lines."""
     try:
@@ -50,72 +83,149 @@ def load_gateway_pages(filename: str = "data/external-sources/tolkien_gateway_pa
         print(f"Error loading gateway pages from {filename}: {e}")
         return []
 
-def combine_search_terms(verbose: bool = True) -> List[str]:
-    """Combine proper nouns and Gateway pages into a single deduplicated list."""
-    proper_nouns = load_proper_nouns()
-    gateway_pages = load_gateway_pages()
-    
+def combine_search_terms(verbose: bool = True, fuzzy: bool = False,
+                         map_path: str = DEFAULT_TERM_MAP_PATH) -> List[str]:
+    """Combine every name source into one query per canonical term.
+
+    Terms differing only in case, diacritics, a wiki namespace or a
+    parenthetical ("Anduin", "ANDUIN", "Anduin (river)") share one query;
+    the map at `map_path` lists the originals behind each query. With
+    `fuzzy`, pairs of queries one edit apart are reported as possible
+    spelling variants.
+    """
+    sources = {
+        'proper_nouns': load_proper_nouns(),
+        'gateway': load_gateway_pages(),
+        'ortrt': load_wiki_titles(),
+        'eldamo': load_eldamo_names(),
+    }
     if verbose:
-        print(f"Loaded {len(proper_nouns)} proper nouns")
-        print(f"Loaded {len(gateway_pages)} gateway pages")
+        for source, terms in sources.items():
+            print(f"Loaded {len(terms)} terms from {source}")
     
-    # Combine and deduplicate
-    combined_terms = list(set(proper_nouns + gateway_pages))
+    groups = group_terms(sources)
+    combined_terms = groups.queries()
+    if map_path:
+        groups.write_map(map_path)
     
-    # Sort alphabetically
-    combined_terms.sort()
+    if fuzzy and verbose:
+        variants = list(find_near_variants(combined_terms))
+        print(f"Found {len(variants)} pairs of terms one edit apart, e.g.:")
+        for term, variant in variants[:10]:
+            print(f"  {term} ~ {variant}")
     
     if verbose:
-        print(f"Final combined list contains {len(combined_terms)} terms")
+        print(f"Combined {groups.originals} terms into {len(combined_terms)} queries")
+        if map_path:
+            print(f"Query to original term map saved to '{map_path}'")
     
     return combined_terms
 
 
-def get_band_details(url: str, headers: dict) -> dict:
+def find_near_variants(terms: List[str], max_distance: int = 1) -> Iterator[tuple]:
+    """Pairs of terms whose folded forms are within max_distance edits."""
+    index = FuzzyIndex(terms, max_distance=max_distance)
+    originals = {fold(term): term for term in terms}
+    for term in terms:
+        folded = fold(term)
+        if len(folded) <= 4:
+            continue
+        for match, distance in index.lookup(folded):
+            if distance and folded < match:
+                yield term, originals[match]
+
+
+# Band page <dt> labels, lowercased, mapped to detail fields
+BAND_STAT_FIELDS = {
+    'genre:': 'genre',
+    'themes:': 'themes',
+    'lyrical themes:': 'themes',
+    'country of origin:': 'country',
+    'location:': 'location',
+    'status:': 'status',
+    'formed in:': 'formed',
+    'current label:': 'label',
+    'last label:': 'label',
+    'years active:': 'years_active',
+}
+DETAIL_FIELDS = ['genre', 'themes', 'country', 'location', 'status', 'formed']
+
+_STAT_PAIR_RE = re.compile(r'<dt>\s*(.*?)\s*</dt>\s*<dd[^>]*>(.*?)</dd>', re.DOTALL | re.IGNORECASE)
+_LINK_RE = re.compile(r'<a\s[^>]*?href="([^"]+)"[^>]*>(.*?)</a>', re.DOTALL | re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def _section(html: str, marker: str) -> str:
+    """The div containing `marker` (e.g. 'id="band_stats"'), or the whole page without it."""
+    start = html.find(marker)
+    if start == -1:
+        return html
+    depth, pos = 1, start
+    while depth:
+        close = html.find('</div>', pos)
+        if close == -1:
+            return html[start:]
+        opening = html.find('<div', pos, close)
+        if opening != -1:
+            depth, pos = depth + 1, opening + 4
+        else:
+            depth, pos = depth - 1, close + 6
+    return html[start:pos]
+
+
+def _clean(value: str) -> str:
+    return _SPACE_RE.sub(' ', _TAG_RE.sub('', value)).strip()
+
+
+def parse_band_details(html: str) -> dict:
+    """Band details from a Metal Archives band page.
+
+    The band-stats block is located once and its <dt>/<dd> pairs are read in
+    a single pass, which also picks up the label and years active. Links
+    from the discography block are returned as [title, url] pairs.
+    """
+    details = {field: 'N/A' for field in DETAIL_FIELDS}
+    details.update(label='N/A', years_active='N/A')
+    seen = set()
+    for label, value in _STAT_PAIR_RE.findall(_section(html, 'id="band_stats"')):
+        field = BAND_STAT_FIELDS.get(_clean(label).lower())
+        if field is None or field in seen:
+            continue
+        seen.add(field)
+        details[field] = _clean(value) or 'N/A'
+    details['discography'] = [[_clean(title), url] for url, title
+                              in _LINK_RE.findall(_section(html, 'id="band_disco"'))
+                              if '/discography/' in url]
+    return details
+
+
+def get_band_details(url: str, headers: dict, session: requests.Session = None,
+                     limiter: RateLimiter = None, cache: HTTPCache = None) -> dict:
     """Get detailed information about a band from their Metal Archives page."""
     try:
-        time.sleep(.5)  # Respect rate limiting
-        
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        html = response.text
-        
-        details = {}
-        
-        # Patterns that match Metal Archives' HTML structure
-        patterns = {
-            'genre': r'<dt>Genre:</dt>\s*<dd>(.*?)</dd>',
-            'themes': r'<dt>Themes:</dt>\s*<dd>(.*?)</dd>',
-            'country': r'<dt>Country of origin:</dt>\s*<dd>.*?>(.*?)</a>',
-            'location': r'<dt>Location:</dt>\s*<dd>(.*?)</dd>',
-            'status': r'<dt>Status:</dt>\s*<dd>(.*?)</dd>',
-            'formed': r'<dt>Formed in:</dt>\s*<dd>(.*?)</dd>'
-        }
-        
-        for key, pattern in patterns.items():
-            match = re.search(pattern, html, re.DOTALL | re.IGNORECASE)
-            if match:
-                value = match.group(1)
-                value = re.sub(r'<[^>]+>', '', value)  # Remove any nested HTML
-                value = re.sub(r'\s+', ' ', value)     # Normalize whitespace
-                value = value.strip()
-                details[key] = value if value else 'N/A'
-            else:
-                details[key] = 'N/A'
-                
-        return details
+        html = fetch_text(url, headers=headers, session=session,
+                          limiter=limiter or DEFAULT_LIMITER, cache=cache, ttl=BAND_PAGE_TTL)
+        with METRICS.stage('parse_band_page'):
+            return parse_band_details(html)
         
     except requests.exceptions.RequestException as e:
         print(f"Network error getting band details from {url}: {str(e)}")
-        return {k: 'Error' for k in ['genre', 'themes', 'country', 'location', 'status', 'formed']}
+        return {k: 'Error' for k in DETAIL_FIELDS}
     except Exception as e:
         print(f"Error parsing band details from {url}: {str(e)}")
-        return {k: 'Error' for k in ['genre', 'themes', 'country', 'location', 'status', 'formed']}
+        return {k: 'Error' for k in DETAIL_FIELDS}
 
-def check_metal_archives(name: str) -> Dict:
-    """Check if a band exists on Metal Archives."""
-    base_url = "https://www.metal-archives.com/search/ajax-band-search/"
-    
+def check_metal_archives(name: str, session: requests.Session = None,
+                         limiter: RateLimiter = None, cache: HTTPCache = None,
+                         store: BandDetailStore = None) -> Dict:
+    """Check if a band exists on Metal Archives.
+
+    Bands whose name has the same canonical key as `name` count as exact
+    matches, so searching "Gloin" also finds "Glóin". When a `store` is
+    given, band pages already fetched for another term are served from it
+    instead of being requested again.
+    """
     params = {
         'field': 'name',
         'query': name,
@@ -124,29 +234,25 @@ def check_metal_archives(name: str) -> Dict:
         'iDisplayLength': 100
     }
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'X-Requested-With': 'XMLHttpRequest'
-    }
-    
     try:
-        time.sleep(.5)  # Respect rate limiting
-        
-        response = requests.get(base_url, params=params, headers=headers)
-        response.raise_for_status()
-        data = response.json()
+        with METRICS.stage('search_request'):
+            body = fetch_text(SEARCH_URL, params, HEADERS, session,
+                              limiter or DEFAULT_LIMITER, cache, SEARCH_TTL)
+        with METRICS.stage('parse_search_results'):
+            data = json.loads(body)
         
+        key = canonical_key(name)
         exact_matches = []
         for band_data in data['aaData']:
             url_match = re.search(r'href="([^"]+)"', band_data[0])
             if url_match:
                 band_name = re.sub(r'<[^>]+>', '', band_data[0]).strip()
-                if band_name.lower().strip() == name.lower().strip():
+                if canonical_key(band_name) == key:
                     band_url = url_match.group(1)
-                    print(f"Getting details for {band_name} from {band_url}")
-                    details = get_band_details(band_url, headers)
+                    def fetch():
+                        print(f"Getting details for {band_name} from {band_url}")
+                        return get_band_details(band_url, HEADERS, session, limiter, cache)
+                    details = fetch() if store is None else store.get_or_fetch(band_url, fetch)
                     exact_matches.append({
                         'name': band_name,
                         'url': band_url,
@@ -179,7 +285,7 @@ def check_metal_archives(name: str) -> Dict:
             'error': str(e)
         }
 
-def save_results(results: List[Dict], filename: str = "reports/metal_band_matches.csv"):
+def save_results(results: List[Dict], filename: str = DEFAULT_OUTPUT_PATH):
     """Save results to a CSV file."""
     with open(filename, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
@@ -221,43 +327,161 @@ def save_results(results: List[Dict], filename: str = "reports/metal_band_matche
                     '',
                     ''
                 ])
-def main():
+def check_terms(search_terms: Iterable[str], workers: int = 4,
+                rate: float = 2.0, cache: HTTPCache = None,
+                store: BandDetailStore = None) -> Iterator[Dict]:
+    """Check terms concurrently, yielding results in input order.
+
+    All workers share one keep-alive session and one token-bucket limiter,
+    so `rate` caps requests per second across the whole run. Responses
+    found in `cache` don't count against the limit, and band pages already
+    in `store` aren't fetched again.
+    """
+    limiter = RateLimiter(rate)
+    session = make_session(pool_size=workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(
+            lambda name: check_metal_archives(name, session, limiter, cache, store),
+            search_terms
+        )
+
+
+def check_terms_offline(search_terms: Iterable[str], index: BandIndex) -> Iterator[Dict]:
+    """Resolve terms against the local band index instead of Metal Archives."""
+    for name, bands in index.lookup_many(search_terms).items():
+        yield {
+            'name': name,
+            'exists': bool(bands),
+            'total_matches': len(bands),
+            'matches': bands
+        }
+
+
+def load_search_terms(args: argparse.Namespace) -> List[str]:
+    """The terms listed in --terms, or the combined proper nouns and Gateway pages."""
+    if args.terms:
+        with open(args.terms, 'r', encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip()]
+    return combine_search_terms(fuzzy=args.fuzzy, map_path=args.term_map)
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check search terms against Metal Archives.")
+    parser.add_argument('--workers', type=int, default=4,
+                        help="Number of concurrent requests in flight (default: 4)")
+    parser.add_argument('--rate', type=float, default=2.0,
+                        help="Maximum requests per second across all workers (default: 2.0)")
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH,
+                        help=f"Path of the HTTP response cache (default: {DEFAULT_CACHE_PATH})")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always fetch from the network")
+    parser.add_argument('--details-store', default=DEFAULT_STORE_PATH,
+                        help=f"Parsed band details shared across runs (default: {DEFAULT_STORE_PATH})")
+    parser.add_argument('--offline', action='store_true',
+                        help="Match terms against the local band index without any HTTP requests")
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH,
+                        help=f"Band index used by --offline (default: {DEFAULT_INDEX_PATH})")
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL_PATH,
+                        help=f"Append-only log of checked terms (default: {DEFAULT_JOURNAL_PATH})")
+    parser.add_argument('--restart', action='store_true',
+                        help="Discard the journal and check every term again")
+    parser.add_argument('--fuzzy', action='store_true',
+                        help="Report pairs of search terms one edit apart")
+    parser.add_argument('--terms', default=None,
+                        help="Check the terms listed in this file, one per line, instead of combining the sources")
+    parser.add_argument('--term-map', default=DEFAULT_TERM_MAP_PATH,
+                        help=f"Where to save the query to original term map (default: {DEFAULT_TERM_MAP_PATH})")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_PATH,
+                        help=f"CSV file to write (default: {DEFAULT_OUTPUT_PATH})")
+    parser.add_argument('--limit', type=int, default=None,
+                        help="Only check the first N search terms")
+    add_metrics_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main_offline(args: argparse.Namespace):
+    """Match every term in one local pass and write the CSV."""
+    index = BandIndex(args.index)
+    if not len(index):
+        print(f"Error: {args.index} is empty. Run `python -m src.band_index` to build it first.")
+        sys.exit(1)
+    with METRICS.stage('combine_terms'):
+        search_terms = load_search_terms(args)[:args.limit]
+    with METRICS.stage('match_offline'):
+        results = list(check_terms_offline(search_terms, index))
+    with METRICS.stage('save_csv'):
+        save_results(results, args.output)
+    exact_matches = sum(len(r['matches']) for r in results)
+    print(f"\nMatched {len(results)} names offline against {len(index)} indexed bands")
+    print(f"Found {exact_matches} exact matches")
+    print(f"Results have been saved to '{args.output}'")
+
+
+def main_online(args: argparse.Namespace):
+    """Check every pending term against Metal Archives and write the CSV."""
+    cache = None if args.no_cache else HTTPCache(args.cache)
+    store = None if args.no_cache else BandDetailStore(args.details_store)
+    journal = ResultJournal(args.journal)
+    if args.restart:
+        journal.reset()
     print("Loading and combining search terms...")
-    search_terms = combine_search_terms()
+    with METRICS.stage('combine_terms'):
+        search_terms = load_search_terms(args)[:args.limit]
     print(f"Loaded {len(search_terms)} names to check")
     
-    results = []
-    total = len(search_terms)
+    done = journal.completed()
+    pending = [name for name in search_terms if name not in done]
+    total = len(pending)
+    if len(search_terms) > total:
+        print(f"Skipping {len(search_terms) - total} names already in {args.journal}")
     
-    print("\nChecking names against Metal Archives...")
+    print(f"\nChecking names against Metal Archives "
+          f"({args.workers} workers, {args.rate} requests/s)...")
     # This will take a while
-    for i, name in enumerate(search_terms, 1):
-        print(f"Checking {name} ({i}/{total})...")
-        
-        result = check_metal_archives(name)
-        results.append(result)
-        
-        if result['exists']:
-            print(f"Found {result['total_matches']} matching bands:")
-            for match in result['matches']:
-                print(f"  - {match['name']}")  # Removed match_type reference
-        
-        time.sleep(.5) 
-        
-        # Save progress every 10 names
-        if i % 10 == 0:
-            print(f"\nSaving progress... ({i}/{total} names processed)")
-            save_results(results)
+    try:
+        for i, result in enumerate(check_terms(pending, args.workers, args.rate, cache, store), 1):
+            print(f"Checked {result['name']} ({i}/{total})")
+            with METRICS.stage('journal'):
+                journal.append(result)
+            
+            if result['exists']:
+                print(f"Found {result['total_matches']} matching bands:")
+                for match in result['matches']:
+                    print(f"  - {match['name']}")  # Removed match_type reference
+    finally:
+        journal.close()
     
     print("\nSaving final results...")
-    save_results(results)
+    wanted = set(search_terms)
+    with METRICS.stage('save_csv'):
+        results = [r for r in journal.results() if r['name'] in wanted]
+        save_results(results, args.output)
     
     # Count matches
     exact_matches = sum(1 for r in results for m in r.get('matches', []))
     
     print(f"\nFinished checking {total} names")
     print(f"Found {exact_matches} exact matches")
-    print("Results have been saved to 'reports/metal_band_matches.csv'")
+    if cache is not None:
+        stats = cache.stats()
+        print(f"HTTP cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%} hit rate), {stats['evictions']} evictions")
+    if store is not None:
+        stats = store.stats()
+        METRICS.incr('band_details.fetched', stats['fetched'])
+        METRICS.incr('band_details.reused', stats['reused'])
+        print(f"Band details: {stats['fetched']} fetched, "
+              f"{stats['reused']} fetches avoided by reusing stored details")
+    print(f"Results have been saved to '{args.output}'")
+
+
+def main(argv: List[str] = None):
+    args = parse_args(argv)
+    with instrumented_run('check_metal', args.profile, args.metrics_dir):
+        if args.offline:
+            main_offline(args)
+        else:
+            main_online(args)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
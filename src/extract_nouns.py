@@ -1,8 +1,29 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
 import requests
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from src.metrics import METRICS, add_metrics_arguments, instrumented_run
+from src.word_store import DEFAULT_WORDS_PATH, WordStore, compile_word_list
+
+DEFAULT_MANIFEST_PATH = "cache/noun_manifest.json"
+
+# Candidate proper nouns: whitespace-delimited tokens of two or more characters
+# starting with a possibly-uppercase character: A-Z or any non-ASCII character
+# that isn't whitespace (such as a no-break space). Non-ASCII starts are
+# confirmed with str.isupper afterwards. Testing the character class before
+# the lookbehind lets the scan skip over lowercase text quickly.
+_CANDIDATE_RE = re.compile(r'[^\x00-\x40\x5b-\x7f\s](?<!\S.)\S+')
 
 def download_word_list():
-    """Download a list of common English words, with SSL verification handling."""
+    """Download a list of common English words."""
     word_list_urls = [
         'https://raw.githubusercontent.com/dwyl/english-words/master/words.txt',
         'https://raw.githubusercontent.com/first20hours/google-10000-english/master/google-10000-english.txt'
@@ -14,7 +35,7 @@ def download_word_list():
     for url in word_list_urls:
         try:
             print(f"Downloading word list from {url}...")
-            response = requests.get(url, verify=False)  # verify=False is equivalent to the previous SSL context
+            response = requests.get(url, timeout=60)
             response.raise_for_status()  # Raise an exception for bad status codes
             content = response.text
             words.update(word.strip().lower() for word in content.split())
@@ -37,61 +58,110 @@ def download_word_list():
     print(f"Downloaded {len(words)} common words.")
     return words
 
+
+def load_common_words(path: str = DEFAULT_WORDS_PATH, refresh: bool = False) -> WordStore:
+    """Open the compiled word list, downloading and compiling it only when needed."""
+    if refresh or not os.path.exists(path):
+        words = download_word_list()
+        if words:
+            count = compile_word_list(words, path)
+            print(f"Compiled {count} words into {path}")
+        elif os.path.exists(path):
+            print(f"Keeping the existing word list in {path}")
+        else:
+            print("Error: no word list could be downloaded or found.")
+            sys.exit(1)
+    return WordStore(path)
+
+def iter_chapter_files(data_dir: str = 'data') -> Iterator[Path]:
+    """Yield every chapter file under the *-chapters directories."""
+    chapter_dirs = sorted(d for d in Path(data_dir).iterdir() if d.is_dir() and d.name.endswith('-chapters'))
+    for dir_path in chapter_dirs:
+        yield from sorted(dir_path.glob('*.txt'))
+
+
+def split_text(text: str, chunk_size: int) -> Iterator[str]:
+    """Split text into chunks of about chunk_size characters on whitespace."""
+    start = 0
+    while len(text) - start > chunk_size:
+        end = start + chunk_size
+        # Back up to whitespace so no word is cut in two
+        while end > start and not text[end].isspace():
+            end -= 1
+        if end == start:
+            end = start + chunk_size
+            while end < len(text) and not text[end].isspace():
+                end += 1
+        yield text[start:end]
+        start = end
+    if start < len(text):
+        yield text[start:]
+
+
+def iter_texts(data_dir: str = 'data', chunk_size: int = None) -> Iterator[str]:
+    """Lazily yield each chapter, or fixed-size chunks of it, one at a time."""
+    for file_path in iter_chapter_files(data_dir):
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except Exception as e:
+            print(f"Error reading {file_path}: {e}")
+            continue
+        if chunk_size:
+            yield from split_text(text, chunk_size)
+        else:
+            yield text
+
+
 def read_texts():
     """Read all text files from the data directories."""
-    texts = []
-    data_dir = Path('data')
+    print("Reading all texts...")
+    return list(iter_texts())
+
+
+def clean_candidate(word: str, common_words: set) -> Optional[str]:
+    """Normalize one capitalized token, or return None if it isn't a proper noun."""
+    # Check if first character is uppercase
+    if not word[0].isupper():
+        return None
     
-    # Find all chapter directories
-    chapter_dirs = [d for d in data_dir.iterdir() if d.is_dir() and d.name.endswith('-chapters')]
+    # Handle possessive 's before other punctuation
+    if "'s" in word.lower():
+        word = word.split("'")[0]
     
-    print("Reading all texts...")
-    for dir_path in chapter_dirs:
-        for file_path in dir_path.glob('*.txt'):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    texts.append(f.read())
-            except Exception as e:
-                print(f"Error reading {file_path}: {e}")
+    # Remove remaining punctuation, keeping original case
+    clean_word = word if word.isalpha() else ''.join(filter(str.isalpha, word))
     
-    return texts
+    # Skip if empty after cleaning
+    if not clean_word:
+        return None
+        
+    # Skip if it's a common word (lowercase comparison)
+    if clean_word.lower() in common_words:
+        return None
+    
+    # Standardize to Title Case
+    return clean_word.title()
 
 
-def extract_proper_nouns(texts: list[str], common_words: set) -> set:
-    """Extract proper nouns from texts that aren't in common word list."""
-    words = set()
-    
-    # First pass: collect all words
+def collect_candidates(texts: Iterable[str], common_words: set) -> Counter:
+    """Count capitalized words that aren't in the common word list.
+
+    Each text is scanned once with a compiled regex and identical tokens are
+    counted together, so each distinct token is cleaned only once.
+    """
+    counts = Counter()
     for text in texts:
-        for word in text.split():
-            # Skip if word is too short
-            if len(word) < 2:
-                continue
-                
-            # Check if first character is uppercase
-            if not word[0].isupper():
-                continue
-            
-            # Handle possessive 's before other punctuation
-            if "'s" in word.lower():
-                word = word.split("'")[0]
-            
-            # Remove remaining punctuation, keeping original case
-            clean_word = ''.join(c for c in word if c.isalpha())
-            
-            # Skip if empty after cleaning
-            if not clean_word:
-                continue
-                
-            # Skip if it's a common word (lowercase comparison)
-            if clean_word.lower() in common_words:
-                continue
-            
-            # Standardize to Title Case
-            clean_word = clean_word.title()
-            words.add(clean_word)
-    
-    # Second pass: remove plurals if singular exists
+        for word, n in Counter(_CANDIDATE_RE.findall(text)).items():
+            clean_word = clean_candidate(word, common_words)
+            if clean_word:
+                counts[clean_word] += n
+    return counts
+
+
+def filter_plurals(words: Iterable[str]) -> set:
+    """Drop words ending in 's' whose singular form is also present."""
+    words = set(words)
     filtered_words = set()
     for word in words:
         # If word ends in 's' and its singular form exists in our set,
@@ -103,15 +173,161 @@ def extract_proper_nouns(texts: list[str], common_words: set) -> set:
         filtered_words.add(word)
     
     return filtered_words
-def main():
-    # Download or load word list
-    common_words = download_word_list()
-    
-    # Read all texts
-    texts = read_texts()
+
+
+def extract_proper_nouns(texts: list[str], common_words: set) -> set:
+    """Extract proper nouns from texts that aren't in common word list."""
+    return filter_plurals(collect_candidates(texts, common_words))
+
+
+_worker_common_words = None
+
+
+def _init_worker(common_words: set):
+    global _worker_common_words
+    _worker_common_words = common_words
+
+
+def _collect_chunk(text: str) -> Counter:
+    return collect_candidates([text], _worker_common_words)
+
+
+def _collect_file(path: str) -> Counter:
+    with open(path, 'r', encoding='utf-8') as f:
+        return collect_candidates([f.read()], _worker_common_words)
+
+
+def _map_bounded(func: Callable, items: Iterable, common_words: set,
+                 workers: int = None) -> Iterator[Tuple[object, Counter]]:
+    """Run func over items in a process pool, yielding (item, result) as they finish.
+
+    Items are pulled from the iterable only as workers free up, so at most a
+    couple of items per worker are held in memory at once.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(common_words,)) as executor:
+        pending = {}
+        for item in items:
+            pending[executor.submit(func, item)] = item
+            if len(pending) >= workers * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+        for future in list(pending):
+            yield pending.pop(future), future.result()
+
+
+def collect_candidates_parallel(texts: Iterable[str], common_words: set,
+                                workers: int = None) -> Counter:
+    """Count candidates across a process pool, merging per-chunk counters."""
+    counts = Counter()
+    for _, chunk_counts in _map_bounded(_collect_chunk, texts, common_words, workers):
+        counts.update(chunk_counts)
+    return counts
+
+
+def extract_proper_nouns_parallel(texts: Iterable[str], common_words: set,
+                                  workers: int = None) -> set:
+    """Parallel, streaming version of extract_proper_nouns."""
+    return filter_plurals(collect_candidates_parallel(texts, common_words, workers))
+
+
+def _words_fingerprint(common_words) -> str:
+    if isinstance(common_words, WordStore):
+        return common_words.fingerprint()
+    return hashlib.sha256('\n'.join(sorted(common_words)).encode('utf-8')).hexdigest()
+
+
+def _file_hash(path: Path) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def extract_proper_nouns_incremental(data_dir: str, common_words: set,
+                                     manifest_path: str = DEFAULT_MANIFEST_PATH,
+                                     workers: int = None) -> set:
+    """Extract proper nouns, re-tokenizing only chapters that changed.
+
+    The manifest records each chapter's content hash and candidate counts.
+    Unchanged chapters reuse their cached counts; new or edited ones go
+    through the process pool. The plural filter then runs on the merged
+    counts. Changing the word list invalidates every cached entry.
+    """
+    fingerprint = _words_fingerprint(common_words)
+    manifest = {'words': fingerprint, 'files': {}}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('words') == fingerprint:
+            manifest['files'] = cached.get('files', {})
+
+    files = {}
+    stale = []
+    for file_path in iter_chapter_files(data_dir):
+        key = file_path.as_posix()
+        files[key] = _file_hash(file_path)
+        entry = manifest['files'].get(key)
+        if entry is None or entry['sha256'] != files[key]:
+            stale.append(key)
+
+    print(f"{len(files) - len(stale)} chapters unchanged, {len(stale)} to extract")
+    entries = {key: entry for key, entry in manifest['files'].items() if key in files}
+    for key, counts in _map_bounded(_collect_file, stale, common_words, workers):
+        entries[key] = {'sha256': files[key], 'candidates': dict(counts)}
+
+    manifest['files'] = entries
+    if os.path.dirname(manifest_path):
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+    counts = Counter()
+    for entry in entries.values():
+        counts.update(entry['candidates'])
+    return filter_plurals(counts)
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Extract proper nouns from the chapter texts.")
+    parser.add_argument('--data-dir', default='data',
+                        help="Directory holding the *-chapters folders (default: data)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="Number of extraction processes (default: one per CPU)")
+    parser.add_argument('--chunk-size', type=int, default=1_000_000,
+                        help="Split chapters into chunks of about this many characters (default: 1000000)")
+    parser.add_argument('--words', default=DEFAULT_WORDS_PATH,
+                        help=f"Compiled common-word list (default: {DEFAULT_WORDS_PATH})")
+    parser.add_argument('--refresh-words', action='store_true',
+                        help="Download the common-word list again and recompile it")
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST_PATH,
+                        help=f"Per-chapter hashes and cached counts (default: {DEFAULT_MANIFEST_PATH})")
+    parser.add_argument('--full', action='store_true',
+                        help="Ignore the manifest and stream every chapter through the pool")
+    add_metrics_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None):
+    args = parse_args(argv)
+    with instrumented_run('extract_nouns', args.profile, args.metrics_dir):
+        run(args)
+
+
+def run(args: argparse.Namespace):
+    # Load the compiled word list, downloading it on first use
+    with METRICS.stage('load_common_words'):
+        common_words = load_common_words(args.words, args.refresh_words)
     
-    # Extract proper nouns
-    proper_nouns = extract_proper_nouns(texts, common_words)
+    print(f"Extracting proper nouns with {args.workers} workers...")
+    with METRICS.stage('extract'):
+        if args.full:
+            # Stream texts through the worker pool
+            texts = iter_texts(args.data_dir, args.chunk_size)
+            proper_nouns = extract_proper_nouns_parallel(texts, common_words, args.workers)
+        else:
+            proper_nouns = extract_proper_nouns_incremental(args.data_dir, common_words,
+                                                            args.manifest, args.workers)
     
     print(f"\nFound {len(proper_nouns)} unique proper nouns across all texts")
     
@@ -119,8 +335,9 @@ def main():
     sorted_nouns = sorted(proper_nouns)
     
     # Save results
-    with open('reports/unique_proper_nouns.txt', 'w') as f:
-        f.write('\n'.join(sorted_nouns))
+    with METRICS.stage('write_results'):
+        with open('reports/unique_proper_nouns.txt', 'w') as f:
+            f.write('\n'.join(sorted_nouns))
     
     print("\nResults have been saved to 'reports/unique_proper_nouns.txt'")
 if __name__ == "__main__":
@@ -0,0 +1,187 @@
+# src/fuzzy.py
+"""Typo- and diacritic-tolerant lookup of names.
+
+Names are compared by their folded form: decomposed, stripped of combining
+marks and lowercased, so "Dúnedain" and "dunedain" are the same key.
+FuzzyIndex is a SymSpell-style deletion index over folded terms. Every term
+is stored under each string obtainable by deleting up to `max_distance`
+characters from its prefix; a query generates its own deletes and only the
+terms sharing one are checked with a real edit distance, instead of
+scanning every term.
+"""
+import unicodedata
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+
+def fold(text: str) -> str:
+    """ASCII-folded, lowercased form of text: "Abattârik" -> "abattarik"."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance, or max_distance + 1 once it is exceeded.
+
+    The shared prefix and suffix are skipped, and only the diagonal band of
+    the table that can stay within max_distance is computed.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    # Keep one shared character on each side so a swap across the boundary still counts as one edit
+    start = max(0, start - 1)
+    end_a, end_b = min(len(a), end_a + 1), min(len(b), end_b + 1)
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        distance = max(len(a), len(b))
+        return distance if distance <= max_distance else max_distance + 1
+
+    too_far = max_distance + 1
+    previous2 = None
+    previous = [j if j <= max_distance else too_far for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [too_far] * (len(b) + 1)
+        if i <= max_distance:
+            current[0] = i
+        row_min = current[0]
+        char = a[i - 1]
+        prev_char = a[i - 2] if i > 1 else None
+        for j in range(max(1, i - max_distance), min(len(b), i + max_distance) + 1):
+            value = previous[j - 1] + (char != b[j - 1])
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if (previous2 is not None and j > 1 and char == b[j - 2] and prev_char == b[j - 1]
+                    and previous2[j - 2] + 1 < value):
+                value = previous2[j - 2] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return too_far
+        previous2, previous = previous, current
+    return min(previous[-1], too_far)
+
+
+def deletes(term: str, max_distance: int) -> Set[str]:
+    """term and every string made by deleting up to max_distance characters from it."""
+    found = {term}
+    frontier = {term}
+    for _ in range(max_distance):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))} - found
+        found |= frontier
+    return found
+
+
+class FuzzyIndex:
+    """Folded terms that can be looked up within a small edit distance.
+
+    Only the first `prefix_length` characters of a term are expanded into
+    deletes, which keeps the index small for long names; candidates are
+    still verified against the whole term.
+    """
+
+    def __init__(self, terms: Iterable[str], max_distance: int = 2, prefix_length: int = 7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.terms: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._deletes: Dict[str, List[int]] = {}
+        for term in terms:
+            self.add(term)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __contains__(self, term: str) -> bool:
+        return fold(term) in self._ids
+
+    def add(self, term: str) -> int:
+        """Index a term (folded here) and return its id."""
+        term = fold(term)
+        term_id = self._ids.get(term)
+        if term_id is not None:
+            return term_id
+        term_id = self._ids[term] = len(self.terms)
+        self.terms.append(term)
+        for key in deletes(term[:self.prefix_length], self.max_distance):
+            self._deletes.setdefault(key, []).append(term_id)
+        return term_id
+
+    def lookup(self, query: str, max_distance: int = None) -> List[Tuple[str, int]]:
+        """(term, distance) pairs within max_distance of query, closest first."""
+        if max_distance is None:
+            max_distance = self.max_distance
+        max_distance = min(max_distance, self.max_distance)
+        query = fold(query)
+        seen = set()
+        matches = []
+        for key in deletes(query[:self.prefix_length], max_distance):
+            for term_id in self._deletes.get(key, ()):
+                if term_id in seen:
+                    continue
+                seen.add(term_id)
+                term = self.terms[term_id]
+                distance = edit_distance(query, term, max_distance)
+                if distance <= max_distance:
+                    matches.append((term, distance))
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+
+def default_distance(query: str) -> int:
+    """Allowed typos for a query: one for short queries, two otherwise."""
+    return 1 if len(query) <= 4 else 2
+
+
+class FuzzyNameIndex:
+    """Rows found by fuzzy matching any of their names, or a word in one.
+
+    `names` holds the searchable names of each row, e.g. (search name,
+    band name); row ids are positions in `names`.
+    """
+
+    def __init__(self, names: Iterable[Sequence[str]], min_word_length: int = 3):
+        self._terms = FuzzyIndex(())
+        self._rows: Dict[str, List[int]] = {}
+        for row_id, fields in enumerate(names):
+            for term in self._row_terms(fields, min_word_length):
+                self._terms.add(term)
+                self._rows.setdefault(term, []).append(row_id)
+
+    @staticmethod
+    def _row_terms(fields: Sequence[str], min_word_length: int) -> Set[str]:
+        terms = set()
+        for field in fields:
+            if not field:
+                continue
+            folded = fold(field).strip()
+            terms.add(folded)
+            terms.update(word for word in folded.split() if len(word) >= min_word_length)
+        terms.discard('')
+        return terms
+
+    def ranked(self, query: str) -> Dict[int, int]:
+        """Every matching row id with the edit distance of its closest name."""
+        query = fold(query).strip()
+        ranked = {}
+        if not query:
+            return ranked
+        for term, distance in self._terms.lookup(query, default_distance(query)):
+            for row_id in self._rows[term]:
+                if row_id not in ranked or distance < ranked[row_id]:
+                    ranked[row_id] = distance
+        return ranked
+
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> List[int]:
+        """Ids of matching rows, closest matches first, then in row order."""
+        ranked = self.ranked(query)
+        ordered = sorted(ranked, key=lambda row_id: (ranked[row_id], row_id))
+        return ordered[offset:offset + limit]
@@ -0,0 +1,135 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlencode, urlsplit, urlunsplit
+
+DEFAULT_CACHE_PATH = "cache/http_cache.sqlite"
+
+
+class HTTPCache:
+    """SQLite-backed cache of response bodies keyed by normalized URL and params.
+
+    Bodies are stored zlib-compressed with a per-entry expiry time. When the
+    stored bodies grow beyond `max_bytes` the least recently used entries are
+    evicted.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = 200 * 1024 * 1024,
+                 default_ttl: float = 30 * 24 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+        self._total_bytes = self._stored_bytes()
+
+    def _stored_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def normalize_url(url: str, params: Optional[Dict] = None) -> str:
+        """Return a canonical form of the URL with its query params sorted."""
+        parts = urlsplit(url)
+        query = [tuple(pair.split('=', 1)) if '=' in pair else (pair, '')
+                 for pair in parts.query.split('&') if pair]
+        query += [(str(k), str(v)) for k, v in (params or {}).items()]
+        path = parts.path or '/'
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path,
+                           urlencode(sorted(query)), ''))
+
+    @classmethod
+    def make_key(cls, url: str, params: Optional[Dict] = None) -> str:
+        return hashlib.sha256(cls.normalize_url(url, params).encode('utf-8')).hexdigest()
+
+    def get(self, url: str, params: Optional[Dict] = None) -> Optional[str]:
+        """Return the cached body, or None if it is missing or expired."""
+        key = self.make_key(url, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def set(self, url: str, body: str, params: Optional[Dict] = None, ttl: Optional[float] = None):
+        """Store a response body, evicting old entries if the cache is full."""
+        key = self.make_key(url, params)
+        blob = zlib.compress(body.encode('utf-8'))
+        now = time.time()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, body, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, self.normalize_url(url, params), blob, len(blob), expires_at, now)
+            )
+            # Replacing an entry over-counts until the next eviction pass recounts
+            self._total_bytes += len(blob)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        cursor = self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+        self.evictions += cursor.rowcount
+        total = self._stored_bytes()
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+        self._total_bytes = total
+
+    def bodies_matching(self, url_pattern: str) -> Iterator[str]:
+        """Yield unexpired bodies whose normalized URL matches a SQL LIKE pattern."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT body FROM responses WHERE url LIKE ? AND expires_at >= ?",
+                (url_pattern, time.time())
+            ).fetchall()
+        for (blob,) in rows:
+            yield zlib.decompress(blob).decode('utf-8')
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,149 @@
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.metrics import METRICS
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+
+class RateLimiter:
+    """Token bucket limiting how many requests per second may start.
+
+    One instance is shared by every worker talking to the same site, so the
+    politeness budget holds no matter how many threads are running.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            METRICS.observe('rate_limit_wait', wait)
+            time.sleep(wait)
+
+
+class HostLimits:
+    """Per-host cap on concurrent requests and on request rate.
+
+    Each host gets its own semaphore and RateLimiter the first time it is
+    seen, so a slow or strict host never holds up requests to the others.
+    """
+
+    def __init__(self, concurrency: int = 2, rate: float = 1.0):
+        self.concurrency = concurrency
+        self.rate = rate
+        self._hosts: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _for_host(self, host: str) -> tuple:
+        with self._lock:
+            limits = self._hosts.get(host)
+            if limits is None:
+                limits = self._hosts[host] = (threading.Semaphore(self.concurrency),
+                                              RateLimiter(self.rate))
+            return limits
+
+    def limiter(self, url: str) -> RateLimiter:
+        """The URL's host rate limiter, for callers that only need the rate budget."""
+        return self._for_host(urlsplit(url).hostname or '')[1]
+
+    @contextmanager
+    def limit(self, url: str):
+        """Hold one of the URL's host slots for the duration of a request."""
+        semaphore, limiter = self._for_host(urlsplit(url).hostname or '')
+        with semaphore:
+            limiter.acquire()
+            yield
+
+
+def make_session(pool_size: int = 10, headers: dict = None) -> requests.Session:
+    """Create a session whose keep-alive pool fits `pool_size` concurrent workers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(headers or DEFAULT_HEADERS)
+    return session
+
+
+# Responses meaning "slow down": retried after the server's Retry-After delay
+RETRY_STATUSES = {429, 503}
+MAX_RETRY_WAIT = 60.0
+
+
+def retry_after(response: requests.Response, default: float = 1.0) -> float:
+    """Seconds to wait before retrying, from a Retry-After header in seconds or as a date."""
+    value = response.headers.get('Retry-After')
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            seconds = default
+    return min(max(seconds, 0.0), MAX_RETRY_WAIT)
+
+
+def fetch_text(url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+               session: Optional[requests.Session] = None, limiter: Optional[RateLimiter] = None,
+               cache=None, ttl: Optional[float] = None, retries: int = 3) -> str:
+    """GET a URL and return its body, reading through `cache` when given.
+
+    The limiter is only consulted for requests that actually hit the network.
+    A 429 or 503 is retried up to `retries` times after the delay the server
+    asks for. Failed responses raise and are never cached.
+    """
+    if cache is not None:
+        body = cache.get(url, params)
+        if body is not None:
+            METRICS.incr('http_cache.hits')
+            return body
+        METRICS.incr('http_cache.misses')
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.acquire()
+        start = time.perf_counter()
+        try:
+            response = (session or requests).get(url, params=params, headers=headers)
+        except requests.exceptions.RequestException:
+            METRICS.observe_request(url, time.perf_counter() - start)
+            raise
+        METRICS.observe_request(url, time.perf_counter() - start, len(response.content), response.status_code)
+        if response.status_code not in RETRY_STATUSES or attempt == retries:
+            break
+        wait = retry_after(response)
+        METRICS.incr('http.retries')
+        METRICS.observe('retry_after_wait', wait)
+        time.sleep(wait)
+    response.raise_for_status()
+    body = response.text
+    if cache is not None:
+        cache.set(url, body, params, ttl)
+    return body
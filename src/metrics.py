@@ -0,0 +1,188 @@
+# src/metrics.py
+"""Process-wide run metrics shared by the scripts and the web app.
+
+METRICS collects:
+- stage timings (`with METRICS.stage('parse'):`)
+- per-host request counts, latencies, bytes and status codes
+- plain counters such as cache hits
+
+Stage times are summed across threads, so parallel stages can report more
+seconds than the run took. Each process keeps its own numbers; prefork
+web workers each report their own.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_METRICS_DIR = "reports/metrics"
+
+# Upper bounds of the latency buckets, in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """Latency histogram with fixed buckets plus recent samples for percentiles."""
+
+    def __init__(self, samples: int = 4096):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self._recent = deque(maxlen=samples)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.buckets[bisect_left(BUCKETS_MS, seconds * 1000)] += 1
+        self._recent.append(seconds)
+
+    def percentile(self, pct: float) -> float:
+        """Percentile of the recent samples, in seconds."""
+        if not self._recent:
+            return 0.0
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+    def summary(self) -> Dict:
+        labels = [f"<={bound}ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        return {
+            'count': self.count,
+            'total_s': round(self.total, 4),
+            'mean_ms': round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            'p50_ms': round(self.percentile(50) * 1000, 3),
+            'p95_ms': round(self.percentile(95) * 1000, 3),
+            'p99_ms': round(self.percentile(99) * 1000, 3),
+            'buckets': {label: n for label, n in zip(labels, self.buckets) if n},
+        }
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.timings: Dict[str, Histogram] = {}
+            self.hosts: Dict[str, Dict] = {}
+            self.counters: Counter = Counter()
+
+    def observe(self, name: str, seconds: float):
+        """Record one timed occurrence of `name`."""
+        with self._lock:
+            histogram = self.timings.get(name)
+            if histogram is None:
+                histogram = self.timings[name] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block as one occurrence of stage `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def incr(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def observe_request(self, url: str, seconds: float, nbytes: int = 0, status: Optional[int] = None):
+        """Record one HTTP request to the URL's host."""
+        host = urlsplit(url).hostname or ''
+        with self._lock:
+            stats = self.hosts.get(host)
+            if stats is None:
+                stats = self.hosts[host] = {'latency': Histogram(), 'bytes': 0, 'statuses': Counter()}
+            stats['latency'].observe(seconds)
+            stats['bytes'] += nbytes
+            stats['statuses'][str(status) if status is not None else 'error'] += 1
+
+    def summary(self) -> Dict:
+        with self._lock:
+            hits = self.counters.get('http_cache.hits', 0)
+            misses = self.counters.get('http_cache.misses', 0)
+            return {
+                'started': datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+                'elapsed_s': round(time.time() - self.started, 3),
+                'stages': {name: h.summary() for name, h in sorted(self.timings.items())},
+                'hosts': {
+                    host: {**stats['latency'].summary(), 'bytes': stats['bytes'],
+                           'statuses': dict(stats['statuses'])}
+                    for host, stats in sorted(self.hosts.items())
+                },
+                'counters': dict(sorted(self.counters.items())),
+                'http_cache_hit_rate': round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            }
+
+    def write_summary(self, path: str) -> str:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+        return path
+
+
+METRICS = Metrics()
+
+
+def format_summary(summary: Dict, top: int = 8) -> str:
+    """A few lines for the end of a run: slowest stages and busiest hosts."""
+    lines = [f"Run took {summary['elapsed_s']:.1f}s"]
+    stages = sorted(summary['stages'].items(), key=lambda item: -item[1]['total_s'])
+    for name, stats in stages[:top]:
+        lines.append(f"  {name:<24} {stats['total_s']:9.2f}s over {stats['count']} "
+                     f"(p50 {stats['p50_ms']:.1f}ms, p95 {stats['p95_ms']:.1f}ms)")
+    for host, stats in summary['hosts'].items():
+        lines.append(f"  {host:<24} {stats['count']} requests, {stats['bytes'] / 1024:,.0f} KiB, "
+                     f"p50 {stats['p50_ms']:.0f}ms, p95 {stats['p95_ms']:.0f}ms")
+    if summary['counters'].get('http_cache.hits') or summary['counters'].get('http_cache.misses'):
+        lines.append(f"  HTTP cache hit rate {summary['http_cache_hit_rate']:.0%}")
+    return '\n'.join(lines)
+
+
+def add_metrics_arguments(parser):
+    parser.add_argument('--profile', action='store_true',
+                        help="Run under cProfile and save the stats next to the run summary")
+    parser.add_argument('--metrics-dir', default=DEFAULT_METRICS_DIR,
+                        help=f"Where to write the JSON run summary (default: {DEFAULT_METRICS_DIR})")
+
+
+@contextmanager
+def instrumented_run(name: str, profile: bool = False, metrics_dir: str = DEFAULT_METRICS_DIR):
+    """Reset METRICS, optionally profile the block, then write and print the run summary.
+
+    Writes `<metrics_dir>/<name>_<timestamp>.json` and, with `profile`, a
+    matching `.prof` file loadable with pstats or snakeviz. cProfile only
+    sees the calling thread; worker threads show up in the stage timings.
+    """
+    METRICS.reset()
+    base = os.path.join(metrics_dir, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    profiler = cProfile.Profile() if profile else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield METRICS
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        path = METRICS.write_summary(f"{base}.json")
+        print(f"\n{format_summary(METRICS.summary())}")
+        print(f"Run summary written to {path}")
+        if profiler is not None:
+            profiler.dump_stats(f"{base}.prof")
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(15)
+            print(output.getvalue())
+            print(f"Profile written to {base}.prof")
@@ -0,0 +1,281 @@
+# src/pipeline.py
+"""Run the whole workflow as one graph of stages.
+
+    extract --+
+              +-- combine -- check -- publish
+    sources --+
+
+Each stage names the files it reads and writes. Before running a stage the
+inputs are hashed; when the digest matches the one recorded in
+cache/pipeline_state.json and the outputs are unchanged since, the stage is
+skipped. Stages run as soon as their dependencies finish, so extract and
+sources run side by side. A stage that reruns but writes identical files
+does not wake up the stages after it.
+
+The check stage only sends terms missing from the check_metal journal to
+Metal Archives, so a changed term list costs one search per new term. It
+also runs, inputs unchanged or not, while the journal holds failed terms,
+so those are retried. With --offline it matches against the local band
+index instead, and rebuilding the index reruns it like a changed term list.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Sequence
+
+from src.metrics import METRICS, add_metrics_arguments, instrumented_run
+
+DEFAULT_STATE_PATH = "cache/pipeline_state.json"
+PIPELINE_DIR = "cache/pipeline"
+PROPER_NOUNS_PATH = "reports/unique_proper_nouns.txt"
+GATEWAY_PATH = "data/external-sources/tolkien_gateway_pages.txt"
+SOURCE_TERMS_PATH = f"{PIPELINE_DIR}/source_terms.json"
+SEARCH_TERMS_PATH = f"{PIPELINE_DIR}/search_terms.txt"
+STAGE_NAMES = ['extract', 'sources', 'combine', 'check', 'publish']
+
+
+def file_digest(path: str) -> str:
+    """sha256 of the file's contents, or '' if it does not exist."""
+    if not os.path.exists(path):
+        return ''
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Stage:
+    """One step of the pipeline.
+
+    `inputs` are paths or glob patterns, `outputs` plain paths, `after` the
+    names of stages that must finish first and `params` any settings that
+    should rerun the stage when they change. `rerun_if`, when given, is
+    called before the inputs are compared; if it returns True the stage
+    runs even though nothing changed.
+    """
+
+    def __init__(self, name: str, run: Callable[[], None], inputs: Sequence[str] = (),
+                 outputs: Sequence[str] = (), after: Sequence[str] = (), params: Dict = None,
+                 rerun_if: Callable[[], bool] = None):
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.after = list(after)
+        self.params = params or {}
+        self.rerun_if = rerun_if
+
+    def input_files(self) -> List[str]:
+        files = []
+        for pattern in self.inputs:
+            files.extend(sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern])
+        return files
+
+    def digest(self) -> str:
+        """Hash of every input file's path and contents plus the params."""
+        digest = hashlib.sha256(json.dumps(self.params, sort_keys=True).encode('utf-8'))
+        for path in self.input_files():
+            digest.update(f"\n{path}\0{file_digest(path)}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def output_digests(self) -> Dict[str, str]:
+        return {path: file_digest(path) for path in self.outputs}
+
+
+class PipelineState:
+    """Input digests and output hashes of the last successful run of each stage."""
+
+    def __init__(self, path: str = DEFAULT_STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.stages: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.stages = json.load(f)
+
+    def is_current(self, stage: Stage, digest: str) -> bool:
+        recorded = self.stages.get(stage.name)
+        return bool(recorded and recorded['inputs'] == digest
+                    and all(os.path.exists(path) for path in stage.outputs)
+                    and recorded['outputs'] == stage.output_digests())
+
+    def record(self, stage: Stage, digest: str, seconds: float):
+        with self._lock:
+            self.stages[stage.name] = {
+                'inputs': digest,
+                'outputs': stage.output_digests(),
+                'finished': datetime.now().isoformat(timespec='seconds'),
+                'seconds': round(seconds, 3),
+            }
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.stages, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def run_stage(stage: Stage, state: PipelineState, force: bool = False) -> str:
+    """Run one stage unless its inputs are unchanged; returns 'ran' or 'skipped'."""
+    digest = stage.digest()
+    if not force and stage.rerun_if is not None and stage.rerun_if():
+        force = True
+        print(f"[{stage.name}] retrying earlier failures")
+    if not force and state.is_current(stage, digest):
+        print(f"[{stage.name}] inputs unchanged, skipping")
+        return 'skipped'
+    print(f"[{stage.name}] running")
+    start = time.perf_counter()
+    with METRICS.stage(f"pipeline.{stage.name}"):
+        stage.run()
+    seconds = time.perf_counter() - start
+    state.record(stage, digest, seconds)
+    print(f"[{stage.name}] done in {seconds:.1f}s")
+    return 'ran'
+
+
+def run_pipeline(stages: Iterable[Stage], state: PipelineState, force: Iterable[str] = ()) -> Dict[str, str]:
+    """Run the stages in dependency order, independent ones concurrently.
+
+    Returns each stage's outcome: 'ran', 'skipped', 'failed', or 'blocked'
+    when a stage it depends on failed.
+    """
+    pending = {stage.name: stage for stage in stages}
+    force = set(force)
+    for stage in pending.values():
+        unknown = [name for name in stage.after if name not in pending]
+        if unknown:
+            raise ValueError(f"stage {stage.name} depends on unknown stages {unknown}")
+
+    outcome: Dict[str, str] = {}
+    running = {}
+    with ThreadPoolExecutor(max_workers=max(1, len(pending))) as pool:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if not all(dep in outcome for dep in stage.after):
+                    continue
+                del pending[name]
+                if any(outcome[dep] in ('failed', 'blocked') for dep in stage.after):
+                    print(f"[{name}] not run because an earlier stage failed")
+                    outcome[name] = 'blocked'
+                else:
+                    running[pool.submit(run_stage, stage, state, name in force)] = name
+            if not running:
+                if pending:
+                    raise ValueError(f"stages {sorted(pending)} depend on each other")
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    outcome[name] = future.result()
+                except (Exception, SystemExit) as e:
+                    print(f"[{name}] failed: {e!r}")
+                    outcome[name] = 'failed'
+    return outcome
+
+
+def _write_lines(path: str, lines: Iterable[str]):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+
+def build_stages(args: argparse.Namespace) -> List[Stage]:
+    from src import check_metal, extract_nouns, terms
+    from src.band_index import DEFAULT_INDEX_PATH
+    from src.result_journal import DEFAULT_JOURNAL_PATH, ResultJournal
+    from src.web.snapshot import SNAPSHOT_FILE, build_snapshot
+    from src.word_store import DEFAULT_WORDS_PATH
+
+    def extract():
+        extract_nouns.run(extract_nouns.parse_args(['--workers', str(args.workers)] if args.workers else []))
+
+    def sources():
+        loaded = {
+            'gateway': check_metal.load_gateway_pages(GATEWAY_PATH),
+            'ortrt': terms.load_wiki_titles(terms.ORTRT_PATH),
+            'eldamo': terms.load_eldamo_names(terms.ELDAMO_PATH),
+        }
+        os.makedirs(PIPELINE_DIR, exist_ok=True)
+        with open(SOURCE_TERMS_PATH, 'w', encoding='utf-8') as f:
+            json.dump(loaded, f, ensure_ascii=False)
+
+    def combine():
+        with open(SOURCE_TERMS_PATH, 'r', encoding='utf-8') as f:
+            sources = json.load(f)
+        groups = terms.group_terms({'proper_nouns': check_metal.load_proper_nouns(PROPER_NOUNS_PATH), **sources})
+        groups.write_map(terms.DEFAULT_TERM_MAP_PATH)
+        queries = groups.queries()
+        _write_lines(SEARCH_TERMS_PATH, queries)
+        print(f"[combine] {groups.originals} terms combined into {len(queries)} queries")
+
+    def check():
+        argv = ['--terms', SEARCH_TERMS_PATH, '--rate', str(args.rate)]
+        if args.workers:
+            argv += ['--workers', str(args.workers)]
+        check_args = check_metal.parse_args(argv + (['--offline'] if args.offline else []))
+        if args.offline:
+            check_metal.main_offline(check_args)
+        else:
+            check_metal.main_online(check_args)
+
+    def publish():
+        rows = build_snapshot(check_metal.DEFAULT_OUTPUT_PATH, SNAPSHOT_FILE)
+        print(f"[publish] wrote {rows} rows to {SNAPSHOT_FILE}")
+
+    return [
+        # extract downloads and compiles the word list on first use, so it is
+        # one of its outputs; replacing it reruns the stage like an input would
+        Stage('extract', extract, inputs=['data/*-chapters/*.txt'],
+              outputs=[PROPER_NOUNS_PATH, DEFAULT_WORDS_PATH]),
+        Stage('sources', sources, inputs=[GATEWAY_PATH, terms.ORTRT_PATH, terms.ELDAMO_PATH],
+              outputs=[SOURCE_TERMS_PATH]),
+        Stage('combine', combine, inputs=[PROPER_NOUNS_PATH, SOURCE_TERMS_PATH],
+              outputs=[SEARCH_TERMS_PATH, terms.DEFAULT_TERM_MAP_PATH], after=['extract', 'sources']),
+        # Terms journaled with an error are only retried by running check again;
+        # offline matches are only as current as the band index they came from
+        Stage('check', check, inputs=[SEARCH_TERMS_PATH] + ([DEFAULT_INDEX_PATH] if args.offline else []),
+              outputs=[check_metal.DEFAULT_OUTPUT_PATH],
+              after=['combine'], params={'offline': args.offline},
+              rerun_if=lambda: bool(ResultJournal(DEFAULT_JOURNAL_PATH).failed())),
+        Stage('publish', publish, inputs=[check_metal.DEFAULT_OUTPUT_PATH], outputs=[SNAPSHOT_FILE],
+              after=['check']),
+    ]
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Extract, combine, check and publish, skipping unchanged stages.")
+    parser.add_argument('--state', default=DEFAULT_STATE_PATH,
+                        help=f"Where stage digests are recorded (default: {DEFAULT_STATE_PATH})")
+    parser.add_argument('--force', nargs='+', choices=STAGE_NAMES, default=[],
+                        help="Run these stages even if their inputs are unchanged")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Workers for extraction and checking (default: each tool's own default)")
+    parser.add_argument('--rate', type=float, default=2.0,
+                        help="Maximum Metal Archives requests per second (default: 2.0)")
+    parser.add_argument('--offline', action='store_true',
+                        help="Check terms against the local band index instead of Metal Archives")
+    add_metrics_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None):
+    args = parse_args(argv)
+    with instrumented_run('pipeline', args.profile, args.metrics_dir):
+        outcome = run_pipeline(build_stages(args), PipelineState(args.state), args.force)
+    print("\n" + ", ".join(f"{name}: {result}" for name, result in outcome.items()))
+    if 'failed' in outcome.values():
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import json
+import os
+from typing import Dict, Iterator, List, Set
+
+DEFAULT_JOURNAL_PATH = "reports/metal_band_matches.jsonl"
+
+
+class ResultJournal:
+    """Append-only JSONL log of checked search terms.
+
+    Each finished term is written as one line and flushed immediately, so an
+    interrupted run loses at most the line being written. Rerunning skips
+    every term already journaled without an error.
+    """
+
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = None
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Yield every journaled result in write order."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write leaves a truncated last line
+                    continue
+
+    def _latest_ok(self) -> Dict[str, bool]:
+        latest = {}
+        for result in self:
+            latest[result['name']] = 'error' not in result
+        return latest
+
+    def completed(self) -> Set[str]:
+        """Names whose latest entry finished without an error."""
+        return {name for name, ok in self._latest_ok().items() if ok}
+
+    def failed(self) -> Set[str]:
+        """Names whose latest entry is an error, to be retried by the next run."""
+        return {name for name, ok in self._latest_ok().items() if not ok}
+
+    def results(self) -> List[Dict]:
+        """Latest result for every journaled name, sorted by name."""
+        latest = {result['name']: result for result in self}
+        return [latest[name] for name in sorted(latest)]
+
+    def append(self, result: Dict):
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(result, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def reset(self):
+        """Discard all journaled results."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
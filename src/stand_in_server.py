@@ -0,0 +1,186 @@
+# src/stand_in_server.py
+"""Local stand-in for Metal Archives and the social media sites.
+
+Replays search results built from a matches CSV written by an earlier
+check_metal run, and serves the sample band pages in src/tests/fixtures for
+every band URL. Every response can be delayed by a fixed latency, and with
+a rate limit, requests over the limit get a 429 with a Retry-After header.
+Point the tools at it with METAL_ARCHIVES_URL:
+
+    python -m src.stand_in_server --port 8765 --latency 0.05 --rate-limit 20
+    METAL_ARCHIVES_URL=http://127.0.0.1:8765 python -m src.check_metal --limit 50
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_MATCHES = BASE_DIR / 'reports' / 'metal_band_matches.csv'
+DEFAULT_PAGES_DIR = BASE_DIR / 'src' / 'tests' / 'fixtures'
+
+
+def load_recorded_searches(csv_path: Path = DEFAULT_MATCHES) -> Dict[str, List[Dict]]:
+    """Bands found by an earlier run, keyed by lowercased search term."""
+    searches = defaultdict(list)
+    if not os.path.exists(csv_path):
+        return searches
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            if row.get('Band Name') in (None, '', 'No match found'):
+                continue
+            searches[row['Search Name'].lower().strip()].append(row)
+    return searches
+
+
+class StandInServer:
+    """Threaded stand-in HTTP server, usable as a context manager."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 rate_limit: float = 0.0, retry_after: float = 1.0,
+                 matches: Path = DEFAULT_MATCHES, pages_dir: Path = DEFAULT_PAGES_DIR):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.searches = load_recorded_searches(matches)
+        self.pages = [path.read_text(encoding='utf-8') for path in sorted(Path(pages_dir).glob('band_page_*.html'))]
+        self.requests = 0
+        self.throttled = 0
+        self._tokens = rate_limit
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _allow(self) -> bool:
+        """Token bucket allowing `rate_limit` requests per second (0 = unlimited)."""
+        with self._lock:
+            self.requests += 1
+            if not self.rate_limit:
+                return True
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._last) * self.rate_limit)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            self.throttled += 1
+            return False
+
+    def search_response(self, query: str) -> Dict:
+        rows = self.searches.get(query.lower().strip(), [])
+        data = []
+        for row in rows:
+            path = urlsplit(row['URL']).path
+            data.append([f'<a href="{self.url}{path}">{row["Band Name"]}</a>',
+                         row.get('Genre') or 'N/A', row.get('Country') or 'N/A'])
+        return {'error': '', 'iTotalRecords': len(data), 'iTotalDisplayRecords': len(data),
+                'sEcho': 1, 'aaData': data}
+
+    def band_page(self, path: str) -> str:
+        digest = int(hashlib.md5(path.encode('utf-8')).hexdigest(), 16)
+        return self.pages[digest % len(self.pages)] if self.pages else '<html></html>'
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes = b'', content_type: str = 'text/html; charset=utf-8',
+                      headers: Dict[str, str] = None):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(body)
+
+            def do_HEAD(self):
+                self.do_GET()
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                if not server._allow():
+                    self._send(429, b'Too Many Requests', 'text/plain',
+                               {'Retry-After': str(server.retry_after)})
+                    return
+                url = urlsplit(self.path)
+                if url.path.rstrip('/') == '/search/ajax-band-search':
+                    query = parse_qs(url.query).get('query', [''])[0]
+                    body = json.dumps(server.search_response(query)).encode('utf-8')
+                    self._send(200, body, 'application/json')
+                elif url.path.startswith('/bands/'):
+                    self._send(200, server.band_page(url.path).encode('utf-8'))
+                elif re.match(r'^/social/\w+/\w+', url.path):
+                    # About one handle in four is "taken"
+                    taken = hashlib.md5(url.path.encode('utf-8')).digest()[0] < 64
+                    self._send(200 if taken else 404, b'<html>profile</html>' if taken else b'')
+                else:
+                    self._send(404, b'not found', 'text/plain')
+
+        return Handler
+
+    def social_platforms(self) -> Dict[str, str]:
+        """URL templates for BandNameAnalyzer.SOCIAL_MEDIA_PLATFORMS served by this server."""
+        return {platform: f"{self.url}/social/{platform}/{{handle}}"
+                for platform in ('bandcamp', 'instagram', 'twitter', 'facebook')}
+
+    def start(self) -> 'StandInServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> 'StandInServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for Metal Archives.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds to delay every response")
+    parser.add_argument('--rate-limit', type=float, default=0.0,
+                        help="Requests per second before answering 429 (default: unlimited)")
+    parser.add_argument('--matches', default=str(DEFAULT_MATCHES), help="Matches CSV to replay searches from")
+    args = parser.parse_args(argv)
+    server = StandInServer(args.host, args.port, args.latency, args.rate_limit, matches=Path(args.matches))
+    print(f"Stand-in serving {len(server.searches)} recorded searches on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+# src/terms.py
+"""Search term normalization across the name sources.
+
+Terms from every source are grouped by a canonical key: wiki namespace and
+parenthetical disambiguators removed, whitespace collapsed, then folded
+(diacritics dropped, case merged). "Abattârik", "ABATTARIK" and
+"Abattarik (disambiguation)" are one key, so they cost one search. Each
+key is searched once under its most readable original, and the term map
+records every original behind each query.
+"""
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Tuple
+
+from src.fuzzy import fold
+from src.variations import ELDAMO_PATH, fix_mojibake
+
+DEFAULT_TERM_MAP_PATH = "reports/search_term_map.json"
+ORTRT_PATH = "data/external-sources/ORTRT_wiki.txt"
+
+# Wiki pages in these namespaces are about the wiki, not Middle-earth
+SKIPPED_NAMESPACES = {'benutzer', 'blog', 'board', 'expo', 'file', 'help', 'main page', 'mediawiki',
+                      'module', 'portal', 'special', 'talk', 'template', 'user'}
+
+_NAMESPACE_RE = re.compile(r'^([A-Za-z][A-Za-z ]*):(?=\S)')
+_PARENTHETICAL_RE = re.compile(r'\s*\([^)]*\)')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def namespace(term: str) -> str:
+    """The lowercased wiki namespace of a title ("Help:Bots" -> "help"), or ''."""
+    match = _NAMESPACE_RE.match(term)
+    return match.group(1).lower() if match else ''
+
+
+def display_form(term: str) -> str:
+    """The term without namespace, parentheticals or extra whitespace."""
+    term = _NAMESPACE_RE.sub('', term.strip())
+    term = _PARENTHETICAL_RE.sub('', term)
+    return _SPACE_RE.sub(' ', term).strip()
+
+
+def canonical_key(term: str) -> str:
+    """Key shared by every spelling of a term that Metal Archives treats alike."""
+    return fold(display_form(term))
+
+
+def load_wiki_titles(path: str = ORTRT_PATH) -> List[str]:
+    """Page titles from a wiki dump, leaving out the wiki's own pages."""
+    if not os.path.exists(path):
+        print(f"Warning: {path} not found!")
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        titles = [line.strip() for line in f]
+    return [title for title in titles if title and namespace(title) not in SKIPPED_NAMESPACES]
+
+
+def load_eldamo_names(path: str = ELDAMO_PATH) -> List[str]:
+    """Proper names from the Eldamo dictionary.
+
+    The file is double-encoded and mixes names with common words, roots
+    (all capitals) and affixes (leading or trailing hyphen); only
+    capitalized entries are kept. "A/B" entries give both names.
+    """
+    if not os.path.exists(path):
+        print(f"Warning: {path} not found!")
+        return []
+    names = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            for name in fix_mojibake(line.strip()).split('/'):
+                name = name.strip()
+                if (len(name) >= 3 and name[0].isupper() and not name.isupper()
+                        and not name.startswith('-') and not name.endswith('-')):
+                    names.append(name)
+    return names
+
+
+class TermGroups:
+    """Terms from several sources grouped by canonical key."""
+
+    def __init__(self):
+        self._groups: Dict[str, Dict[str, List[str]]] = {}
+        self._sources: Dict[str, int] = {}
+        self.originals = 0
+
+    def add(self, term: str, source: str):
+        key = canonical_key(term)
+        if not key:
+            return
+        self.originals += 1
+        self._sources.setdefault(source, len(self._sources))
+        group = self._groups.setdefault(key, {})
+        sources = group.setdefault(term, [])
+        if source not in sources:
+            sources.append(source)
+
+    def add_source(self, source: str, terms: Iterable[str]):
+        for term in terms:
+            self.add(term, source)
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def _query(self, group: Dict[str, List[str]]) -> str:
+        """The original to search with.
+
+        Mixed case wins, then the spelling from the earliest source added,
+        so queries stay the same as sources are added and terms already in
+        the check_metal journal are not searched again.
+        """
+        def rank(term: str) -> Tuple:
+            form = display_form(term)
+            first_source = min(self._sources[source] for source in group[term])
+            return form.isupper() or form.islower(), first_source, -len(group[term]), len(term), term
+        return display_form(min(group, key=rank))
+
+    def queries(self) -> List[str]:
+        """One search term per key, sorted."""
+        return sorted(self._query(group) for group in self._groups.values())
+
+    def mapping(self) -> Dict[str, Dict]:
+        """Each query with the originals and sources it stands for."""
+        mapping = {}
+        for key, group in self._groups.items():
+            mapping[self._query(group)] = {
+                'key': key,
+                'originals': sorted(group),
+                'sources': sorted({source for sources in group.values() for source in sources}),
+            }
+        return dict(sorted(mapping.items()))
+
+    def write_map(self, path: str = DEFAULT_TERM_MAP_PATH) -> str:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.mapping(), f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+        return path
+
+
+def group_terms(sources: Dict[str, Iterable[str]]) -> TermGroups:
+    """Group the terms of each named source."""
+    groups = TermGroups()
+    for source, terms in sources.items():
+        groups.add_source(source, terms)
+    return groups
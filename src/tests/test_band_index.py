@@ -0,0 +1,53 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from src.band_index import BandIndex
+
+class TestBandIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index = BandIndex(str(Path(self.tmp.name) / "index.sqlite"))
+        self.index.add_bands([
+            {'name': 'Gorgoroth', 'url': 'https://ma/bands/Gorgoroth/770', 'genre': 'Black Metal'},
+            {'name': 'Cirith Ungol', 'url': 'https://ma/bands/Cirith_Ungol/561'},
+        ])
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp.cleanup()
+
+    def test_case_insensitive_lookup(self):
+        self.assertEqual(self.index.lookup('GORGOROTH')[0]['genre'], 'Black Metal')
+        self.assertEqual(self.index.lookup('Gorgoroth Ungol'), [])
+
+    def test_lookup_many(self):
+        found = self.index.lookup_many(['cirith ungol', 'Lumpkins'])
+        self.assertEqual(len(found['cirith ungol']), 1)
+        self.assertEqual(found['Lumpkins'], [])
+
+    def test_diacritics_and_parentheticals(self):
+        self.index.add_bands([{'name': 'Glóin', 'url': 'https://ma/bands/Gloin/1'}])
+        self.assertEqual(self.index.lookup('Gloin (Dwarf)')[0]['name'], 'Glóin')
+
+    def test_older_keys_are_rebuilt(self):
+        self.index.close()
+        conn = sqlite3.connect(self.index.path)
+        conn.execute("UPDATE bands SET name_key = 'stale'")
+        conn.execute("PRAGMA user_version = 0")
+        conn.commit()
+        conn.close()
+        self.index = BandIndex(self.index.path)
+        self.assertEqual(len(self.index.lookup('gorgoroth')), 1)
+
+    def test_sparse_rows_keep_existing_details(self):
+        self.index.add_bands([{'name': 'Gorgoroth', 'url': 'https://ma/bands/Gorgoroth/770'}])
+        self.assertEqual(self.index.lookup('Gorgoroth')[0]['genre'], 'Black Metal')
+
+    def test_add_details(self):
+        updated = self.index.add_details({'https://ma/bands/Cirith_Ungol/561': {'country': 'United States'}})
+        self.assertEqual(updated, 1)
+        self.assertEqual(self.index.lookup('Cirith Ungol')[0]['country'], 'United States')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,266 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from urllib.parse import urlsplit
+from src.band_index import DEFAULT_INDEX_PATH, BandIndex
+from src.band_name_tool import (DEFAULT_ANALYSIS_JOURNAL, BandNameAnalyzer, BatchReport, Progress,
+                                analyze_batch, main)
+from src.http_cache import HTTPCache
+from src.http_client import HostLimits
+from src.result_journal import ResultJournal
+from src.stand_in_server import StandInServer
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Answers after a fixed delay; `taken` hosts return 200, others 404.
+
+    `peak` is the most requests that were in flight at once.
+    """
+
+    def __init__(self, taken=(), delay=0.1):
+        self.taken = set(taken)
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _wait(self):
+        time.sleep(self.delay)
+
+    def _respond(self, method, url, **kwargs):
+        self.calls.append((method, urlsplit(url).hostname, kwargs))
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            self._wait()
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        host = urlsplit(url).hostname
+        return FakeResponse(200 if any(host.endswith(t) for t in self.taken) else 404)
+
+    def head(self, url, **kwargs):
+        return self._respond('HEAD', url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self._respond('GET', url, **kwargs)
+
+
+class TestCheckSocialMedia(unittest.TestCase):
+    def test_probes_platforms_concurrently(self):
+        class RendezvousSession(FakeSession):
+            """Holds each request until all four probes are in flight."""
+            barrier = threading.Barrier(4, timeout=5)
+
+            def _wait(self):
+                self.barrier.wait()
+
+        session = RendezvousSession(taken={'instagram.com'})
+        analyzer = BandNameAnalyzer(session=session, host_limits=HostLimits(rate=100))
+        results = analyzer.check_social_media("Gil-galad")
+        self.assertEqual(results, {'bandcamp': True, 'instagram': False,
+                                   'twitter': True, 'facebook': True})
+        self.assertEqual(session.peak, 4)
+
+    def test_uses_head_or_ranged_get_with_timeouts(self):
+        session = FakeSession(delay=0)
+        analyzer = BandNameAnalyzer(session=session, host_limits=HostLimits(rate=100))
+        analyzer.check_social_media("Gil-galad")
+        methods = {host: (method, kwargs) for method, host, kwargs in session.calls}
+        self.assertEqual(methods['gilgalad.bandcamp.com'][0], 'HEAD')
+        method, kwargs = methods['twitter.com']
+        self.assertEqual(method, 'GET')
+        self.assertTrue(kwargs['stream'])
+        self.assertEqual(kwargs['headers'], {'Range': 'bytes=0-0'})
+        self.assertTrue(all(kwargs.get('timeout') for _, _, kwargs in session.calls))
+
+    def test_errors_count_as_available(self):
+        class FailingSession(FakeSession):
+            def _respond(self, method, url, **kwargs):
+                raise OSError("connection reset")
+
+        analyzer = BandNameAnalyzer(session=FailingSession(), host_limits=HostLimits(rate=100))
+        self.assertTrue(all(analyzer.check_social_media("Beren").values()))
+
+class FakeIndex:
+    def __init__(self, delay=0.0, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+
+    def lookup(self, name):
+        time.sleep(self.delay)
+        if name in self.fail:
+            raise OSError("lookup failed")
+        return [{'name': name, 'url': f'https://ma/{name}', 'genre': 'Black Metal'}] if name == 'Mordor' else []
+
+    def lookup_many(self, names):
+        return {name: [] for name in names}
+
+
+class TestAnalyzeBatch(unittest.TestCase):
+    def test_stages_overlap(self):
+        names = [f"Name{i}" for i in range(8)] + ['Mordor']
+        events = []
+        probing = threading.Event()
+
+        class RecordingIndex(FakeIndex):
+            def lookup(self, name):
+                if name == 'Mordor':
+                    # Only a pipelined batch probes earlier names while this lookup is pending
+                    probing.wait(timeout=5)
+                events.append(('lookup', name))
+                return super().lookup(name)
+
+        class RecordingSession(FakeSession):
+            def _respond(self, method, url, **kwargs):
+                events.append(('probe', urlsplit(url).hostname))
+                probing.set()
+                return super()._respond(method, url, **kwargs)
+
+        analyzer = BandNameAnalyzer(index=RecordingIndex(), session=RecordingSession(delay=0.01),
+                                    host_limits=HostLimits(concurrency=8, rate=1000), social_workers=16)
+        results = {r['name']: r for r in analyze_batch(names, analyzer, workers=4)}
+        self.assertEqual(set(results), set(names))
+        self.assertEqual(results['Mordor']['metal_archives']['total_matches'], 1)
+        self.assertIn('viability_score', results['Name0'])
+        first_probe = next(i for i, event in enumerate(events) if event[0] == 'probe')
+        self.assertLess(first_probe, events.index(('lookup', 'Mordor')))
+
+    def test_failures_are_marked(self):
+        analyzer = BandNameAnalyzer(index=FakeIndex(fail={'Beren'}), session=FakeSession(delay=0),
+                                    host_limits=HostLimits(rate=1000))
+        results = {r['name']: r for r in analyze_batch(['Beren', 'Luthien'], analyzer, workers=2)}
+        self.assertEqual(results['Beren']['error'], 'lookup failed')
+        self.assertNotIn('error', results['Luthien'])
+
+
+def make_analysis(name, matches=0, taken=()):
+    analyzer = BandNameAnalyzer(session=FakeSession(delay=0))
+    ma_data = {'exists': bool(matches), 'total_matches': matches,
+               'matches': [{'name': name, 'url': f'https://ma/{i}', 'genre': 'Doom'} for i in range(matches)]}
+    social = {platform: platform not in taken for platform in BandNameAnalyzer.SOCIAL_MEDIA_PLATFORMS}
+    return analyzer.summarize(name, ma_data, social)
+
+
+class TestBatchReport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_index_rows_stream_to_disk(self):
+        report = BatchReport(self.tmp.name)
+        report.add(make_analysis("Mordor", matches=2, taken={'twitter'}))
+        with open(report.index_path, encoding='utf-8') as f:
+            partial = f.read()
+        self.assertIn('<td data-sort="50">50</td>', partial)
+        self.assertIn('<td data-sort="twitter">twitter</td>', partial)
+        report.add(make_analysis("Nazgûl & Co"))
+        report.close()
+        with open(report.index_path, encoding='utf-8') as f:
+            html = f.read()
+        self.assertIn('Nazgûl &amp; Co', html)
+        self.assertTrue(html.rstrip().endswith('</html>'))
+        self.assertIn('<p>2 names', html)
+
+    def test_detail_pages(self):
+        report = BatchReport(self.tmp.name, detail_pages=True)
+        page = report.add(make_analysis("Gil-galad", matches=1))
+        report.close()
+        self.assertEqual(os.path.basename(page), 'gil_galad.html')
+        with open(page, encoding='utf-8') as f:
+            self.assertIn('Band Name Analysis: Gil-galad', f.read())
+        with open(report.index_path, encoding='utf-8') as f:
+            self.assertIn('<a href="names/gil_galad.html">Gil-galad</a>', f.read())
+
+
+class TestTakenVariations(unittest.TestCase):
+    def test_bulk_lookup(self):
+        class Index:
+            calls = 0
+
+            def lookup_many(self, names):
+                Index.calls += 1
+                return {name: [{'name': name}] if name in ('Mørdor', 'The Mordor') else [] for name in names}
+
+        analyzer = BandNameAnalyzer(index=Index(), session=FakeSession(delay=0))
+        analysis = analyzer.summarize("Mordor", {'exists': False, 'total_matches': 0, 'matches': []}, {})
+        self.assertEqual(Index.calls, 1)
+        self.assertEqual(analysis['taken_variations'], {'Mørdor': 1, 'The Mordor': 1})
+        self.assertIn("Variations already used by other bands: Mørdor, The Mordor",
+                      analysis['recommendations'])
+
+
+class TestCommandLine(unittest.TestCase):
+    """Runs main() as the command line does, in a scratch working directory."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmp.name)
+        with open('unique_proper_nouns.txt', 'w', encoding='utf-8') as f:
+            f.write("Proper nouns\n====\nMordor\n")
+        self.server = StandInServer(matches='missing.csv').start()
+        self.addCleanup(self.server.stop)
+        self.search_url = f"{self.server.url}/search/ajax-band-search/"
+        for patcher in [mock.patch.object(BandNameAnalyzer, 'SEARCH_URL', self.search_url),
+                        mock.patch.object(BandNameAnalyzer, 'SOCIAL_MEDIA_PLATFORMS', self.server.social_platforms()),
+                        mock.patch('src.band_name_tool.HostLimits', lambda: HostLimits(concurrency=8, rate=1000)),
+                        mock.patch('builtins.input', return_value='2')]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_main(self, *argv):
+        main(['--metrics-dir', 'metrics', *argv])
+        return {result['name']: result for result in ResultJournal(DEFAULT_ANALYSIS_JOURNAL)}
+
+    def test_taken_variations_from_band_index(self):
+        index = BandIndex(DEFAULT_INDEX_PATH)
+        index.add_bands([{'name': 'Mordorion', 'url': 'https://ma/bands/Mordorion/1'}])
+        index.close()
+        self.assertEqual(self.run_main()['Mordor']['taken_variations'], {'Mordorion': 1})
+
+    def test_offline_matches_band_index_without_searching(self):
+        index = BandIndex(DEFAULT_INDEX_PATH)
+        index.add_bands([{'name': 'Mordor', 'url': 'https://ma/bands/Mordor/42', 'genre': 'Black Metal'}])
+        index.close()
+        ma_data = self.run_main('--offline')['Mordor']['metal_archives']
+        self.assertEqual([band['url'] for band in ma_data['matches']], ['https://ma/bands/Mordor/42'])
+        # Only the four social media probes reach the server
+        self.assertEqual(self.server.requests, 4)
+
+    def test_offline_needs_a_band_index(self):
+        with self.assertRaises(SystemExit):
+            self.run_main('--offline')
+
+    def test_taken_variations_from_cached_searches(self):
+        cache = HTTPCache()
+        cache.set(self.search_url, json.dumps({'aaData': [
+            ['<a href="https://ma/bands/Mordorion/1">Mordorion</a>', 'Doom Metal', 'Chile']]}),
+                  params={'field': 'name', 'query': 'Mordorion'})
+        cache.close()
+        self.assertEqual(self.run_main()['Mordor']['taken_variations'], {'Mordorion': 1})
+
+
+class TestProgress(unittest.TestCase):
+    def test_reports_count(self):
+        progress = Progress(3)
+        self.assertTrue(progress.advance().startswith("1/3 ("))
+        self.assertIn("ETA", progress.advance())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import re
+import unittest
+from pathlib import Path
+from src.check_metal import DETAIL_FIELDS, parse_band_details
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def legacy_parse_band_details(html):
+    """The original six-regex band page parser, kept as a reference."""
+    details = {}
+    patterns = {
+        'genre': r'<dt>Genre:</dt>\s*<dd>(.*?)</dd>',
+        'themes': r'<dt>Themes:</dt>\s*<dd>(.*?)</dd>',
+        'country': r'<dt>Country of origin:</dt>\s*<dd>.*?>(.*?)</a>',
+        'location': r'<dt>Location:</dt>\s*<dd>(.*?)</dd>',
+        'status': r'<dt>Status:</dt>\s*<dd>(.*?)</dd>',
+        'formed': r'<dt>Formed in:</dt>\s*<dd>(.*?)</dd>'
+    }
+    for key, pattern in patterns.items():
+        match = re.search(pattern, html, re.DOTALL | re.IGNORECASE)
+        if match:
+            value = match.group(1)
+            value = re.sub(r'<[^>]+>', '', value)
+            value = re.sub(r'\s+', ' ', value)
+            value = value.strip()
+            details[key] = value if value else 'N/A'
+        else:
+            details[key] = 'N/A'
+    return details
+
+
+class TestBandPageParser(unittest.TestCase):
+    """Parsing speed is measured by `python -m src.benchmark --only band_pages`."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pages = {path.name: path.read_text(encoding='utf-8')
+                     for path in sorted(FIXTURES.glob('band_page_*.html'))}
+
+    def test_matches_legacy_on_sample_pages(self):
+        self.assertTrue(self.pages)
+        for name, html in self.pages.items():
+            details = parse_band_details(html)
+            self.assertEqual({field: details[field] for field in DETAIL_FIELDS},
+                             legacy_parse_band_details(html), name)
+
+    def test_extra_fields(self):
+        details = parse_band_details(self.pages['band_page_active.html'])
+        self.assertEqual(details['label'], 'Drakkar Productions')
+        self.assertEqual(details['years_active'], '1991-1995 (as Orodruin), 1995-present')
+        self.assertEqual(details['discography'][0],
+                         ['Complete discography', 'https://www.metal-archives.com/band/discography/id/3540/tab/all'])
+        self.assertEqual(parse_band_details(self.pages['band_page_split_up.html'])['label'],
+                         'Unsigned/independent')
+        sparse = parse_band_details(self.pages['band_page_sparse.html'])
+        self.assertEqual((sparse['formed'], sparse['years_active']), ('N/A', 'N/A'))
+
+if __name__ == '__main__':
+    unittest.main()
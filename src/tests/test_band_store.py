@@ -0,0 +1,42 @@
+import tempfile
+import unittest
+from pathlib import Path
+from src.band_store import BandDetailStore
+
+class TestBandDetailStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "details.sqlite")
+        self.calls = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def fetch(self):
+        self.calls += 1
+        return {'genre': 'Black Metal', 'country': 'Norway'}
+
+    def test_fetches_each_url_once(self):
+        store = BandDetailStore(self.path)
+        url = "https://www.metal-archives.com/bands/Gorgoroth/770"
+        store.get_or_fetch(url, self.fetch)
+        details = store.get_or_fetch(url, self.fetch)
+        self.assertEqual(details['genre'], 'Black Metal')
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(store.stats(), {'stored': 1, 'fetched': 1, 'reused': 1})
+
+    def test_persists_across_runs(self):
+        url = "https://www.metal-archives.com/bands/Isengard/1027"
+        BandDetailStore(self.path).get_or_fetch(url, self.fetch)
+        store = BandDetailStore(self.path)
+        self.assertIn(url, store)
+        store.get_or_fetch(url, self.fetch)
+        self.assertEqual(self.calls, 1)
+
+    def test_errors_are_not_stored(self):
+        store = BandDetailStore(self.path)
+        store.get_or_fetch("https://example.com/a", lambda: {'genre': 'Error'})
+        self.assertNotIn("https://example.com/a", store)
+
+if __name__ == '__main__':
+    unittest.main()
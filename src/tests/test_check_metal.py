@@ -0,0 +1,136 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+
+import requests
+
+from src import check_metal
+from src.band_index import BandIndex, read_dump
+from src.http_client import RateLimiter
+from src.stand_in_server import StandInServer
+
+
+class TestCheckMetalArchives(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.matches = os.path.join(self.tmp.name, 'matches.csv')
+        with open(self.matches, 'w', encoding='utf-8') as f:
+            f.write("Search Name,Band Name,Genre,Country,URL\n"
+                    "Gloin,Gloin,Doom Metal,Sweden,https://www.metal-archives.com/bands/Gloin/1\n"
+                    "Gloin,Glóin,Folk Metal,Italy,https://www.metal-archives.com/bands/Gl%C3%B3in/2\n"
+                    "Gloin,Gloin Hall,Black Metal,Norway,https://www.metal-archives.com/bands/Gloin_Hall/3\n")
+        self.saved_url = check_metal.SEARCH_URL
+
+    def tearDown(self):
+        check_metal.SEARCH_URL = self.saved_url
+        self.tmp.cleanup()
+
+    def test_matches_every_spelling_of_the_term(self):
+        with StandInServer(matches=self.matches) as server:
+            check_metal.SEARCH_URL = f"{server.url}/search/ajax-band-search/"
+            result = check_metal.check_metal_archives('Gloin', limiter=RateLimiter(1000))
+        self.assertTrue(result['exists'])
+        self.assertEqual([match['name'] for match in result['matches']], ['Gloin', 'Glóin'])
+
+    def test_offline_index_agrees_with_online_check(self):
+        index = BandIndex(os.path.join(self.tmp.name, 'index.sqlite'))
+        index.add_bands(read_dump(self.matches))
+        with StandInServer(matches=self.matches) as server:
+            check_metal.SEARCH_URL = f"{server.url}/search/ajax-band-search/"
+            online = check_metal.check_metal_archives('Gloin', limiter=RateLimiter(1000))
+        offline = index.lookup_many(['Gloin'])['Gloin']
+        index.close()
+        self.assertEqual(sorted(band['name'] for band in offline),
+                         sorted(match['name'] for match in online['matches']))
+
+
+MATCHES_CSV = ("Search Name,Band Name,Genre,Country,URL\n"
+               "Mordor,Mordor,Black Metal,Norway,https://www.metal-archives.com/bands/Mordor/42\n"
+               "Mordor,Mordor,Doom Metal,Poland,https://www.metal-archives.com/bands/Mordor/43\n"
+               "Isengard,Isengard,Folk Metal,Norway,https://www.metal-archives.com/bands/Isengard/1027\n"
+               "Gondor,Gondor,Power Metal,Germany,https://www.metal-archives.com/bands/Gondor/7\n"
+               "Angmar,Angmar,Black Metal,France,https://www.metal-archives.com/bands/Angmar/9\n")
+TERMS = ['Mordor', 'Rohan', 'Isengard', 'Frodo', 'Gondor', 'Bree', 'Angmar', 'Shire']
+
+
+class StandInTestCase(unittest.TestCase):
+    """Points check_metal at a stand-in server replaying MATCHES_CSV."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        matches = self.path('matches.csv')
+        with open(matches, 'w', encoding='utf-8') as f:
+            f.write(MATCHES_CSV)
+        self.server = StandInServer(matches=matches, latency=0.01).start()
+        self.addCleanup(self.server.stop)
+        patcher = mock.patch.object(check_metal, 'SEARCH_URL', f"{self.server.url}/search/ajax-band-search/")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def read(self, name):
+        with open(self.path(name), encoding='utf-8') as f:
+            return f.read()
+
+
+class TestCheckTerms(StandInTestCase):
+    def test_concurrent_run_matches_serial_run(self):
+        serial = list(check_metal.check_terms(TERMS, workers=1, rate=1000))
+        with mock.patch.object(check_metal, 'check_metal_archives', wraps=check_metal.check_metal_archives) as check, \
+                mock.patch.object(check_metal, 'make_session', wraps=check_metal.make_session) as make_session, \
+                mock.patch.object(check_metal, 'RateLimiter', wraps=RateLimiter) as make_limiter:
+            concurrent = list(check_metal.check_terms(TERMS, workers=4, rate=1000))
+
+        self.assertEqual([result['name'] for result in concurrent], TERMS)
+        self.assertEqual((make_session.call_count, make_limiter.call_count), (1, 1))
+        shared = {(id(call.args[1]), id(call.args[2])) for call in check.call_args_list}
+        self.assertEqual(len(shared), 1)
+
+        check_metal.save_results(serial, self.path('serial.csv'))
+        check_metal.save_results(concurrent, self.path('concurrent.csv'))
+        self.assertEqual(self.read('concurrent.csv'), self.read('serial.csv'))
+        self.assertIn('Isengard,Isengard,', self.read('concurrent.csv'))
+
+
+class TestResume(StandInTestCase):
+    def setUp(self):
+        super().setUp()
+        self.searches = Counter()
+        with open(self.path('terms.txt'), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(TERMS))
+
+    def run_main(self, journal, output, fail=(), interrupt=None):
+        """Run check_metal serially; searches for `fail` error out and `interrupt` stops the run."""
+        fetch_text = check_metal.fetch_text
+
+        def counting_fetch(url, params=None, *args, **kwargs):
+            if params and 'query' in params:
+                self.searches[params['query']] += 1
+                if params['query'] in fail:
+                    raise requests.ConnectionError("connection reset")
+                if params['query'] == interrupt:
+                    raise KeyboardInterrupt
+            return fetch_text(url, params, *args, **kwargs)
+
+        argv = ['--terms', self.path('terms.txt'), '--workers', '1', '--rate', '1000', '--no-cache',
+                '--journal', self.path(journal), '--output', self.path(output), '--metrics-dir', self.tmp.name]
+        with mock.patch.object(check_metal, 'fetch_text', counting_fetch):
+            check_metal.main(argv)
+
+    def test_interrupted_run_resumes(self):
+        with self.assertRaises(KeyboardInterrupt):
+            self.run_main('journal.jsonl', 'results.csv', fail={'Rohan'}, interrupt=TERMS[-1])
+        self.assertFalse(os.path.exists(self.path('results.csv')))
+        self.assertEqual(self.searches, Counter(TERMS))
+
+        self.run_main('journal.jsonl', 'results.csv')
+        # Only the failed and the interrupted term were searched again
+        self.assertEqual(self.searches, Counter(TERMS + ['Rohan', TERMS[-1]]))
+
+        self.run_main('clean.jsonl', 'clean.csv')
+        self.assertEqual(self.read('results.csv'), self.read('clean.csv'))
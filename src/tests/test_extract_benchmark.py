@@ -0,0 +1,45 @@
+import unittest
+from collections import Counter
+from pathlib import Path
+from src.extract_nouns import collect_candidates, iter_texts
+
+DATA_DIR = Path(__file__).parent.parent.parent / 'data'
+
+
+def legacy_collect_candidates(texts, common_words):
+    """The original whitespace-split extractor, kept as a reference."""
+    counts = Counter()
+    for text in texts:
+        for word in text.split():
+            if len(word) < 2:
+                continue
+            if not word[0].isupper():
+                continue
+            if "'s" in word.lower():
+                word = word.split("'")[0]
+            clean_word = ''.join(c for c in word if c.isalpha())
+            if not clean_word:
+                continue
+            if clean_word.lower() in common_words:
+                continue
+            counts[clean_word.title()] += 1
+    return counts
+
+
+@unittest.skipUnless(DATA_DIR.exists(), "chapter data not available")
+class TestExtractionMatchesLegacy(unittest.TestCase):
+    """Extraction speed is measured by `python -m src.benchmark --only extraction`."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.texts = list(iter_texts(str(DATA_DIR)))
+        cls.common_words = {"the", "and", "but", "then", "there", "when", "what", "now"}
+
+    def test_matches_legacy_on_bundled_chapters(self):
+        self.assertEqual(
+            collect_candidates(self.texts, self.common_words),
+            legacy_collect_candidates(self.texts, self.common_words)
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,10 @@
+import json
+import tempfile
 import unittest
+from collections import Counter
 from pathlib import Path
-from src.extract_nouns import extract_proper_nouns
+from src.extract_nouns import (clean_candidate, collect_candidates, extract_proper_nouns,
+                               extract_proper_nouns_incremental, extract_proper_nouns_parallel, split_text)
 
 class TestProperNounExtraction(unittest.TestCase):
     def test_basic_proper_noun_extraction(self):
@@ -33,5 +37,77 @@ class TestProperNounExtraction(unittest.TestCase):
         result = extract_proper_nouns(text, common_words)
         self.assertEqual(result, {"Gandalf", "Frodo", "Aragorn", "Gimli"})
 
+    def test_diacritics_are_kept(self):
+        text = ["Abattârik spoke of Dúnedain and Éowyn's horse"]
+        common_words = {"spoke", "of", "and", "horse"}
+
+        result = extract_proper_nouns(text, common_words)
+        self.assertEqual(result, {"Abattârik", "Dúnedain", "Éowyn"})
+
+    def test_scan_matches_whitespace_split(self):
+        # The regex scan must find the same tokens as str.split(), including
+        # around non-ASCII whitespace
+        texts = [" \xa0Bar baz", "\xa0Bar", "Élan \u3000Foo", "Frodo\u2003Baggins\u200bX",
+                 "a\x1cBree \x85Ünd", "Éowyn's Ω ω Σam"]
+        for text in texts:
+            expected = Counter()
+            for word in text.split():
+                clean_word = clean_candidate(word, set()) if len(word) >= 2 else None
+                if clean_word:
+                    expected[clean_word] += 1
+            self.assertEqual(collect_candidates([text], set()), expected, repr(text))
+
+class TestParallelExtraction(unittest.TestCase):
+    def test_split_text_keeps_words_whole(self):
+        text = "Frodo went to Mordor with Samwise Gamgee"
+        chunks = list(split_text(text, 8))
+        self.assertEqual(''.join(chunks), text)
+        self.assertEqual(' '.join(chunks).split(), text.split())
+
+    def test_parallel_matches_serial(self):
+        text = ["The Hobbits lived in the Shire.", "Many Hobbit families were there.", "GANDALF spoke to Elrond"]
+        common_words = {"the", "lived", "in", "many", "were", "there", "families", "spoke", "to"}
+        chunks = [chunk for t in text for chunk in split_text(t, 10)]
+
+        result = extract_proper_nouns_parallel(iter(chunks), common_words, workers=2)
+        self.assertEqual(result, extract_proper_nouns(text, common_words))
+
+class TestIncrementalExtraction(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.chapters = self.root / "data" / "hobbit-chapters"
+        self.chapters.mkdir(parents=True)
+        (self.chapters / "01.txt").write_text("Bilbo met Gandalf at Bag End.", encoding='utf-8')
+        (self.chapters / "02.txt").write_text("Thorin and the Dwarves came.", encoding='utf-8')
+        self.manifest = str(self.root / "manifest.json")
+        self.common_words = {"met", "at", "and", "the", "came"}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def extract(self):
+        return extract_proper_nouns_incremental(str(self.root / "data"), self.common_words,
+                                                self.manifest, workers=1)
+
+    def test_reuses_unchanged_chapters(self):
+        self.assertEqual(self.extract(), {"Bilbo", "Gandalf", "Bag", "End", "Thorin", "Dwarves"})
+
+        # Tamper with a cached entry: it must be reused, not recomputed
+        with open(self.manifest, encoding='utf-8') as f:
+            manifest = json.load(f)
+        key = (self.chapters / "01.txt").as_posix()
+        manifest['files'][key]['candidates'] = {"Cached": 1}
+        with open(self.manifest, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        (self.chapters / "02.txt").write_text("Smaug slept.", encoding='utf-8')
+
+        self.assertEqual(self.extract(), {"Cached", "Smaug"})
+
+    def test_word_list_change_invalidates_cache(self):
+        self.extract()
+        self.common_words = self.common_words | {"end"}
+        self.assertNotIn("End", self.extract())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
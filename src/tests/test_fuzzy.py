@@ -0,0 +1,77 @@
+import unittest
+from unittest import mock
+
+from src import fuzzy
+from src.fuzzy import FuzzyIndex, FuzzyNameIndex, deletes, edit_distance, fold
+
+
+class TestFold(unittest.TestCase):
+    def test_strips_diacritics_and_case(self):
+        self.assertEqual(fold("Abattârik"), "abattarik")
+        self.assertEqual(fold("Dúnedain"), "dunedain")
+        self.assertEqual(fold("NAZGÛL"), "nazgul")
+
+
+class TestEditDistance(unittest.TestCase):
+    def test_distances(self):
+        self.assertEqual(edit_distance("mordor", "mordor", 2), 0)
+        self.assertEqual(edit_distance("mordor", "mordr", 2), 1)
+        self.assertEqual(edit_distance("gandalf", "gnadalf", 2), 1)  # transposition
+        self.assertEqual(edit_distance("isildur", "isuldor", 2), 2)
+
+    def test_stops_past_max_distance(self):
+        self.assertEqual(edit_distance("glaurung", "ancalagon", 2), 3)
+        self.assertEqual(edit_distance("a", "abcd", 1), 2)
+
+    def test_deletes(self):
+        self.assertEqual(deletes("abc", 1), {"abc", "ab", "ac", "bc"})
+
+
+class TestFuzzyIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = FuzzyIndex(["Dúnedain", "Mordor", "Gandalf", "Glaurung", "Nazgûl", "Morgoth"])
+
+    def test_lookup(self):
+        self.assertEqual(self.index.lookup("dunedain"), [("dunedain", 0)])
+        self.assertEqual(self.index.lookup("dunadain"), [("dunedain", 1)])
+        self.assertEqual(self.index.lookup("mordr", 1), [("mordor", 1)])
+        self.assertEqual(self.index.lookup("nazgul"), [("nazgul", 0)])
+        self.assertEqual(self.index.lookup("sauron"), [])
+
+    def test_matches_brute_force(self):
+        words = ["glaurung", "gothmog", "ancalagon", "thangorodrim", "angband", "angmar",
+                 "ungoliant", "carcharoth", "draugluin", "thuringwethil"]
+        index = FuzzyIndex(words)
+        for query in ["glarung", "gothmgo", "ancalagonn", "thangordrim", "angbnd", "amgmar",
+                      "ungolaint", "karcharoth", "drauglin", "thuringwethl", "angmr"]:
+            expected = sorted((w, edit_distance(query, w, 2)) for w in words
+                              if edit_distance(query, w, 2) <= 2)
+            self.assertEqual(sorted(index.lookup(query)), expected, query)
+
+    def test_lookup_only_measures_delete_candidates(self):
+        index = FuzzyIndex(f"{a}{b}{c}" for a in ("gal", "mor", "ang", "thar", "eru")
+                           for b in ("ad", "du", "ith", "on", "ui", "ea")
+                           for c in ("rim", "dor", "mir", "band", "lin", "wen", "goth"))
+        with mock.patch.object(fuzzy, 'edit_distance', wraps=edit_distance) as distance:
+            matches = index.lookup("morduiwen")
+        self.assertEqual(matches, [("morduwen", 1), ("moruiwen", 1)])
+        # Lookup speed itself is measured by `python -m src.benchmark --only fuzzy`
+        self.assertLessEqual(distance.call_count, len(index.terms) // 10)
+
+
+class TestFuzzyNameIndex(unittest.TestCase):
+    def test_search_ranks_closest_first(self):
+        index = FuzzyNameIndex([
+            ("Mordor", "Mordor"),
+            ("Dúnedain", "Dunedain Hall"),
+            ("Mordor", "Mordorr"),
+            ("Gandalf", "Gandalf"),
+        ])
+        self.assertEqual(index.search("dunedain"), [1])
+        self.assertEqual(index.search("mordorr"), [2, 0])
+        self.assertEqual(index.search("mordor", limit=1, offset=1), [2])
+        self.assertEqual(index.search("hal"), [1])
+        self.assertEqual(index.search(""), [])
+
+if __name__ == '__main__':
+    unittest.main()
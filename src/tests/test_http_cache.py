@@ -0,0 +1,47 @@
+import tempfile
+import unittest
+from pathlib import Path
+from src.http_cache import HTTPCache
+
+class TestHTTPCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "cache.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_ignores_param_order_and_host_case(self):
+        a = HTTPCache.make_key("https://Example.com/search?b=2", {'a': 1})
+        b = HTTPCache.make_key("https://example.com/search?a=1&b=2")
+        self.assertEqual(a, b)
+
+    def test_round_trip_and_counters(self):
+        cache = HTTPCache(self.path)
+        self.assertIsNone(cache.get("https://example.com/x", {'q': 'Mordor'}))
+        cache.set("https://example.com/x", "Gorgoroth", {'q': 'Mordor'})
+        self.assertEqual(cache.get("https://example.com/x", {'q': 'Mordor'}), "Gorgoroth")
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+        cache.close()
+
+    def test_persists_across_instances(self):
+        cache = HTTPCache(self.path)
+        cache.set("https://example.com/band", "Isengard")
+        cache.close()
+        self.assertEqual(HTTPCache(self.path).get("https://example.com/band"), "Isengard")
+
+    def test_expired_entries_miss(self):
+        cache = HTTPCache(self.path)
+        cache.set("https://example.com/old", "Angmar", ttl=-1)
+        self.assertIsNone(cache.get("https://example.com/old"))
+
+    def test_evicts_least_recently_used(self):
+        cache = HTTPCache(self.path, max_bytes=1)
+        cache.set("https://example.com/a", "Cirith Ungol")
+        cache.set("https://example.com/b", "Summoning")
+        self.assertIsNone(cache.get("https://example.com/a"))
+        self.assertGreaterEqual(cache.stats()['evictions'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import threading
+import time
+import unittest
+from src.http_client import HostLimits, RateLimiter
+
+class TestRateLimiter(unittest.TestCase):
+    def test_rejects_non_positive_rate(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(0)
+
+    def test_enforces_rate(self):
+        limiter = RateLimiter(rate=50)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        # First token is available immediately, the other five wait 1/50s each
+        self.assertGreaterEqual(time.monotonic() - start, 5 / 50 * 0.9)
+
+class TestHostLimits(unittest.TestCase):
+    def test_caps_concurrency_per_host(self):
+        limits = HostLimits(concurrency=2, rate=1000)
+        active = {'a.example': 0, 'b.example': 0}
+        peak = dict(active)
+        lock = threading.Lock()
+
+        def request(host):
+            with limits.limit(f"https://{host}/page"):
+                with lock:
+                    active[host] += 1
+                    peak[host] = max(peak[host], active[host])
+                time.sleep(0.02)
+                with lock:
+                    active[host] -= 1
+
+        threads = [threading.Thread(target=request, args=(host,))
+                   for host in ('a.example', 'b.example') for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(peak, {'a.example': 2, 'b.example': 2})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.web import live
+from src.web.live import JournalTail, LiveRows
+
+
+def band_row(name):
+    return [name, name, f'https://ma/bands/{name}/1', 'Black Metal', None, 'Norway', None, None, None]
+
+
+class TestJournalTail(unittest.TestCase):
+    def test_reads_only_new_complete_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'journal.jsonl')
+            tail = JournalTail(path)
+            self.assertEqual(tail.read(), ([], False))
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'name': 'a'}) + '\n{"name": ')
+            self.assertEqual(tail.read(), ([{'name': 'a'}], False))
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write('"b"}\n')
+            self.assertEqual(tail.read(), ([{'name': 'b'}], False))
+            self.assertEqual(tail.read(), ([], False))
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'name': 'c'}) + '\n')
+            self.assertEqual(tail.read(), ([{'name': 'c'}], True))
+
+
+class TestLiveRows(unittest.TestCase):
+    def test_extend_leaves_the_old_rows_unchanged(self):
+        first = LiveRows(10).extend([band_row('Moria')])
+        second = first.extend([band_row('Morannon')])
+        self.assertEqual(list(first.iter_matches('mor')), [10])
+        self.assertEqual(list(second.iter_matches('mor')), [10, 11])
+        self.assertEqual(second.row(11)['Band Name'], 'Morannon')
+        self.assertEqual(json.loads(second.row_json(10))['Genre'], 'Black Metal')
+        self.assertEqual(second.fuzzy_ranked('moira'), {10: 1})
+
+    def test_segments_merge_like_a_binary_counter(self):
+        rows = LiveRows(0)
+        for i in range(13):
+            rows = rows.extend([band_row(f'Band{i}')])
+        self.assertEqual([len(segment) for segment in rows.segments], [8, 4, 1])
+        self.assertEqual(list(rows.iter_matches('band1')), [1, 10, 11, 12])
+        self.assertEqual(rows.row(12)['Search Name'], 'Band12')
+
+    def test_merges_stop_at_the_segment_cap(self):
+        saved = live.MAX_SEGMENT_ROWS
+        live.MAX_SEGMENT_ROWS = 4
+        try:
+            rows = LiveRows(0)
+            for i in range(8):
+                rows = rows.extend([band_row(f'Band{i}')])
+            self.assertEqual([len(segment) for segment in rows.segments], [4, 4])
+        finally:
+            live.MAX_SEGMENT_ROWS = saved
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from src.metrics import Histogram, Metrics, METRICS, instrumented_run
+
+
+class TestHistogram(unittest.TestCase):
+    def test_percentiles_and_buckets(self):
+        histogram = Histogram()
+        for ms in range(1, 101):
+            histogram.observe(ms / 1000)
+        summary = histogram.summary()
+        self.assertEqual(summary['count'], 100)
+        self.assertAlmostEqual(summary['p50_ms'], 51, delta=1)
+        self.assertAlmostEqual(summary['p95_ms'], 95, delta=1)
+        self.assertEqual(summary['buckets']['<=1ms'], 1)
+        self.assertEqual(summary['buckets']['<=100ms'], 50)
+
+
+class TestMetrics(unittest.TestCase):
+    def test_stages_hosts_and_counters(self):
+        metrics = Metrics()
+        with metrics.stage('parse'):
+            time.sleep(0.01)
+        metrics.observe_request('https://www.metal-archives.com/search', 0.2, 1024, 200)
+        metrics.observe_request('https://www.metal-archives.com/bands/x', 0.1, 2048, 429)
+        metrics.observe_request('https://twitter.com/x', 0.3)
+        metrics.incr('http_cache.hits', 3)
+        metrics.incr('http_cache.misses')
+        summary = metrics.summary()
+        self.assertEqual(summary['stages']['parse']['count'], 1)
+        self.assertGreaterEqual(summary['stages']['parse']['total_s'], 0.01)
+        host = summary['hosts']['www.metal-archives.com']
+        self.assertEqual((host['count'], host['bytes']), (2, 3072))
+        self.assertEqual(host['statuses'], {'200': 1, '429': 1})
+        self.assertEqual(summary['hosts']['twitter.com']['statuses'], {'error': 1})
+        self.assertEqual(summary['http_cache_hit_rate'], 0.75)
+
+    def test_instrumented_run_writes_summary_and_profile(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with instrumented_run('test', profile=True, metrics_dir=tmp):
+                with METRICS.stage('work'):
+                    sum(range(1000))
+            files = sorted(os.listdir(tmp))
+            self.assertEqual([os.path.splitext(f)[1] for f in files], ['.json', '.prof'])
+            with open(os.path.join(tmp, files[0])) as f:
+                self.assertEqual(json.load(f)['stages']['work']['count'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
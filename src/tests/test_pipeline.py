@@ -0,0 +1,107 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from src.band_index import DEFAULT_INDEX_PATH
+from src.pipeline import PipelineState, Stage, build_stages, parse_args, run_pipeline
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.calls = []
+        self.source = self.path('source.txt')
+        self.write(self.source, 'Mordor\nGondor')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def write(self, path, text):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def read(self, path):
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
+    def stages(self):
+        upper, count = self.path('upper.txt'), self.path('count.txt')
+
+        def make_upper():
+            self.calls.append('upper')
+            self.write(upper, self.read(self.source).upper())
+
+        def make_count():
+            self.calls.append('count')
+            self.write(count, str(len(self.read(upper).split())))
+
+        return [Stage('upper', make_upper, inputs=[self.source], outputs=[upper]),
+                Stage('count', make_count, inputs=[upper], outputs=[count], after=['upper'])]
+
+    def run_all(self, force=()):
+        return run_pipeline(self.stages(), PipelineState(self.path('state.json')), force)
+
+    def test_skips_stages_whose_inputs_are_unchanged(self):
+        self.assertEqual(self.run_all(), {'upper': 'ran', 'count': 'ran'})
+        self.assertEqual(self.run_all(), {'upper': 'skipped', 'count': 'skipped'})
+        self.assertEqual(self.calls, ['upper', 'count'])
+        self.assertEqual(self.run_all(force=['count']), {'upper': 'skipped', 'count': 'ran'})
+
+    def test_identical_upstream_output_does_not_rerun_downstream(self):
+        self.run_all()
+        self.write(self.source, 'mordor\ngondor')
+        self.assertEqual(self.run_all(), {'upper': 'ran', 'count': 'skipped'})
+        self.write(self.source, 'mordor\ngondor\nrohan')
+        self.assertEqual(self.run_all(), {'upper': 'ran', 'count': 'ran'})
+        self.assertEqual(self.read(self.path('count.txt')), '3')
+
+    def test_reruns_when_an_output_was_changed_or_removed(self):
+        self.run_all()
+        os.remove(self.path('count.txt'))
+        self.assertEqual(self.run_all(), {'upper': 'skipped', 'count': 'ran'})
+
+    def test_rerun_if_runs_a_stage_with_unchanged_inputs(self):
+        failures = ['Gondor']
+        stages = [Stage('upper', lambda: self.calls.append('upper'), inputs=[self.source],
+                        rerun_if=lambda: bool(failures))]
+        state = PipelineState(self.path('state.json'))
+        self.assertEqual(run_pipeline(stages, state), {'upper': 'ran'})
+        self.assertEqual(run_pipeline(stages, state), {'upper': 'ran'})
+        failures.clear()
+        self.assertEqual(run_pipeline(stages, state), {'upper': 'skipped'})
+        self.assertEqual(self.calls, ['upper', 'upper'])
+
+    def test_offline_check_hashes_the_band_index(self):
+        def check_inputs(argv):
+            return next(stage for stage in build_stages(parse_args(argv)) if stage.name == 'check').inputs
+
+        self.assertIn(DEFAULT_INDEX_PATH, check_inputs(['--offline']))
+        self.assertNotIn(DEFAULT_INDEX_PATH, check_inputs([]))
+
+    def test_independent_stages_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+        stages = [Stage('a', barrier.wait), Stage('b', barrier.wait),
+                  Stage('c', lambda: None, after=['a', 'b'])]
+        outcome = run_pipeline(stages, PipelineState(self.path('state.json')))
+        self.assertEqual(outcome, {'a': 'ran', 'b': 'ran', 'c': 'ran'})
+
+    def test_failure_blocks_later_stages(self):
+        def fail():
+            raise RuntimeError("boom")
+
+        stages = [Stage('a', fail), Stage('b', lambda: None, after=['a'])]
+        state = PipelineState(self.path('state.json'))
+        self.assertEqual(run_pipeline(stages, state), {'a': 'failed', 'b': 'blocked'})
+        self.assertNotIn('a', state.stages)
+
+    def test_rejects_unknown_dependencies(self):
+        with self.assertRaises(ValueError):
+            run_pipeline([Stage('a', lambda: None, after=['missing'])], PipelineState(self.path('s.json')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import tempfile
+import unittest
+from pathlib import Path
+from src.result_journal import ResultJournal
+
+class TestResultJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "results.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_completed_skips_errors_and_truncated_lines(self):
+        journal = ResultJournal(self.path)
+        journal.append({'name': 'Mordor', 'exists': True, 'matches': []})
+        journal.append({'name': 'Isengard', 'exists': False, 'matches': [], 'error': 'timeout'})
+        journal.close()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"name": "Gondo')
+        self.assertEqual(ResultJournal(self.path).completed(), {'Mordor'})
+        self.assertEqual(ResultJournal(self.path).failed(), {'Isengard'})
+
+    def test_latest_entry_wins(self):
+        journal = ResultJournal(self.path)
+        journal.append({'name': 'Rohan', 'exists': False, 'matches': [], 'error': 'timeout'})
+        journal.append({'name': 'Angmar', 'exists': False, 'matches': []})
+        journal.append({'name': 'Rohan', 'exists': True, 'matches': [{'name': 'Rohan'}]})
+        journal.close()
+        results = journal.results()
+        self.assertEqual([r['name'] for r in results], ['Angmar', 'Rohan'])
+        self.assertTrue(results[1]['exists'])
+        self.assertEqual(journal.completed(), {'Angmar', 'Rohan'})
+        self.assertEqual(journal.failed(), set())
+
+if __name__ == '__main__':
+    unittest.main()
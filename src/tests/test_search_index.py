@@ -0,0 +1,62 @@
+import unittest
+from src.web.search_index import QueryCache, SearchIndex, search_key
+
+ROWS = [
+    ("Gorgoroth", "Gorgoroth"),
+    ("Mordor", "Mordor"),
+    ("Cirith", "Cirith Ungol"),
+    ("Gandalf", "Gandalf's Fist"),
+    ("Isengard", "Isengard"),
+]
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.keys = [search_key(*row) for row in ROWS]
+        self.index = SearchIndex(self.keys)
+
+    def brute_force(self, query, limit=10):
+        return [i for i, key in enumerate(self.keys) if query.lower() in key][:limit]
+
+    def test_matches_substring_scan(self):
+        for query in ["or", "ORD", "gor", "ungol", "s f", "d", "xyz", "rdo", "gandalf's"]:
+            self.assertEqual(self.index.search(query), self.brute_force(query), query)
+
+    def test_limit_stops_early(self):
+        self.assertEqual(self.index.search("r", limit=2), [0, 1])
+
+    def test_query_cannot_span_fields(self):
+        # "cirith" + "cirith ungol" must not match "thcir"
+        self.assertEqual(self.index.search("thcir"), [])
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex([search_key(*row) for row in ROWS])
+
+    def test_prefix_reuse(self):
+        cache = QueryCache(self.index)
+        self.assertEqual(cache.search("go"), [0, 2])
+        self.assertEqual(cache.search("gor"), [0])
+        self.assertEqual(cache.search("gor"), [0])
+        stats = cache.stats()
+        self.assertEqual((stats['misses'], stats['prefix_hits'], stats['hits']), (1, 1, 1))
+
+    def test_query_cannot_span_fields_via_prefix(self):
+        cache = QueryCache(self.index)
+        self.assertEqual(cache.search("mordor"), [1])
+        self.assertEqual(cache.search("mordor\x00mor"), self.index.search("mordor\x00mor"))
+        self.assertEqual(cache.search("mordor\x00mor"), [])
+
+    def test_lru_eviction(self):
+        cache = QueryCache(self.index, max_entries=2)
+        for query in ["mor", "gan", "ise"]:
+            cache.search(query)
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(cache.stats()['entries'], 2)
+
+    def test_large_results_fall_back_to_index(self):
+        cache = QueryCache(self.index, max_ids=1)
+        self.assertEqual(cache.search("r", limit=3), self.index.search("r", limit=3))
+        self.assertEqual(cache.stats()['entries'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
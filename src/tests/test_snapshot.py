@@ -0,0 +1,52 @@
+import tempfile
+import unittest
+from pathlib import Path
+from src.web.search_index import SearchIndex
+from src.web.snapshot import BandTable, build_snapshot
+
+CSV = """Search Name,Band Name,URL,Genre,Themes,Country,Location,Status,Formed
+Abari,No match found,,,,,,,
+Gorgoroth,Gorgoroth,https://ma/bands/Gorgoroth/770,Black Metal,Satanism,Norway,Bergen,N/A,1992
+Mordor,Mordor,https://ma/bands/Mordor/19852,Doom Metal,"Tolkien, Darkness",Switzerland,Lausanne,,1990
+Isengard,Isengard,https://ma/bands/Isengard/1027,Black Metal,N/A,Norway,Kolbotn,N/A,N/A
+"""
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv = Path(self.tmp.name) / "matches.csv"
+        self.csv.write_text(CSV, encoding='utf-8')
+        self.snapshot = str(Path(self.tmp.name) / "bands.snapshot")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        self.assertEqual(build_snapshot(str(self.csv), self.snapshot), 3)
+        table = BandTable.open(self.snapshot)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.row(1), {
+            'Search Name': 'Mordor', 'Band Name': 'Mordor', 'URL': 'https://ma/bands/Mordor/19852',
+            'Genre': 'Doom Metal', 'Themes': 'Tolkien, Darkness', 'Country': 'Switzerland',
+            'Location': 'Lausanne', 'Status': None, 'Formed': '1990',
+        })
+        self.assertIsNone(table.value('Themes', 2))
+        self.assertEqual(table.value('Country', 2), 'Norway')
+        self.assertEqual(list(table.keys), ['gorgoroth\x00gorgoroth', 'mordor\x00mordor', 'isengard\x00isengard'])
+
+    def test_from_csv_matches_file(self):
+        build_snapshot(str(self.csv), self.snapshot)
+        on_disk = BandTable.open(self.snapshot)
+        in_memory = BandTable.from_csv(str(self.csv))
+        self.assertEqual([on_disk.row(i) for i in range(3)], [in_memory.row(i) for i in range(3)])
+
+    def test_packed_index_matches_built_index(self):
+        build_snapshot(str(self.csv), self.snapshot)
+        table = BandTable.open(self.snapshot)
+        packed = SearchIndex(table.keys, table.postings)
+        built = SearchIndex(list(table.keys))
+        for query in ["or", "gor", "mordor", "isen", "rdo", "xyz", "d", "h\x00m"]:
+            self.assertEqual(packed.search(query), built.search(query), query)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+
+import requests
+
+from src.benchmark import compare
+from src.check_metal import parse_band_details
+from src.http_client import fetch_text
+from src.stand_in_server import StandInServer
+
+
+class TestStandInServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.matches = os.path.join(self.tmp.name, 'matches.csv')
+        with open(self.matches, 'w', encoding='utf-8') as f:
+            f.write("Search Name,Band Name,Genre,Country,URL\n"
+                    "Mordor,Mordor,Black Metal,Norway,https://www.metal-archives.com/bands/Mordor/42\n"
+                    "Frodo,No match found,,,\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_replays_recorded_search(self):
+        with StandInServer(matches=self.matches) as server:
+            data = json.loads(fetch_text(f"{server.url}/search/ajax-band-search/",
+                                         params={'field': 'name', 'query': 'mordor'}))
+            self.assertEqual(data['iTotalRecords'], 1)
+            self.assertIn(f'{server.url}/bands/Mordor/42', data['aaData'][0][0])
+            empty = json.loads(fetch_text(f"{server.url}/search/ajax-band-search/", params={'query': 'Frodo'}))
+            self.assertEqual(empty['aaData'], [])
+
+    def test_serves_parseable_band_pages(self):
+        with StandInServer(matches=self.matches) as server:
+            details = parse_band_details(fetch_text(f"{server.url}/bands/Mordor/42"))
+            self.assertNotEqual(details['status'], 'N/A')
+
+    def test_rate_limit_answers_429_with_retry_after(self):
+        with StandInServer(matches=self.matches, rate_limit=2, retry_after=0.3) as server:
+            statuses = [requests.get(f"{server.url}/bands/Mordor/42").status_code for _ in range(4)]
+            self.assertIn(429, statuses)
+            response = requests.get(f"{server.url}/bands/Mordor/42")
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response.headers['Retry-After'], '0.3')
+            # fetch_text waits out the Retry-After delay and tries again
+            self.assertIn('<html', fetch_text(f"{server.url}/bands/Mordor/42").lower())
+            self.assertGreater(server.throttled, 0)
+
+
+class TestBaselineCompare(unittest.TestCase):
+    def test_flags_only_regressions_beyond_tolerance(self):
+        baseline = {'search': {'p95_us': 100.0, 'requests_per_s': 1000.0},
+                    'band_pages': {'pages_per_s': 20000}}
+        results = {'search': {'p95_us': 140.0, 'requests_per_s': 900.0},
+                   'band_pages': {'pages_per_s': 30000, 'errors': 3}}
+        regressions = compare(results, baseline, tolerance=0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith('search.p95_us'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.terms import canonical_key, display_form, group_terms, load_eldamo_names, load_wiki_titles
+
+
+class TestCanonicalKey(unittest.TestCase):
+    def test_merges_case_diacritics_and_disambiguators(self):
+        self.assertEqual(canonical_key("Abattârik"), canonical_key("ABATTARIK"))
+        self.assertEqual(canonical_key("Beren (son of Barahir)"), "beren")
+        self.assertEqual(canonical_key("Category:Elves"), "elves")
+        self.assertEqual(display_form("  Túrin   Turambar "), "Túrin Turambar")
+
+    def test_keeps_subtitles(self):
+        self.assertEqual(display_form("Beowulf: The Monsters and the Critics"),
+                         "Beowulf: The Monsters and the Critics")
+
+
+class TestGroupTerms(unittest.TestCase):
+    def test_one_query_per_key_mapped_to_originals(self):
+        groups = group_terms({
+            'proper_nouns': ["Anduin", "Olórin"],
+            'gateway': ["ANDUIN", "Anduin (river)", "Olorin", "Mordor"],
+        })
+        self.assertEqual(groups.queries(), ["Anduin", "Mordor", "Olórin"])
+        self.assertEqual(groups.originals, 6)
+        mapping = groups.mapping()
+        self.assertEqual(mapping["Anduin"]['originals'], ["ANDUIN", "Anduin", "Anduin (river)"])
+        self.assertEqual(mapping["Anduin"]['sources'], ["gateway", "proper_nouns"])
+
+    def test_writes_map(self):
+        groups = group_terms({'gateway': ["Glóin", "Gloin"]})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = groups.write_map(os.path.join(tmp, 'map.json'))
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f)["Gloin"]['originals'], ["Gloin", "Glóin"])
+
+
+class TestSources(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text, encoding='utf-8'):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding=encoding) as f:
+            f.write(text)
+        return path
+
+    def test_wiki_titles_skip_wiki_pages(self):
+        path = self.write('wiki.txt', "Smaug\nHelp:Editing\nPortal:Books\nMap:Middle-earth\n\n")
+        self.assertEqual(load_wiki_titles(path), ["Smaug", "Map:Middle-earth"])
+
+    def test_eldamo_names_are_repaired_and_filtered(self):
+        # The dictionary is UTF-8 that was decoded as cp1252 and saved again
+        text = "Nólairë\nSNAR\nsallo\n-ríel\nSilmarinko-\nPiosil/Silpios\nAi\n"
+        path = self.write('eldamo.txt', text.encode('utf-8').decode('cp1252'))
+        self.assertEqual(load_eldamo_names(path), ["Nólairë", "Piosil", "Silpios"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+from itertools import islice
+from src.variations import (fix_mojibake, generate_variations, iter_variations,
+                            letter_swaps, load_elvish_suffixes, suffix_forms)
+
+
+class TestVariations(unittest.TestCase):
+    def test_keeps_original_forms(self):
+        variations = generate_variations("Barad Dur", limit=1000)
+        for expected in ("Barad Dur", "The Barad Dur", "BaradDur", "Barad_Dur", "Bærad Dur",
+                         "Bæræd Dur", "Barad Dür"):
+            self.assertIn(expected, variations)
+
+    def test_all_swap_combinations(self):
+        swaps = set(letter_swaps("Aua"))
+        # (3 + 1) x (2 + 1) x (3 + 1) choices minus the unchanged name
+        self.assertEqual(len(swaps), 47)
+        self.assertIn("Æüä", swaps)
+
+    def test_lazy_and_capped(self):
+        variations = list(iter_variations("Gil-galad", limit=10, suffixes=()))
+        self.assertEqual(len(variations), 10)
+        self.assertEqual(len(set(variations)), 10)
+        self.assertEqual(variations[0], "Gil-galad")
+        # A long name has millions of combinations; taking a few must be instant
+        self.assertEqual(len(list(islice(iter_variations("Aeaeaeaeaeaeaeaeaeae", limit=10**9), 5))), 5)
+
+    def test_suffix_forms(self):
+        self.assertEqual(list(suffix_forms("Mordo", ["ion", "rin"])), ["Mordion", "Mordorin"])
+        self.assertEqual(list(suffix_forms("Gil-galad", ["ion", "rin"])), ["Gil-galadion"])
+
+    def test_eldamo_suffixes(self):
+        self.assertEqual(fix_mojibake("kÃ¡rienwa"), "kárienwa")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "eldamo.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(["(a)kÃ¡rion", "Fanturion", "Ulmion", "malinen", "ar"]))
+            self.assertEqual(load_elvish_suffixes(path, count=1), ("ion",))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from src.web import app as web_app
+
+CSV_HEADER = "Search Name,Band Name,URL,Genre,Themes,Country,Location,Status,Formed\n"
+CSV_ROWS = "".join(
+    f"Mordor,Mordor,https://ma/bands/Mordor/{i},Black Metal,Tolkien,Norway,Oslo,N/A,{1990 + i}\n"
+    for i in range(25)
+) + "Isengard,Isengard,https://ma/bands/Isengard/1027,Folk Metal,N/A,Norway,Kolbotn,N/A,1989\n"
+
+
+class WebAppTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv = Path(self.tmp.name) / "matches.csv"
+        self.csv.write_text(CSV_HEADER + CSV_ROWS, encoding='utf-8')
+        self.journal = Path(self.tmp.name) / "matches.jsonl"
+        self.saved = (web_app.DATA_FILE, web_app.SNAPSHOT_FILE, web_app.JOURNAL_FILE,
+                      web_app.RELOAD_INTERVAL, web_app._data)
+        web_app.DATA_FILE = str(self.csv)
+        web_app.SNAPSHOT_FILE = str(Path(self.tmp.name) / "missing.snapshot")
+        web_app.JOURNAL_FILE = str(self.journal)
+        # Tests apply journal rows with web_app.refresh() instead of the watcher thread
+        web_app.RELOAD_INTERVAL = 0
+        web_app._data = None
+        self.client = web_app.app.test_client()
+
+    def tearDown(self):
+        (web_app.DATA_FILE, web_app.SNAPSHOT_FILE, web_app.JOURNAL_FILE,
+         web_app.RELOAD_INTERVAL, web_app._data) = self.saved
+        self.tmp.cleanup()
+
+
+class TestSearchPaging(WebAppTestCase):
+    def test_default_page(self):
+        results = self.client.get('/search?q=mor').get_json()
+        self.assertEqual(len(results), 10)
+        self.assertEqual(results[0]['Formed'], '1990')
+        self.assertIsNone(results[0]['Status'])
+
+    def test_limit_and_offset(self):
+        everything = self.client.get('/search?q=mor&limit=100').get_json()
+        self.assertEqual(len(everything), 25)
+        page = self.client.get('/search?q=mor&limit=5&offset=20').get_json()
+        self.assertEqual(page, everything[20:])
+
+    def test_bad_paging_arguments(self):
+        self.assertEqual(self.client.get('/search?q=mor&limit=ten').status_code, 400)
+        self.assertEqual(self.client.get('/search?q=mor&offset=-1').status_code, 400)
+
+    def test_fuzzy(self):
+        self.assertEqual(self.client.get('/search?q=isengrad').get_json(), [])
+        results = self.client.get('/search?q=isengrad&fuzzy=1').get_json()
+        self.assertEqual([row['Band Name'] for row in results], ['Isengard'])
+
+    def test_stream(self):
+        response = self.client.get('/search/stream?q=isen')
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        rows = [json.loads(line) for line in response.data.splitlines()]
+        self.assertEqual([row['URL'] for row in rows], ['https://ma/bands/Isengard/1027'])
+        self.assertEqual(len(self.client.get('/search/stream?q=mor&offset=3').data.splitlines()), 22)
+
+    def test_metrics(self):
+        self.client.get('/search?q=mor')
+        self.client.get('/search?q=isengrad&fuzzy=1')
+        metrics = self.client.get('/metrics').get_json()
+        self.assertGreaterEqual(metrics['search']['search']['count'], 1)
+        self.assertIn('p95_ms', metrics['search']['search_fuzzy'])
+        self.assertIn('hit_ratio', metrics['query_cache'])
+
+    def test_home(self):
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'26 bands', response.data)
+
+    def test_home_without_bands(self):
+        self.csv.write_text(CSV_HEADER, encoding='utf-8')
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'0 bands', response.data)
+        self.assertNotIn(b'Featured Band', response.data)
+
+class TestLiveReload(WebAppTestCase):
+    def append(self, *results):
+        with open(self.journal, 'a', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps(result) + '\n')
+
+    def match(self, name, band_id):
+        return {'name': name, 'exists': True, 'matches': [{
+            'name': name, 'url': f'https://ma/bands/{name}/{band_id}', 'genre': 'Doom Metal',
+            'themes': 'N/A', 'country': 'Sweden', 'location': 'N/A', 'status': 'Active', 'formed': '2001'}]}
+
+    def test_appended_rows_become_searchable(self):
+        self.client.get('/search?q=mor')
+        self.assertFalse(web_app.refresh())
+        self.append(self.match('Moria', 1), {'name': 'Frodo', 'exists': False, 'matches': []},
+                    {'name': 'Rohan', 'error': 'timeout'})
+        self.assertTrue(web_app.refresh())
+
+        results = self.client.get('/search?q=mor&limit=100').get_json()
+        self.assertEqual(len(results), 26)
+        self.assertEqual(results[-1]['Band Name'], 'Moria')
+        self.assertIsNone(results[-1]['Themes'])
+        page = self.client.get('/search?q=mor&limit=5&offset=23').get_json()
+        self.assertEqual(page, results[23:])
+        self.assertEqual(self.client.get('/search?q=moira&fuzzy=1').get_json()[0]['Band Name'], 'Moria')
+        self.assertEqual(len(self.client.get('/search/stream?q=moria').data.splitlines()), 1)
+        self.assertIn(b'27 bands', self.client.get('/').data)
+
+    def test_skips_names_already_loaded_and_partial_lines(self):
+        self.client.get('/')
+        self.append(self.match('Isengard', 9))
+        with open(self.journal, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.match('Erebor', 2))[:20])
+        self.assertFalse(web_app.refresh())
+        with open(self.journal, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.match('Erebor', 2))[20:] + '\n')
+        self.assertTrue(web_app.refresh())
+        self.assertEqual(len(self.client.get('/search?q=isengard').get_json()), 1)
+        self.assertEqual(len(self.client.get('/search?q=erebor').get_json()), 1)
+
+    def test_restarted_journal_drops_live_rows(self):
+        self.client.get('/')
+        self.append(self.match('Moria', 1))
+        web_app.refresh()
+        self.journal.unlink()
+        self.append(self.match('Erebor', 2))
+        self.assertTrue(web_app.refresh())
+        self.assertEqual(self.client.get('/search?q=moria').get_json(), [])
+        self.assertEqual(len(self.client.get('/search?q=erebor').get_json()), 1)
+
+if __name__ == '__main__':
+    unittest.main()
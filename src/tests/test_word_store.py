@@ -0,0 +1,37 @@
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+from src.word_store import WordStore, compile_word_list
+
+class TestWordStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "words.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_membership(self):
+        words = ["the", "Ring", "went", "ábaco", "zebra", "a", "with", "ring"]
+        self.assertEqual(compile_word_list(words, self.path), 7)
+        store = WordStore(self.path)
+        for word in ["the", "ring", "went", "ábaco", "zebra", "a", "with"]:
+            self.assertIn(word, store)
+        for word in ["mordor", "", "th", "thee", "zz", "Ring"]:
+            self.assertNotIn(word, store)
+        self.assertEqual(len(store), 7)
+
+    def test_empty_store(self):
+        compile_word_list([], self.path)
+        store = WordStore(self.path)
+        self.assertNotIn("the", store)
+        self.assertEqual(len(store), 0)
+
+    def test_pickles_as_path(self):
+        compile_word_list(["hobbit"], self.path)
+        store = pickle.loads(pickle.dumps(WordStore(self.path)))
+        self.assertIn("hobbit", store)
+
+if __name__ == '__main__':
+    unittest.main()
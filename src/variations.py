@@ -0,0 +1,132 @@
+# src/variations.py
+"""Metal-style spelling variations of a band name.
+
+Variations are produced lazily, most conventional first: spacing and
+prefix forms, whole-name character swaps, Elvish-style endings, then every
+combination of per-letter swaps. Callers take as many as they need and the
+rest are never built.
+"""
+import os
+import re
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from itertools import combinations, product
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+ELDAMO_PATH = "data/external-sources/Eldamo_dictionary.txt"
+DEFAULT_VARIATION_LIMIT = 50
+
+# Replacements for each letter, the classic metal spelling first
+METAL_CHARS: Dict[str, str] = {
+    'a': 'æäâ',
+    'o': 'øöô',
+    'u': 'üû',
+    'e': 'ëê',
+    'i': 'ïî',
+}
+METAL_CHARS.update({char.upper(): replacements.upper() for char, replacements in list(METAL_CHARS.items())})
+
+VOWELS = set('aeiouy')
+
+
+def fix_mojibake(text: str) -> str:
+    """Undo UTF-8 text that was decoded as cp1252 (or latin-1) and re-encoded."""
+    for encoding in ('cp1252', 'latin-1'):
+        try:
+            return text.encode(encoding).decode('utf-8')
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            continue
+    return text
+
+
+@lru_cache(maxsize=None)
+def load_elvish_suffixes(path: str = ELDAMO_PATH, count: int = 8) -> Tuple[str, ...]:
+    """The most common three-letter word endings in the Eldamo dictionary.
+
+    The dictionary file is double-encoded, so each line is repaired first.
+    Returns () if the file is missing.
+    """
+    if not os.path.exists(path):
+        return ()
+    endings = Counter()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            word = re.sub(r'[()\-\s]', '', fix_mojibake(line.strip())).lower()
+            word = ''.join(ch for ch in unicodedata.normalize('NFKD', word)
+                           if not unicodedata.combining(ch))
+            if len(word) >= 5 and word.isalpha() and word.isascii():
+                endings[word[-3:]] += 1
+    return tuple(ending for ending, _ in endings.most_common(count))
+
+
+def spacing_forms(name: str) -> List[str]:
+    forms = [f"The {name}"]
+    if ' ' in name:
+        forms += [name.replace(' ', ''), name.replace(' ', '_'), name.replace(' ', '-')]
+    return forms
+
+
+def whole_name_swaps(name: str) -> Iterator[str]:
+    """Each letter replaced everywhere it occurs, one replacement at a time."""
+    for char, replacements in METAL_CHARS.items():
+        if char in name:
+            for replacement in replacements:
+                yield name.replace(char, replacement)
+
+
+def suffix_forms(name: str, suffixes: Sequence[str]) -> Iterator[str]:
+    """The name with an Elvish ending.
+
+    A final vowel merges into an ending's leading vowel, and endings that
+    would pile consonants onto a final consonant are skipped.
+    """
+    lowered = name.lower()
+    if not lowered[-1:].isalpha():
+        return
+    ends_in_vowel = lowered[-1] in VOWELS
+    for suffix in suffixes:
+        if lowered.endswith(suffix):
+            continue
+        if suffix[0] in VOWELS:
+            yield name[:-1] + suffix if ends_in_vowel else name + suffix
+        elif ends_in_vowel:
+            yield name + suffix
+
+
+def letter_swaps(name: str) -> Iterator[str]:
+    """Every combination of swapped letters, fewest swaps first."""
+    positions = [i for i, char in enumerate(name) if char in METAL_CHARS]
+    for swaps in range(1, len(positions) + 1):
+        for chosen in combinations(positions, swaps):
+            for replacements in product(*(METAL_CHARS[name[i]] for i in chosen)):
+                chars = list(name)
+                for i, replacement in zip(chosen, replacements):
+                    chars[i] = replacement
+                yield ''.join(chars)
+
+
+def iter_variations(name: str, limit: int = DEFAULT_VARIATION_LIMIT,
+                    suffixes: Sequence[str] = None) -> Iterator[str]:
+    """Yield up to `limit` distinct variations of name, starting with name itself."""
+    if suffixes is None:
+        suffixes = load_elvish_suffixes()
+
+    def candidates():
+        yield name
+        yield from spacing_forms(name)
+        yield from whole_name_swaps(name)
+        yield from suffix_forms(name, suffixes)
+        yield from letter_swaps(name)
+
+    seen = set()
+    for variation in candidates():
+        if len(seen) >= limit:
+            return
+        if variation not in seen:
+            seen.add(variation)
+            yield variation
+
+
+def generate_variations(name: str, limit: int = DEFAULT_VARIATION_LIMIT) -> List[str]:
+    return sorted(iter_variations(name, limit))
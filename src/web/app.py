@@ -1,8 +1,18 @@
 # src/web/app.py
-from flask import Flask, render_template, jsonify, request
-import pandas as pd
+from flask import Flask, Response, render_template, jsonify, request
+import copy
 import random
+import threading
+import time
 import os
+from itertools import chain, islice
+from typing import Dict, Iterator, List, Optional
+
+from src.fuzzy import FuzzyNameIndex
+from src.metrics import METRICS
+from src.web.live import LiveReloader, LiveRows
+from src.web.search_index import QueryCache, SearchIndex
+from src.web.snapshot import BandTable, load_table
 
 app = Flask(__name__)
 
@@ -10,49 +20,244 @@ app = Flask(__name__)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 REPORTS_DIR = os.path.join(BASE_DIR, 'reports')
 DATA_FILE = os.path.join(REPORTS_DIR, 'metal_band_matches.csv')
+SNAPSHOT_FILE = os.path.join(BASE_DIR, 'cache', 'bands.snapshot')
+JOURNAL_FILE = os.path.join(REPORTS_DIR, 'metal_band_matches.jsonl')
+MAX_PAGE_SIZE = 100
+# Seconds between checks for new journal rows; 0 turns live reload off
+RELOAD_INTERVAL = float(os.environ.get('METAL_EARTH_RELOAD_INTERVAL', '2'))
+
+
+class BandData:
+    """The band table with its search indexes and query cache, plus rows added since it was loaded.
+
+    Ids below len(table) are base table rows; the rest are `live` rows.
+    The base indexes and query cache only cover the base table, so adding
+    live rows never invalidates them.
+    """
+
+    def __init__(self, table: BandTable, signature: Optional[tuple] = None):
+        self.table = table
+        self.signature = signature
+        self.search_index = SearchIndex(table.keys, table.postings)
+        self.query_cache = QueryCache(self.search_index)
+        self.fuzzy_index = FuzzyNameIndex(
+            (table.value('Search Name', i), table.value('Band Name', i)) for i in range(len(table)))
+        self.live = LiveRows(len(table))
+
+    def with_live(self, live: LiveRows) -> 'BandData':
+        """A copy sharing the base table and indexes, with `live` as its added rows."""
+        data = copy.copy(self)
+        data.live = live
+        return data
+
+    def __len__(self) -> int:
+        return len(self.table) + len(self.live)
+
+    def row(self, i: int) -> Dict[str, Optional[str]]:
+        return self.table.row(i) if i < len(self.table) else self.live.row(i)
+
+    def row_json(self, i: int) -> bytes:
+        return self.table.row_json(i) if i < len(self.table) else self.live.row_json(i)
+
+    def iter_matches(self, query: str) -> Iterator[int]:
+        return chain(self.search_index.iter_matches(query), self.live.iter_matches(query))
+
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> List[int]:
+        """Ids of matching rows `offset` to `offset + limit`, base table rows first."""
+        if not len(self.live):
+            return self.query_cache.search(query, limit, offset)
+        base = self.query_cache.matches(query)
+        if base is None:
+            return list(islice(self.iter_matches(query), offset, offset + limit))
+        ids = base[offset:offset + limit].tolist()
+        if len(ids) < limit:
+            skip = max(0, offset - len(base))
+            ids.extend(islice(self.live.iter_matches(query), skip, skip + limit - len(ids)))
+        return ids
+
+    def fuzzy_search(self, query: str, limit: int = 10, offset: int = 0) -> List[int]:
+        if not len(self.live):
+            return self.fuzzy_index.search(query, limit=limit, offset=offset)
+        ranked = self.fuzzy_index.ranked(query)
+        ranked.update(self.live.fuzzy_ranked(query))
+        ordered = sorted(ranked, key=lambda row_id: (ranked[row_id], row_id))
+        return ordered[offset:offset + limit]
+
+
+_data = None
+_data_lock = threading.Lock()
+_reloader: Optional[LiveReloader] = None
+_watcher_pid = None
+
+
+def _snapshot_signature() -> Optional[tuple]:
+    """Identifies the snapshot file's current version; None if there is none."""
+    try:
+        stat = os.stat(SNAPSHOT_FILE)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def load_data() -> BandData:
+    """(Re)load the band table and rebuild its search index and query cache."""
+    global _data, _reloader
+    signature = _snapshot_signature()
+    data = BandData(load_table(DATA_FILE, SNAPSHOT_FILE), signature)
+    # Swap in a whole new BandData, so no cached results from the old table survive
+    _data = data
+    _reloader = None
+    print(f"Loaded {len(data.table)} bands")
+    return data
+
+
+def refresh() -> bool:
+    """Bring the data up to date with the journal and snapshot; True if anything changed.
+
+    Rows appended to the journal are added as live rows. A rebuilt
+    snapshot is loaded in full and the journal is read again on top of it.
+    Either way the new BandData is built first and swapped in with one
+    assignment, so requests never wait for a reload.
+    """
+    global _data, _reloader
+    data = _data
+    if data is None:
+        return False
+    changed = False
+    if _snapshot_signature() != data.signature:
+        data = BandData(load_table(DATA_FILE, SNAPSHOT_FILE), _snapshot_signature())
+        _reloader = None
+        changed = True
+    if _reloader is None or _reloader.tail.path != JOURNAL_FILE:
+        _reloader = LiveReloader(JOURNAL_FILE, data.table)
+    if _reloader.poll():
+        changed = True
+    if changed:
+        _data = data.with_live(_reloader.live)
+    return changed
+
+
+def _watch(interval: float):
+    while True:
+        time.sleep(interval)
+        try:
+            with METRICS.stage('live_reload'):
+                if refresh():
+                    print(f"Live reload: {len(_data.live)} rows added to {len(_data.table)} bands")
+        except Exception as e:
+            print(f"Live reload failed: {e}")
+
+
+def get_data() -> BandData:
+    """The loaded band data, loading it on first use."""
+    data = _data
+    if data is None:
+        with _data_lock:
+            data = _data or load_data()
+    return data
+
+
+@app.before_request
+def start_live_reload():
+    """Start this process's thread applying new journal rows, on its first request.
+
+    Threads don't survive fork, so each prefork worker starts its own, and
+    the parent, which loads the data before forking, never starts one.
+    """
+    global _watcher_pid
+    if _watcher_pid == os.getpid() or not RELOAD_INTERVAL:
+        return
+    with _data_lock:
+        if _watcher_pid == os.getpid():
+            return
+        _watcher_pid = os.getpid()
+    threading.Thread(target=_watch, args=(RELOAD_INTERVAL,), daemon=True).start()
 
-# Load the data once when starting the server
-print(f"Loading data from: {DATA_FILE}")
-df = pd.read_csv(DATA_FILE)
-bands_df = df[df['Band Name'] != 'No match found'].copy()
-print(f"Loaded {len(bands_df)} bands")
 
 @app.route('/')
 def home():
-    random_band = bands_df.sample(n=1).iloc[0]
-    total_bands = len(bands_df)
+    data = get_data()
+    total_bands = len(data)
+    # The table is empty until check_metal journals its first match
+    random_band = data.row(random.randrange(total_bands)) if total_bands else None
     return render_template('index.html', random_band=random_band, total_bands=total_bands)
 
+def _int_arg(name: str, default: int, maximum: int = None) -> int:
+    value = int(request.args.get(name, default))
+    if value < 0:
+        raise ValueError(f"{name} must not be negative")
+    return min(value, maximum) if maximum is not None else value
+
 @app.route('/search')
 def search():
+    """Matching bands as a JSON array, paged with `limit` (max 100) and `offset`.
+
+    With `fuzzy=1`, names are matched ignoring diacritics and within one or
+    two typos instead of by substring, closest matches first.
+    """
     query = request.args.get('q', '').lower()
-    
+    fuzzy = request.args.get('fuzzy', '') in ('1', 'true')
+
+    try:
+        limit = _int_arg('limit', 10, MAX_PAGE_SIZE)
+        offset = _int_arg('offset', 0)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     if not query:
         return jsonify([])
-    
+
     try:
-        results = bands_df[
-            (bands_df['Search Name'].astype(str).str.lower().str.contains(query, na=False)) |
-            (bands_df['Band Name'].astype(str).str.lower().str.contains(query, na=False))
-        ].to_dict('records')
-        
-        clean_results = []
-        for result in results[:10]:
-            clean_result = {}
-            for key, value in result.items():
-                if pd.isna(value):
-                    clean_result[key] = None
-                else:
-                    clean_result[key] = str(value)
-            clean_results.append(clean_result)
-        
-        return jsonify(clean_results)
-        
+        data = get_data()
+        with METRICS.stage('search_fuzzy' if fuzzy else 'search'):
+            if fuzzy:
+                ids = data.fuzzy_search(query, limit=limit, offset=offset)
+            else:
+                ids = data.search(query, limit=limit, offset=offset)
+            body = b'[' + b','.join(data.row_json(i) for i in ids) + b']'
+        return Response(body, mimetype='application/json')
+
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/search/stream')
+def search_stream():
+    """Every matching band as newline-delimited JSON, produced as the index finds it."""
+    query = request.args.get('q', '').lower()
+    try:
+        offset = _int_arg('offset', 0)
+        limit = _int_arg('limit', 0) or None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    data = get_data()
+
+    def rows():
+        if not query:
+            return
+        stop = offset + limit if limit else None
+        for i in islice(data.iter_matches(query), offset, stop):
+            yield data.row_json(i) + b'\n'
+
+    return Response(rows(), mimetype='application/x-ndjson')
+
+@app.route('/search/stats')
+def search_stats():
+    return jsonify(get_data().query_cache.stats())
+
+@app.route('/metrics')
+def metrics():
+    """Search latency percentiles and query cache stats for this worker process."""
+    summary = METRICS.summary()
+    return jsonify({
+        'pid': os.getpid(),
+        'uptime_s': summary['elapsed_s'],
+        'search': summary['stages'],
+        'query_cache': get_data().query_cache.stats(),
+    })
+
 def run_server(host='0.0.0.0', port=5000, debug=False):
     app.run(host=host, port=port, debug=debug)
 
 if __name__ == '__main__':
-    run_server(debug=True)
\ No newline at end of file
+    run_server(debug=True)
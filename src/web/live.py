@@ -0,0 +1,172 @@
+# src/web/live.py
+"""Band rows appended to the check_metal journal after the table was loaded.
+
+JournalTail reads the journal from the byte offset where the last read
+stopped, so each poll only parses the new lines. New rows go into small
+immutable segments, each with its own n-gram and fuzzy index. Extending
+LiveRows returns a new object sharing the old segments, which the app swaps
+in with one assignment; requests holding the old one are unaffected.
+
+Neighbouring segments of equal size are merged, like a binary counter, so
+a long run keeps a handful of segments, and no merge indexes more than
+MAX_SEGMENT_ROWS rows at once.
+"""
+import json
+import os
+from bisect import bisect_right
+from itertools import chain
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.fuzzy import FuzzyNameIndex
+from src.web.search_index import SearchIndex, search_key
+from src.web.snapshot import COLUMNS, BandTable, result_rows
+
+MAX_SEGMENT_ROWS = 512
+
+
+class JournalTail:
+    """Reads lines appended to a JSONL file since the previous read.
+
+    The file counts as replaced when its inode or its first line changes,
+    or it got shorter; the next read then starts from the top.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.offset = 0
+        self._inode = None
+        self._head = b''
+
+    def _replaced(self, stat: os.stat_result) -> bool:
+        if stat.st_ino != self._inode or stat.st_size < self.offset:
+            return True
+        with open(self.path, 'rb') as f:
+            return f.read(len(self._head)) != self._head
+
+    def read(self) -> Tuple[List[Dict], bool]:
+        """New complete entries, and whether the file was replaced or truncated since the last read.
+
+        A partly written last line is left for the next read.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            reset = self._inode is not None
+            self.offset, self._inode = 0, None
+            return [], reset
+        reset = False
+        if self._inode is None or self._replaced(stat):
+            reset = self._inode is not None
+            self.offset, self._inode, self._head = 0, stat.st_ino, b''
+        if stat.st_size == self.offset:
+            return [], reset
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read(stat.st_size - self.offset)
+        end = chunk.rfind(b'\n') + 1
+        if not self.offset:
+            self._head = chunk[:chunk.find(b'\n') + 1]
+        self.offset += end
+        entries = []
+        for line in chunk[:end].splitlines():
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return entries, reset
+
+
+class LiveSegment:
+    """An immutable run of rows with its own indexes; ids start at `start`."""
+
+    def __init__(self, rows: Sequence[List[Optional[str]]], start: int):
+        self.rows = list(rows)
+        self.start = start
+        self.json = [json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False).encode('utf-8') for row in self.rows]
+        self.search_index = SearchIndex([search_key(row[0], row[1]) for row in self.rows])
+        self.fuzzy_index = FuzzyNameIndex((row[0], row[1]) for row in self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+class LiveRows:
+    """The rows added since the base table was loaded, with ids following the base table's."""
+
+    def __init__(self, start: int, segments: Tuple[LiveSegment, ...] = ()):
+        self.start = start
+        self.segments = segments
+        self._starts = [segment.start for segment in segments]
+        self._size = sum(len(segment) for segment in segments)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def extend(self, rows: Sequence[List[Optional[str]]]) -> 'LiveRows':
+        """A new LiveRows with `rows` appended; this one is left unchanged."""
+        segments = list(self.segments)
+        segments.append(LiveSegment(rows, self.start + self._size))
+        while (len(segments) >= 2 and len(segments[-2]) <= len(segments[-1])
+               and len(segments[-2]) + len(segments[-1]) <= MAX_SEGMENT_ROWS):
+            last = segments.pop()
+            first = segments.pop()
+            segments.append(LiveSegment(first.rows + last.rows, first.start))
+        return LiveRows(self.start, tuple(segments))
+
+    def _locate(self, row_id: int) -> Tuple[LiveSegment, int]:
+        segment = self.segments[bisect_right(self._starts, row_id) - 1]
+        return segment, row_id - segment.start
+
+    def row(self, row_id: int) -> Dict[str, Optional[str]]:
+        segment, i = self._locate(row_id)
+        return dict(zip(COLUMNS, segment.rows[i]))
+
+    def row_json(self, row_id: int) -> bytes:
+        segment, i = self._locate(row_id)
+        return segment.json[i]
+
+    def iter_matches(self, query: str) -> Iterator[int]:
+        """Ids of rows containing `query`, in row order."""
+        return chain.from_iterable(
+            (segment.start + i for i in segment.search_index.iter_matches(query)) for segment in self.segments)
+
+    def fuzzy_ranked(self, query: str) -> Dict[int, int]:
+        """Row ids matching `query` fuzzily, with their edit distances."""
+        ranked = {}
+        for segment in self.segments:
+            for i, distance in segment.fuzzy_index.ranked(query).items():
+                ranked[segment.start + i] = distance
+        return ranked
+
+
+class LiveReloader:
+    """Turns newly journaled results into LiveRows on top of a base table.
+
+    Search names the base table already has are skipped, as is every
+    result for a name after its first successful one, so rows are only
+    ever appended. A replaced or truncated journal (check_metal --restart)
+    starts the live rows over.
+    """
+
+    def __init__(self, journal_path: str, base: BandTable):
+        self.tail = JournalTail(journal_path)
+        self.base_names = {base.value('Search Name', i) for i in range(len(base))}
+        self.live = LiveRows(len(base))
+        self._seen = set()
+
+    def poll(self) -> bool:
+        """Apply new journal entries; True if `live` changed."""
+        entries, reset = self.tail.read()
+        if reset:
+            self.live = LiveRows(self.live.start)
+            self._seen = set()
+        rows = []
+        for result in entries:
+            name = result.get('name')
+            if 'error' in result or name in self.base_names or name in self._seen:
+                continue
+            self._seen.add(name)
+            rows.extend(result_rows(result))
+        if rows:
+            self.live = self.live.extend(rows)
+        return bool(rows) or reset
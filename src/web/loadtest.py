@@ -0,0 +1,136 @@
+# src/web/loadtest.py
+"""Local load test for the web app.
+
+Starts `src.web.serve` with increasing worker counts and hammers `/search`
+(autocomplete-style prefixes of real band names) and `/` from several client
+processes. For each worker count it reports requests/second and latency
+percentiles.
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List
+from urllib.parse import quote
+
+from src.web.snapshot import BASE_DIR, load_table
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def sample_paths(count: int, seed: int = 0) -> List[str]:
+    """Request paths: mostly search prefixes of band names, some home page hits."""
+    table = load_table()
+    rng = random.Random(seed)
+    paths = []
+    for _ in range(count):
+        if rng.random() < 0.1:
+            paths.append('/')
+            continue
+        name = table.value('Band Name', rng.randrange(len(table))) or 'mor'
+        prefix = name[:rng.randint(2, max(2, min(len(name), 8)))]
+        paths.append(f"/search?q={quote(prefix)}")
+    return paths
+
+
+def _client(port: int, paths: List[str], duration: float, queue: multiprocessing.Queue):
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            conn.close()
+            if response.status != 200:
+                errors += 1
+                continue
+        except OSError:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+    queue.put((latencies, errors))
+
+
+def _wait_for_port(port: int, timeout: float = 20.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server did not start on port {port}")
+
+
+def run_load(port: int, workers: int, clients: int, duration: float, paths: List[str]) -> Dict:
+    """Start a server with `workers` processes and measure it under load."""
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'src.web.serve', '--host', '127.0.0.1',
+         '--port', str(port), '--workers', str(workers)],
+        cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        _wait_for_port(port)
+        queue = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=_client, args=(port, paths[i::clients], duration, queue))
+                 for i in range(clients)]
+        for proc in procs:
+            proc.start()
+        results = [queue.get() for _ in procs]
+        for proc in procs:
+            proc.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = sorted(latency for batch, _ in results for latency in batch)
+    return {
+        'workers': workers,
+        'requests': len(latencies),
+        'errors': sum(errors for _, errors in results),
+        'rps': round(len(latencies) / duration, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Load test the web app as workers scale.")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                        help="Worker counts to test (default: 1 2 4)")
+    parser.add_argument('--clients', type=int, default=8, help="Concurrent client processes (default: 8)")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per run (default: 10)")
+    parser.add_argument('--port', type=int, default=5077)
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    paths = sample_paths(2000)
+    results = [run_load(args.port, workers, args.clients, args.duration, paths) for workers in args.workers]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'workers':>8} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for r in results:
+        print(f"{r['workers']:>8} {r['rps']:>9} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8} {r['errors']:>7}")
+
+
+if __name__ == '__main__':
+    main()
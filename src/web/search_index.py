@@ -0,0 +1,215 @@
+# src/web/search_index.py
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Separates the searchable fields of a row so a query can't match across them
+FIELD_SEPARATOR = '\x00'
+
+# Packed n-grams are stored as fixed-width UTF-8 records: 3 chars x 4 bytes
+GRAM_WIDTH = 12
+
+
+def search_key(*fields) -> str:
+    """Lowercased haystack for one row, the text that /search matches against."""
+    return FIELD_SEPARATOR.join(str(field).lower() for field in fields)
+
+
+def ngrams(text: str, n: int):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def build_postings(keys: Sequence[str]) -> Dict[str, array]:
+    """Map every bigram and trigram to the ids of the rows containing it."""
+    postings: Dict[str, array] = {}
+    for row_id, key in enumerate(keys):
+        for n in (2, 3):
+            for gram in ngrams(key, n):
+                if FIELD_SEPARATOR in gram:
+                    continue
+                bucket = postings.get(gram)
+                if bucket is None:
+                    bucket = postings[gram] = array('I')
+                bucket.append(row_id)
+    return postings
+
+
+def pack_postings(postings: Dict[str, array]) -> Tuple[bytes, array, array]:
+    """Flatten postings into sorted gram records, start offsets and one id array."""
+    grams = sorted(postings, key=lambda gram: gram.encode('utf-8'))
+    records = bytearray()
+    starts = array('I', [0])
+    ids = array('I')
+    for gram in grams:
+        records.extend(gram.encode('utf-8').ljust(GRAM_WIDTH, b'\0'))
+        ids.extend(postings[gram])
+        starts.append(len(ids))
+    return bytes(records), starts, ids
+
+
+class _GramRecords(Sequence):
+    def __init__(self, records: memoryview):
+        self._records = records
+
+    def __len__(self) -> int:
+        return len(self._records) // GRAM_WIDTH
+
+    def __getitem__(self, i: int) -> bytes:
+        return bytes(self._records[i * GRAM_WIDTH:(i + 1) * GRAM_WIDTH])
+
+
+class PackedPostings:
+    """Read-only postings over packed buffers, e.g. slices of a memory map.
+
+    Lookups binary-search the sorted gram records and return zero-copy views
+    of the id array, so worker processes mapping the same file share one
+    copy of the index.
+    """
+
+    def __init__(self, records: memoryview, starts: memoryview, ids: memoryview):
+        self._grams = _GramRecords(records)
+        self._starts = starts
+        self._ids = ids
+
+    def get(self, gram: str) -> Optional[memoryview]:
+        record = gram.encode('utf-8').ljust(GRAM_WIDTH, b'\0')
+        i = bisect_left(self._grams, record)
+        if i == len(self._grams) or self._grams[i] != record:
+            return None
+        return self._ids[self._starts[i]:self._starts[i + 1]]
+
+
+class SearchIndex:
+    """Bigram and trigram postings over per-row search keys.
+
+    A query is answered by walking the postings of its rarest n-gram, which
+    are in row order, and checking each candidate with a plain substring
+    test. Only the first `limit` hits are produced, so lookups stay fast
+    however many rows the table holds. Prebuilt `postings` (such as the
+    PackedPostings stored in a snapshot) skip the build step.
+    """
+
+    def __init__(self, keys: Sequence[str], postings=None):
+        self.keys = keys
+        self._postings = build_postings(keys) if postings is None else postings
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _candidates(self, query: str):
+        if FIELD_SEPARATOR in query:
+            return ()
+        if len(query) < 2:
+            return range(len(self.keys))
+        n = 3 if len(query) >= 3 else 2
+        rarest = None
+        for gram in ngrams(query, n):
+            bucket = self._postings.get(gram)
+            if bucket is None:
+                return ()
+            if rarest is None or len(bucket) < len(rarest):
+                rarest = bucket
+        return rarest
+
+    def iter_matches(self, query: str) -> Iterator[int]:
+        """Yield ids of rows containing `query`, in row order."""
+        query = query.lower()
+        keys = self.keys
+        for row_id in self._candidates(query):
+            if query in keys[row_id]:
+                yield row_id
+
+    def search(self, query: str, limit: int = 10) -> List[int]:
+        """Ids of the first `limit` rows containing `query`."""
+        matches = []
+        for row_id in self.iter_matches(query):
+            matches.append(row_id)
+            if len(matches) >= limit:
+                break
+        return matches
+
+
+class QueryCache:
+    """Bounded LRU cache of query -> ids of every matching row.
+
+    Autocomplete sends ever longer queries ("ga", "gan", "gand"), and every
+    row matching "gand" also matches "gan". On a miss, the cached ids of the
+    longest cached prefix are filtered instead of searching the whole index.
+    Queries matching more than `max_ids` rows aren't cached and are answered
+    straight from the index, which stops after the requested page.
+    """
+
+    def __init__(self, index: SearchIndex, max_entries: int = 1024, max_ids: int = 50_000):
+        self.index = index
+        self.max_entries = max_entries
+        self.max_ids = max_ids
+        self._entries: "OrderedDict[str, array]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.prefix_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def matches(self, query: str) -> Optional[array]:
+        """Ids of all rows containing `query` in row order, or None if there are too many."""
+        query = query.lower()
+        if FIELD_SEPARATOR in query:
+            # Like the index, never match across fields, even by filtering a cached prefix
+            return array('I')
+        base = None
+        with self._lock:
+            ids = self._entries.get(query)
+            if ids is not None:
+                self._entries.move_to_end(query)
+                self.hits += 1
+                return ids
+            for end in range(len(query) - 1, 0, -1):
+                base = self._entries.get(query[:end])
+                if base is not None:
+                    self._entries.move_to_end(query[:end])
+                    self.prefix_hits += 1
+                    break
+            else:
+                self.misses += 1
+
+        if base is not None:
+            keys = self.index.keys
+            ids = array('I', (row_id for row_id in base if query in keys[row_id]))
+        else:
+            ids = array('I', islice(self.index.iter_matches(query), self.max_ids + 1))
+            if len(ids) > self.max_ids:
+                return None
+
+        with self._lock:
+            self._entries[query] = ids
+            self._entries.move_to_end(query)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return ids
+
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> List[int]:
+        """Ids of matching rows `offset` to `offset + limit`."""
+        ids = self.matches(query)
+        if ids is None:
+            return list(islice(self.index.iter_matches(query), offset, offset + limit))
+        return ids[offset:offset + limit].tolist()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.prefix_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'prefix_hits': self.prefix_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round((self.hits + self.prefix_hits) / lookups, 3) if lookups else 0.0,
+            }
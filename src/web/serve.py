@@ -0,0 +1,82 @@
+# src/web/serve.py
+"""Pre-forking production server for the web app.
+
+The parent binds the listening socket and maps the band snapshot, then forks
+the workers. Each worker runs a threaded WSGI server on the shared socket.
+The snapshot, including its search index, is a read-only memory map, so all
+workers share one copy of its pages instead of each parsing the CSV.
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+from typing import List
+
+from werkzeug.serving import make_server
+
+from src.web import app as web_app
+
+
+def _run_worker(host: str, port: int, fd: int):
+    server = make_server(host, port, web_app.app, threaded=True, fd=fd)
+    signal.signal(signal.SIGTERM, lambda *_: os._exit(0))
+    try:
+        server.serve_forever()
+    finally:
+        os._exit(0)
+
+
+def serve(host: str = '0.0.0.0', port: int = 5000, workers: int = 4):
+    """Serve the app from `workers` processes sharing one socket and snapshot."""
+    web_app.get_data()  # map the snapshot before forking so workers share it
+
+    if not hasattr(os, 'fork') or workers <= 1:
+        print(f"Serving on http://{host}:{port} with 1 process")
+        make_server(host, port, web_app.app, threaded=True).serve_forever()
+        return
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(128)
+    sock.set_inheritable(True)
+
+    # Keep the collector from touching the loaded data in the workers, so its
+    # pages stay shared instead of being copied into every process
+    gc.freeze()
+    children: List[int] = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            _run_worker(host, port, sock.fileno())
+        children.append(pid)
+    print(f"Serving on http://{host}:{port} with {workers} worker processes")
+
+    def stop(*_):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for pid in children:
+        os.waitpid(pid, 0)
+    sock.close()
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Run the web app with multiple worker processes.")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.workers)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,254 @@
+# src/web/snapshot.py
+"""Compact binary snapshot of the band table for the web app.
+
+Layout: an 8-byte magic, a little-endian u64 header length, a JSON header,
+then 8-byte aligned sections. Free-text columns are stored as a u32 offsets
+array plus one UTF-8 blob. Low-cardinality columns (Genre, Country, Status)
+are stored as integer codes into a category list kept in the header.
+"No match found" rows are dropped at build time and empty or "N/A" fields
+become None. Each row is also stored pre-serialized as JSON, and the search
+index's n-gram postings are stored packed.
+The file is memory-mapped, so values are decoded only when a row is read
+and every worker process shares one copy of the pages.
+"""
+import argparse
+import csv
+import json
+import mmap
+import os
+import struct
+import subprocess
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from src.web.search_index import PackedPostings, build_postings, pack_postings, search_key
+
+MAGIC = b'MEBANDS1'
+COLUMNS = ['Search Name', 'Band Name', 'URL', 'Genre', 'Themes', 'Country', 'Location', 'Status', 'Formed']
+CATEGORICAL = {'Genre', 'Country', 'Status'}
+KEY_COLUMN = '__key'
+JSON_COLUMN = '__json'
+NULL_VALUES = {'', 'N/A'}
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA_FILE = os.path.join(BASE_DIR, 'reports', 'metal_band_matches.csv')
+SNAPSHOT_FILE = os.path.join(BASE_DIR, 'cache', 'bands.snapshot')
+
+
+def read_band_rows(csv_path: str = DATA_FILE) -> Iterator[List[Optional[str]]]:
+    """Rows of the matches CSV that name a band, with empty fields as None."""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        for record in reader:
+            if record.get('Band Name') == 'No match found':
+                continue
+            yield [None if record.get(column) in NULL_VALUES or record.get(column) is None
+                   else record[column] for column in COLUMNS]
+
+
+# Journal match fields for each column after Search Name
+MATCH_FIELDS = {'Band Name': 'name', 'URL': 'url', 'Genre': 'genre', 'Themes': 'themes', 'Country': 'country',
+                'Location': 'location', 'Status': 'status', 'Formed': 'formed'}
+
+
+def result_rows(result: Dict) -> List[List[Optional[str]]]:
+    """Band rows for one check_metal journal result, as read_band_rows would yield them."""
+    rows = []
+    for match in result.get('matches', []):
+        values = [result['name']] + [match.get(MATCH_FIELDS[column]) for column in COLUMNS[1:]]
+        rows.append([None if value is None or value in NULL_VALUES else value for value in values])
+    return rows
+
+
+def _pad(blob: bytearray, fill: bytes = b'\0'):
+    blob.extend(fill * (-len(blob) % 8))
+
+
+def encode_snapshot(rows: Iterable[Sequence[Optional[str]]]) -> bytes:
+    """Serialize band rows (ordered as COLUMNS) into snapshot bytes."""
+    rows = list(rows)
+    header = {'rows': len(rows), 'columns': COLUMNS, 'sections': {}, 'categories': {}}
+    sections = []
+
+    def add_strings(name: str, values: Iterable[Optional[str]]):
+        offsets = array('I', [0])
+        data = bytearray()
+        for value in values:
+            data.extend((value or '').encode('utf-8'))
+            offsets.append(len(data))
+        sections.append((f'{name}.offsets', offsets.tobytes(), offsets.typecode))
+        sections.append((f'{name}.data', bytes(data), None))
+
+    for position, column in enumerate(COLUMNS):
+        values = [row[position] for row in rows]
+        if column in CATEGORICAL:
+            categories = [None] + sorted({v for v in values if v is not None})
+            lookup = {value: code for code, value in enumerate(categories)}
+            codes = array('H' if len(categories) < 1 << 16 else 'I', (lookup[v] for v in values))
+            header['categories'][column] = categories
+            sections.append((f'{column}.codes', codes.tobytes(), codes.typecode))
+        else:
+            add_strings(column, values)
+    keys = [search_key(row[0], row[1]) for row in rows]
+    add_strings(KEY_COLUMN, keys)
+    add_strings(JSON_COLUMN, (json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) for row in rows))
+    records, starts, ids = pack_postings(build_postings(keys))
+    sections.append(('index.grams', records, None))
+    sections.append(('index.starts', starts.tobytes(), starts.typecode))
+    sections.append(('index.ids', ids.tobytes(), ids.typecode))
+
+    body = bytearray()
+    for name, blob, typecode in sections:
+        header['sections'][name] = [len(body), len(blob), typecode]
+        body.extend(blob)
+        _pad(body)
+
+    header_bytes = bytearray(json.dumps(header, ensure_ascii=False).encode('utf-8'))
+    _pad(header_bytes, b' ')
+    return MAGIC + struct.pack('<Q', len(header_bytes)) + bytes(header_bytes) + bytes(body)
+
+
+def build_snapshot(csv_path: str = DATA_FILE, snapshot_path: str = SNAPSHOT_FILE) -> int:
+    """Write the snapshot for csv_path atomically; returns the number of rows."""
+    rows = list(read_band_rows(csv_path))
+    blob = encode_snapshot(rows)
+    os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+    tmp_path = f"{snapshot_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(blob)
+    os.replace(tmp_path, snapshot_path)
+    return len(rows)
+
+
+class StringColumn(Sequence):
+    """Lazily decoded view of one string column."""
+
+    def __init__(self, offsets: memoryview, data: memoryview):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return str(self._data[self._offsets[i]:self._offsets[i + 1]], 'utf-8')
+
+    def raw(self, i: int) -> bytes:
+        """The stored UTF-8 bytes, without decoding."""
+        return bytes(self._data[self._offsets[i]:self._offsets[i + 1]])
+
+
+class BandTable:
+    """Read-only band rows backed by snapshot bytes or a memory map."""
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        view = memoryview(buffer)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError("not a band snapshot")
+        (header_len,) = struct.unpack_from('<Q', view, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(bytes(view[start:start + header_len]))
+        body = view[start + header_len:]
+
+        def section(name: str) -> memoryview:
+            offset, length, typecode = header['sections'][name]
+            part = body[offset:offset + length]
+            return part.cast(typecode) if typecode else part
+
+        self._rows = header['rows']
+        self._categorical: Dict[str, tuple] = {}
+        self._strings: Dict[str, StringColumn] = {}
+        for column in header['columns']:
+            if column in header['categories']:
+                self._categorical[column] = (section(f'{column}.codes'), header['categories'][column])
+            else:
+                self._strings[column] = StringColumn(section(f'{column}.offsets'), section(f'{column}.data'))
+        self.keys = StringColumn(section(f'{KEY_COLUMN}.offsets'), section(f'{KEY_COLUMN}.data'))
+        self._json = StringColumn(section(f'{JSON_COLUMN}.offsets'), section(f'{JSON_COLUMN}.data'))
+        self.postings = PackedPostings(section('index.grams'), section('index.starts'), section('index.ids'))
+
+    @classmethod
+    def open(cls, path: str = SNAPSHOT_FILE) -> 'BandTable':
+        with open(path, 'rb') as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def from_csv(cls, csv_path: str = DATA_FILE) -> 'BandTable':
+        return cls(encode_snapshot(read_band_rows(csv_path)))
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def value(self, column: str, i: int) -> Optional[str]:
+        if column in self._categorical:
+            codes, categories = self._categorical[column]
+            return categories[codes[i]]
+        return self._strings[column][i] or None
+
+    def row(self, i: int) -> Dict[str, Optional[str]]:
+        return {column: self.value(column, i) for column in COLUMNS}
+
+    def row_json(self, i: int) -> bytes:
+        """The row as pre-serialized JSON bytes."""
+        return self._json.raw(i)
+
+
+def load_table(csv_path: str = DATA_FILE, snapshot_path: str = SNAPSHOT_FILE) -> BandTable:
+    """Open the snapshot if it is at least as new as the CSV, else parse the CSV."""
+    if os.path.exists(snapshot_path) and (
+            not os.path.exists(csv_path) or os.path.getmtime(snapshot_path) >= os.path.getmtime(csv_path)):
+        print(f"Loading data from: {snapshot_path}")
+        return BandTable.open(snapshot_path)
+    print(f"Snapshot missing or stale, loading data from: {csv_path}")
+    return BandTable.from_csv(csv_path)
+
+
+_MEASURE_SCRIPT = """
+import json, resource, sys, time
+sys.path.insert(0, {base!r})
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{'seconds': elapsed, 'rss_kb': after - before}}))
+"""
+
+
+def measure(code: str) -> Dict:
+    """Time a load in a fresh interpreter and report how much its peak RSS grew."""
+    script = _MEASURE_SCRIPT.format(base=BASE_DIR, code=code)
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Build the web app's band snapshot.")
+    parser.add_argument('--csv', default=DATA_FILE, help="Matches CSV to convert")
+    parser.add_argument('--output', default=SNAPSHOT_FILE, help="Snapshot file to write")
+    parser.add_argument('--measure', action='store_true',
+                        help="Compare load time and memory of the CSV and the snapshot")
+    args = parser.parse_args(argv)
+
+    rows = build_snapshot(args.csv, args.output)
+    print(f"Wrote {rows} bands to {args.output} ({os.path.getsize(args.output):,} bytes)")
+
+    if args.measure:
+        csv_load = measure(
+            "import pandas as pd\n"
+            f"df = pd.read_csv({args.csv!r})\n"
+            "bands_df = df[df['Band Name'] != 'No match found'].copy()"
+        )
+        snapshot_load = measure(
+            "from src.web.snapshot import BandTable\n"
+            f"table = BandTable.open({args.output!r})\n"
+            "table.row(len(table) - 1)"
+        )
+        for label, result in (("CSV + pandas", csv_load), ("snapshot", snapshot_load)):
+            print(f"{label:>12}: {result['seconds'] * 1000:8.1f} ms, +{result['rss_kb'] / 1024:6.1f} MB peak RSS")
+
+
+if __name__ == "__main__":
+    main()
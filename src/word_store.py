@@ -0,0 +1,83 @@
+import hashlib
+import mmap
+import os
+from functools import lru_cache
+from typing import Iterable
+
+DEFAULT_WORDS_PATH = "cache/english_words.bin"
+
+
+def compile_word_list(words: Iterable[str], path: str = DEFAULT_WORDS_PATH) -> int:
+    """Write words as a sorted, newline-separated UTF-8 blob for WordStore.
+
+    Returns the number of distinct words written. The file is replaced
+    atomically so a running extraction never sees a half-written list.
+    """
+    encoded = sorted({word.strip().lower().encode('utf-8') for word in words} - {b''})
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(b'\n'.join(encoded))
+    os.replace(tmp_path, path)
+    return len(encoded)
+
+
+class WordStore:
+    """Read-only set of lowercase words backed by a memory-mapped sorted file.
+
+    Opening the store costs a single mmap call and lookups binary-search the
+    file in place, so the ~470k word list never becomes a Python set. Stores
+    pickle as their path, so process pool workers map the same file instead
+    of receiving a copy of the list.
+    """
+
+    def __init__(self, path: str = DEFAULT_WORDS_PATH):
+        self.path = path
+        self._open()
+
+    def _open(self):
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self._lookup = lru_cache(maxsize=65536)(self._search)
+
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self._open()
+
+    def __contains__(self, word: str) -> bool:
+        return self._lookup(word)
+
+    def fingerprint(self) -> str:
+        """Content hash of the word list, for invalidating cached results."""
+        return hashlib.sha256(self._buf).hexdigest()
+
+    def __len__(self) -> int:
+        if not self._buf:
+            return 0
+        step = 1 << 20
+        return 1 + sum(self._buf[i:i + step].count(b'\n') for i in range(0, len(self._buf), step))
+
+    def _search(self, word: str) -> bool:
+        key = word.encode('utf-8')
+        buf = self._buf
+        # lo and hi always sit at the start of a line
+        lo, hi = 0, len(buf)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = buf.rfind(b'\n', 0, mid) + 1
+            end = buf.find(b'\n', start)
+            if end == -1:
+                end = len(buf)
+            line = buf[start:end]
+            if line == key:
+                return True
+            if line < key:
+                lo = end + 1
+            else:
+                hi = start
+        return False